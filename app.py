@@ -1,13 +1,19 @@
 # app.py
 import streamlit as st
-import pandas as pd
-import requests
 from io import BytesIO
 import json
 import os
-from utils.module_utils import get_modules_data
+from utils.module_utils import load_course_data
 from utils.excel_utils import load_excel_from_google_drive
 from auth import login, auth_required, logout
+from utils.warmup import start_warmup
+from utils.assets import include_assets
+from utils.video_facade import video_facade
+from utils.logging_utils import get_logger
+from utils.profiler import show_profiler_panel, span
+from utils.session_memory import collect_session, show_session_memory_panel
+
+logger = get_logger('app')
 
 # Configuração da página
 st.set_page_config(
@@ -27,26 +33,20 @@ hide_menu_style = """
 """
 st.markdown(hide_menu_style, unsafe_allow_html=True)
 
+# Pré-carrega os caches em segundo plano (uma vez por processo)
+start_warmup()
+
+# Limpa e mede o estado da sessão (no máximo a cada SESSION_GC_INTERVAL segundos)
+collect_session()
+
 # Importa as configurações de segurança
 from utils.security import set_security_headers
 
 # Configura os cabeçalhos de segurança
 set_security_headers()
 
-# Adiciona o arquivo JavaScript personalizado
-def add_js():
-    try:
-        with open("assets/script.js") as f:
-            st.components.v1.html(f"""
-            <script>
-            {f.read()}
-            </script>
-            """, height=0)
-    except Exception as e:
-        st.error(f"Erro ao carregar o JavaScript: {str(e)}")
-
-# Adiciona o JavaScript à página
-add_js()
+# Adiciona o JavaScript personalizado (uma vez por sessão)
+include_assets('script')
 
 # Inicializa a sessão se não existir
 if 'authenticated' not in st.session_state:
@@ -55,87 +55,7 @@ if 'authenticated' not in st.session_state:
     st.session_state.role = ''
 
 # Caminho para o arquivo local
-import os
 EXCEL_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "video_curso.xlsx"))
-print(f"Tentando carregar o arquivo em: {EXCEL_FILE}")
-print(f"Arquivo existe: {os.path.exists(EXCEL_FILE)}")
-
-# Configurações de depuração
-DEBUG_MODE = True  # Defina como False em produção
-
-# Função simplificada para carregar os dados
-def load_data(file_path):
-    try:
-        print(f"Carregando dados diretamente do Excel: {file_path}")
-        # Lê o arquivo Excel diretamente a cada chamada
-        df = pd.read_excel(file_path, engine='openpyxl')
-        print(f"Colunas encontradas: {df.columns.tolist()}")
-        print(f"Total de linhas: {len(df)}")
-        
-        # Verifica colunas obrigatórias
-        required_columns = ['Módulo', 'Título da Aula', 'Link do Vídeo']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            print(f"Aviso: Colunas obrigatórias ausentes: {missing_columns}")
-            return None
-        
-        # Preenche valores vazios com string vazia
-        df = df.fillna('')
-        
-        # Remove linhas sem link de vídeo
-        df = df[df['Link do Vídeo'].astype(str).str.strip() != '']
-        
-        if len(df) == 0:
-            print("Aviso: Nenhuma linha com link de vídeo válido encontrada")
-            return None
-            
-        print(f"Total de aulas após filtragem: {len(df)}")
-        
-        # Converte para o formato esperado
-        modules = {}
-        for _, row in df.iterrows():
-            try:
-                module_name = str(row['Módulo']).strip() if row['Módulo'] else "Outros"
-                if module_name not in modules:
-                    modules[module_name] = []
-                
-                # Extrai o ID do vídeo do YouTube se disponível
-                youtube_url = str(row.get('link extra youtube', '')).strip()
-                youtube_id = None
-                if 'youtube.com' in youtube_url or 'youtu.be' in youtube_url:
-                    if 'youtu.be' in youtube_url:
-                        youtube_id = youtube_url.split('/')[-1].split('?')[0]
-                    else:
-                        youtube_id = youtube_url.split('v=')[1].split('&')[0]
-                
-                lesson_data = {
-                    'id': str(row.get('ID', '')).strip(),
-                    'title': str(row['Título da Aula']).strip() if row['Título da Aula'] else "Sem título",
-                    'video_url': str(row['Link do Vídeo']).strip(),
-                    'doc_url': str(row.get('Link do Documento', '')).strip(),
-                    'youtube_url': youtube_url,
-                    'youtube_id': youtube_id,
-                    'duration': str(row.get('Duração', '')).strip(),
-                    'order': int(row.get('ordem', 0)) if str(row.get('ordem', '0')).isdigit() else 0
-                }
-                
-                modules[module_name].append(lesson_data)
-                
-            except Exception as e:
-                print(f"Erro ao processar linha {_}: {str(e)}")
-                continue
-            
-        # Ordena os itens
-        for module in modules:
-            modules[module].sort(key=lambda x: x.get('order', 0))
-            
-        return modules
-        
-    except Exception as e:
-        print(f"Erro ao carregar dados: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
-        return None
 
 # Verifica se estamos na página de introdução
 current_page = st.query_params.get('page', [''])[0]
@@ -175,22 +95,24 @@ elif page == "Gramática":
 if st.sidebar.button(" Sair"):
     logout()
 
+# Perfil das fases e memória das sessões (apenas administradores)
+if st.session_state.get("role") == "admin":
+    show_profiler_panel()
+    show_session_memory_panel()
+
 # Carrega os dados
 try:
     with st.spinner('Carregando dados do curso...'):
-        modules_data = load_data(EXCEL_FILE)
+        with span('spreadsheet.local'):
+            modules_data = load_course_data(EXCEL_FILE)
         
         if not modules_data:
             st.error("❌ Não foi possível carregar os dados do curso. Verifique o arquivo de log para mais detalhes.")
             st.stop()
             
-    print(f"Módulos carregados: {list(modules_data.keys())}")
-    
 except Exception as e:
     st.error(f"❌ Erro ao carregar os dados: {str(e)}")
-    print(f"Erro detalhado: {str(e)}")
-    import traceback
-    traceback.print_exc()
+    logger.exception("erro ao carregar os dados do curso")
     st.stop()
 
 # Barra lateral para navegação
@@ -235,39 +157,28 @@ if selected_module == "Introdução":
                                   value="", 
                                   placeholder="Ex: 1WiHVX6lWQ87d7e-v54zo0FCwewNR8_B4")
             
-            # Botão para testar o vídeo
+            # Botão para testar o vídeo; o ID testado fica na sessão para que a
+            # fachada continue na tela quando o clique em "Assistir" executar a página de novo
             if st.button("Testar Vídeo") and video_id:
+                st.session_state.test_video_id = video_id.strip()
+            test_id = st.session_state.get('test_video_id')
+            if test_id and test_id == video_id.strip():
                 try:
-                    # Testa se o vídeo está acessível
-                    test_url = f"https://drive.google.com/file/d/{video_id}/preview"
-                    st.markdown(f"""
-                    <div style="position: relative; padding-bottom: 56.25%; height: 0; overflow: hidden; border-radius: 8px; margin: 10px 0; background: #f0f2f6;">
-                        <iframe 
-                            src="{test_url}" 
-                            style="position: absolute; top: 0; left: 0; width: 100%; height: 100%; border: none;" 
-                            frameborder="0"
-                            allowfullscreen>
-                        </iframe>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    st.success("Vídeo carregado com sucesso!")
-                    
-                except Exception as e:
+                    if video_facade(f"https://drive.google.com/file/d/{test_id}/view",
+                                    title="Teste do vídeo"):
+                        st.success("Vídeo carregado com sucesso!")
+                    else:
+                        st.error("Não foi possível carregar o vídeo. Verifique o ID e as permissões.")
+                except Exception:
                     st.error("Não foi possível carregar o vídeo. Verifique o ID e as permissões.")
         
         # Seção principal do vídeo
         if 'intro_video_id' in st.session_state and st.session_state.intro_video_id:
             try:
                 video_id = st.session_state.intro_video_id
+                video_facade(f"https://drive.google.com/file/d/{video_id}/view",
+                             key="intro", title="Vídeo de introdução")
                 intro_video_embed = f"""
-                <div style="position: relative; padding-bottom: 56.25%; height: 0; overflow: hidden; border-radius: 8px; margin: 10px 0; background: #f0f2f6; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                    <iframe 
-                        src="https://drive.google.com/file/d/{video_id}/preview" 
-                        style="position: absolute; top: 0; left: 0; width: 100%; height: 100%; border: none;" 
-                        frameborder="0"
-                        allowfullscreen>
-                    </iframe>
-                </div>
                 <div style="margin: 10px 0 20px 0;">
                     <a href="https://drive.google.com/file/d/{video_id}/view" 
                        target="_blank" 
@@ -302,7 +213,6 @@ if selected_module == "Introdução":
                 </p>
             </div>
             """, unsafe_allow_html=True)
-        st.markdown(intro_video_embed, unsafe_allow_html=True)
         
         # Espaço para anotações
         st.markdown("### 📝 Anotações Pessoais")
@@ -368,18 +278,8 @@ for lesson in sorted_lessons:
             # Mostra o vídeo do YouTube se disponível, senão mostra o vídeo do Google Drive
             if lesson.get('youtube_id'):
                 st.markdown("### 🎥 Vídeo da Aula (YouTube)")
-                youtube_embed = f"""
-                <div style="position: relative; padding-bottom: 56.25%; height: 0; overflow: hidden; border-radius: 8px; margin: 10px 0;">
-                    <iframe 
-                        src="https://www.youtube.com/embed/{lesson['youtube_id']}?rel=0&modestbranding=1&showinfo=0" 
-                        style="position: absolute; top: 0; left: 0; width: 100%; height: 100%; border: none;" 
-                        frameborder="0" 
-                        allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" 
-                        allowfullscreen>
-                    </iframe>
-                </div>
-                """
-                st.markdown(youtube_embed, unsafe_allow_html=True)
+                video_facade(lesson['youtube_url'], key=f"{selected_module}_{lesson.get('order', 0)}_youtube",
+                             title=lesson['title'])
                 
                 # Mostra o link do YouTube
                 st.markdown(f"🔗 [Assistir no YouTube]({lesson['youtube_url']})")
@@ -390,9 +290,9 @@ for lesson in sorted_lessons:
                 if not lesson.get('youtube_id'):  # Só mostra se não tiver vídeo do YouTube
                     st.markdown("### 🎥 Vídeo da Aula")
                     try:
-                        from utils.video_security import get_secure_video_embed
-                        secure_embed = get_secure_video_embed(video_url)
-                        st.markdown(secure_embed, unsafe_allow_html=True)
+                        if not video_facade(video_url, key=f"{selected_module}_{lesson.get('order', 0)}",
+                                            title=lesson['title']):
+                            st.markdown(f"🔗 [Acessar vídeo]({video_url})")
                     except Exception as e:
                         st.error(f"❌ Erro ao carregar o vídeo: {str(e)}")
             
@@ -0,0 +1,17 @@
+document.addEventListener('keydown', function(e) {
+    // Alt+1: Ir para o conteúdo principal
+    if (e.altKey && e.key === '1') {
+        document.querySelector('main').focus();
+    }
+    // Alt+2: Ir para a navegação
+    else if (e.altKey && e.key === '2') {
+        document.querySelector('header').focus();
+    }
+    // Alt+0: Mostrar ajuda de teclas de atalho
+    else if (e.altKey && e.key === '0') {
+        alert('Teclas de atalho disponíveis:\n\n' +
+              'Alt+1: Ir para o conteúdo principal\n' +
+              'Alt+2: Ir para a navegação\n' +
+              'Alt+0: Mostrar esta ajuda');
+    }
+});
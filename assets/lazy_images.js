@@ -0,0 +1,66 @@
+// Carregamento preguiçoso das imagens com a classe "lazy".
+// Um único IntersectionObserver atende a página inteira; um MutationObserver
+// registra as imagens que o Streamlit acrescenta a cada rerun.
+(function () {
+    if (window.__lazyImages) {
+        return;
+    }
+    window.__lazyImages = true;
+
+    function load(img) {
+        if (img.parentNode && img.parentNode.tagName === 'PICTURE') {
+            Array.prototype.forEach.call(img.parentNode.querySelectorAll('source[data-srcset]'), function (source) {
+                source.srcset = source.dataset.srcset;
+            });
+        }
+        if (img.dataset.srcset) {
+            img.srcset = img.dataset.srcset;
+        }
+        img.src = img.dataset.src;
+        img.classList.remove('lazy');
+        img.classList.add('lazy-loaded');
+    }
+
+    var observer = null;
+    if ('IntersectionObserver' in window) {
+        observer = new IntersectionObserver(function (entries) {
+            entries.forEach(function (entry) {
+                if (entry.isIntersecting) {
+                    observer.unobserve(entry.target);
+                    load(entry.target);
+                }
+            });
+        }, { rootMargin: '200px' });
+    }
+
+    function register(root) {
+        var images = root.querySelectorAll ? root.querySelectorAll('img.lazy[data-src]') : [];
+        Array.prototype.forEach.call(images, function (img) {
+            if (img.dataset.lazyObserved) {
+                return;
+            }
+            img.dataset.lazyObserved = '1';
+            // Sem IntersectionObserver, carrega tudo de uma vez
+            if (observer) {
+                observer.observe(img);
+            } else {
+                load(img);
+            }
+        });
+    }
+
+    register(document);
+    new MutationObserver(function (mutations) {
+        mutations.forEach(function (mutation) {
+            Array.prototype.forEach.call(mutation.addedNodes, function (node) {
+                if (node.nodeType === 1) {
+                    if (node.matches('img.lazy[data-src]')) {
+                        register(node.parentNode);
+                    } else {
+                        register(node);
+                    }
+                }
+            });
+        });
+    }).observe(document.body, { childList: true, subtree: true });
+})();
@@ -2,7 +2,12 @@ import streamlit as st
 import hashlib
 from datetime import datetime
 
-# Dados dos usuários diretamente no código
+from utils.assets import include_assets, remove_assets
+from utils.profiler import span
+from utils.user_store import get_user_store, verify_credentials
+
+# Contas iniciais, gravadas no diretório de usuários (utils/user_store.py) quando
+# ele está vazio. O hash SHA-256 sem sal é trocado por scrypt no primeiro login.
 USERS = {
     "filipe": {
         "password": hashlib.sha256("123456".encode()).hexdigest(),
@@ -34,8 +39,14 @@ USERS = {
     }
 }
 
+def get_store():
+    """Diretório de usuários, com as contas iniciais se ainda estiver vazio."""
+    return get_user_store(seed=USERS)
+
+
 def get_users():
-    return USERS
+    """Usuários cadastrados ({usuário: {'role': papel}}), sem os hashes das senhas."""
+    return {user['username']: {'role': user['role']} for user in get_store().list_users()}
 
 def login(redirect_to=None):
     """
@@ -45,226 +56,15 @@ def login(redirect_to=None):
         redirect_to: Página para redirecionar após o login bem-sucedido
     """
     if 'authenticated' in st.session_state and st.session_state.authenticated:
+        # Os estilos do login ficariam no <head> nas demais páginas
+        remove_assets('login')
         if redirect_to:
             st.switch_page(redirect_to)
         return True
     
     # Estilo profissional para o formulário de login
+    include_assets('login')
     st.markdown("""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap');
-        
-        * {
-            font-family: 'Poppins', sans-serif;
-            box-sizing: border-box;
-        }
-        
-        .login-wrapper {
-            min-height: 100vh;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 20px;
-        }
-        
-        .login-container {
-            width: 100%;
-            max-width: 480px;
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 16px;
-            box-shadow: 0 8px 32px rgba(31, 38, 135, 0.37);
-            backdrop-filter: blur(8.5px);
-            padding: 40px;
-            position: relative;
-            overflow: hidden;
-        }
-        
-        .login-container::before {
-            content: '';
-            position: absolute;
-            top: -50%;
-            left: -50%;
-            width: 200%;
-            height: 200%;
-            background: linear-gradient(45deg, transparent, rgba(255,255,255,0.1), transparent);
-            transform: rotate(45deg);
-            pointer-events: none;
-        }
-        
-        .login-header {
-            text-align: center;
-            margin-bottom: 32px;
-        }
-        
-        .login-logo {
-            width: 80px;
-            height: 80px;
-            margin: 0 auto 16px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-size: 32px;
-            font-weight: 700;
-            box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
-        }
-        
-        .login-title {
-            color: #2c3e50;
-            font-size: 28px;
-            font-weight: 700;
-            margin: 0 0 8px;
-        }
-        
-        .login-subtitle {
-            color: #7f8c8d;
-            font-size: 14px;
-            margin: 0;
-        }
-        
-        .stTextInput>div>div>input {
-            border: 2px solid #e0e0e0;
-            border-radius: 8px;
-            padding: 14px 16px;
-            font-size: 15px;
-            transition: all 0.3s ease;
-            background-color: #f8f9fa;
-        }
-        
-        .stTextInput>div>div>input:focus {
-            border-color: #667eea;
-            box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.2);
-            background-color: white;
-        }
-        
-        .stButton>button {
-            width: 100%;
-            padding: 14px;
-            border: none;
-            border-radius: 8px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            font-size: 16px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            margin: 8px 0 24px;
-            box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
-        }
-        
-        .stButton>button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 6px 20px rgba(102, 126, 234, 0.6);
-        }
-        
-        .stButton>button:active {
-            transform: translateY(0);
-        }
-        
-        .divider {
-            display: flex;
-            align-items: center;
-            margin: 24px 0;
-            color: #95a5a6;
-            font-size: 14px;
-        }
-        
-        .divider::before, .divider::after {
-            content: '';
-            flex: 1;
-            height: 1px;
-            background: #e0e0e0;
-            margin: 0 12px;
-        }
-        
-        .contact-info {
-            background: #f8f9fa;
-            border-radius: 10px;
-            padding: 20px;
-            margin-top: 24px;
-            border-left: 4px solid #667eea;
-            position: relative;
-            overflow: hidden;
-        }
-        
-        .contact-info::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            height: 4px;
-            background: linear-gradient(90deg, #667eea, #764ba2);
-        }
-        
-        .contact-info h4 {
-            color: #2c3e50;
-            margin: 0 0 12px;
-            font-size: 16px;
-            display: flex;
-            align-items: center;
-        }
-        
-        .contact-info h4 svg {
-            margin-right: 8px;
-            color: #667eea;
-        }
-        
-        .contact-info p {
-            color: #7f8c8d;
-            font-size: 14px;
-            margin: 0 0 16px;
-            line-height: 1.5;
-        }
-        
-        .whatsapp-link {
-            display: inline-flex;
-            align-items: center;
-            justify-content: center;
-            background: #25D366;
-            color: white !important;
-            text-decoration: none;
-            padding: 12px 20px;
-            border-radius: 8px;
-            font-weight: 500;
-            font-size: 14px;
-            transition: all 0.3s ease;
-            width: 100%;
-            box-shadow: 0 4px 15px rgba(37, 211, 102, 0.3);
-        }
-        
-        .whatsapp-link:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 6px 20px rgba(37, 211, 102, 0.4);
-            text-decoration: none;
-        }
-        
-        .whatsapp-link svg {
-            margin-right: 8px;
-            width: 20px;
-            height: 20px;
-        }
-        
-        .stAlert {
-            border-radius: 8px;
-            padding: 12px 16px;
-        }
-        
-        @media (max-width: 576px) {
-            .login-container {
-                padding: 30px 20px;
-                margin: 20px;
-            }
-            
-            .login-title {
-                font-size: 24px;
-            }
-        }
-    </style>
-    
     <div class="login-wrapper">
         <div class="login-container">
             <div class="login-header">
@@ -280,11 +80,12 @@ def login(redirect_to=None):
     
     # Botão de login
     if st.button("Entrar"):
-        users = get_users()
-        if username in users and users[username]["password"] == hashlib.sha256(password.encode()).hexdigest():
+        # O hash lento roda no pool de verificação; esta thread só espera o resultado
+        user = verify_credentials(username, password, get_store())
+        if user is not None:
             st.session_state["authenticated"] = True
-            st.session_state["username"] = username
-            st.session_state["role"] = users[username]["role"]
+            st.session_state["username"] = user["username"]
+            st.session_state["role"] = user["role"]
             st.session_state["login_time"] = datetime.now().isoformat()
             st.rerun()
         else:
@@ -333,32 +134,37 @@ def auth_required(admin_only=False):
     Returns:
         bool: True se autenticado, caso contrário redireciona para login
     """
-    # Verifica se o usuário está autenticado
-    if "authenticated" not in st.session_state or not st.session_state.authenticated:
-        # Obtém o caminho do script atual de forma compatível
-        import inspect
-        import os
-        frame = inspect.currentframe()
-        try:
-            # Tenta obter o caminho do arquivo que chamou esta função
-            frame_info = inspect.getouterframes(frame)[1]
-            script_path = os.path.basename(frame_info.filename)
-            # Armazena a página atual para redirecionar após o login
-            login(redirect_to=script_path)
-        finally:
-            del frame  # Importante para evitar vazamento de memória
-        return False
-    
-    # Verifica se é necessário privilégio de admin
-    if admin_only and st.session_state.get("role") != "admin":
-        st.error("🔒 Acesso negado. Apenas administradores podem acessar esta página.")
-        st.stop()
-        return False
-    
-    # Adiciona botão de logout no canto superior direito
-    col1, col2 = st.columns([6, 1])
-    with col2:
-        if st.button("Sair", key="logout_btn"):
-            logout()
-    
-    return True
+    # Medido com um bloco, e não com @profiled: o quadro de quem chamou é usado abaixo
+    with span('auth'):
+        # Verifica se o usuário está autenticado
+        if "authenticated" not in st.session_state or not st.session_state.authenticated:
+            # Obtém o caminho do script atual de forma compatível
+            import inspect
+            import os
+            frame = inspect.currentframe()
+            try:
+                # Tenta obter o caminho do arquivo que chamou esta função
+                frame_info = inspect.getouterframes(frame)[1]
+                script_path = os.path.basename(frame_info.filename)
+                # Armazena a página atual para redirecionar após o login
+                login(redirect_to=script_path)
+            finally:
+                del frame  # Importante para evitar vazamento de memória
+            return False
+        
+        # Verifica se é necessário privilégio de admin
+        if admin_only and st.session_state.get("role") != "admin":
+            st.error("🔒 Acesso negado. Apenas administradores podem acessar esta página.")
+            st.stop()
+            return False
+        
+        # Os estilos do login são globais e ficariam no <head> nas demais páginas
+        remove_assets('login')
+        
+        # Adiciona botão de logout no canto superior direito
+        col1, col2 = st.columns([6, 1])
+        with col2:
+            if st.button("Sair", key="logout_btn"):
+                logout()
+        
+        return True
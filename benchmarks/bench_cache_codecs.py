@@ -0,0 +1,105 @@
+"""
+Benchmark dos formatos de serialização do cache em disco.
+
+Mede a latência de gravação e leitura (incluindo o disco) e o tamanho de cada
+codec disponível para dados representativos do curso: a planilha de aulas,
+as lições já convertidas em dicionários, o progresso de um aluno e HTML renderizado.
+
+Uso:
+    python benchmarks/bench_cache_codecs.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.cache_codecs import available_codecs, decode_entry, encode_entry, read_codec_name
+
+
+def make_lessons_frame(rows: int) -> pd.DataFrame:
+    """DataFrame no formato da planilha do curso."""
+    modules = ['Vocabulário', 'Pronúncia', 'Gramática']
+    return pd.DataFrame({
+        'Módulo': [modules[i % 3] for i in range(rows)],
+        'ordem': np.arange(rows),
+        'Título da Aula': [f"Aula {i} - Expressões do dia a dia" for i in range(rows)],
+        'Duração': ['10:00'] * rows,
+        'Link do Vídeo': [f"https://drive.google.com/file/d/video{i}/view" for i in range(rows)],
+        'Link do Documento': [f"https://drive.google.com/file/d/doc{i}/view" for i in range(rows)],
+        'link extra youtube': [f"https://youtu.be/{i:011d}" for i in range(rows)],
+    })
+
+
+def make_lessons_dict(rows: int) -> dict:
+    """Lições agrupadas por módulo, como retornadas por get_module_lessons."""
+    df = make_lessons_frame(rows)
+    return {'lessons': [
+        {
+            'id': f"{row['Módulo'].lower()}_{row['ordem']}",
+            'title': row['Título da Aula'],
+            'video_url': row['Link do Vídeo'],
+            'doc_url': row['Link do Documento'],
+            'youtube_url': row['link extra youtube'],
+            'duration': row['Duração'],
+            'order': int(row['ordem']),
+        }
+        for row in df.to_dict('records')
+    ]}
+
+
+DATASETS = {
+    'planilha 1k linhas': lambda: make_lessons_frame(1_000),
+    'planilha 10k linhas': lambda: make_lessons_frame(10_000),
+    'lições 1k (dict)': lambda: make_lessons_dict(1_000),
+    'progresso do aluno': lambda: {'vocabulario': {f"vocab_{i}": True for i in range(30)}},
+    'HTML de 50 cards': lambda: "<div class='lesson-card'>...</div>" * 50 * 40,
+}
+
+
+def measure(value, codec, directory, repeat=5):
+    """Retorna (gravação ms, leitura ms, bytes, codec usado) com o melhor de `repeat`."""
+    path = os.path.join(directory, 'entry.bin')
+    best_write = best_read = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = encode_entry(value, codec)
+        with open(path, 'wb') as f:
+            f.write(payload)
+        best_write = min(best_write, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with open(path, 'rb') as f:
+            decode_entry(f.read())
+        best_read = min(best_read, time.perf_counter() - start)
+    return best_write * 1000, best_read * 1000, len(payload), read_codec_name(payload)
+
+
+def main():
+    print(f"codecs disponíveis: {', '.join(available_codecs())}\n")
+    print(f"{'dados':<22} {'codec':<14} {'gravação ms':>12} {'leitura ms':>11} {'KB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, factory in DATASETS.items():
+            value = factory()
+            is_frame = isinstance(value, pd.DataFrame)
+            # None = escolha automática
+            for codec in [None] + available_codecs():
+                if codec in ('feather', 'parquet') and not is_frame:
+                    continue
+                try:
+                    write_ms, read_ms, size, used = measure(value, codec, directory)
+                except Exception as e:
+                    print(f"{name:<22} {codec:<14} erro: {e}")
+                    continue
+                label = f"auto ({used})" if codec is None else codec
+                print(f"{name:<22} {label:<14} {write_ms:>12.2f} {read_ms:>11.2f} {size / 1024:>9.1f}")
+            print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark do custo de geração das chaves de cache.
+
+Compara a chave antiga (baseada em `str()` dos argumentos) com a chave baseada
+no conteúdo (`utils.cache_keys`) para DataFrames, arrays e objetos grandes.
+
+Uso:
+    python benchmarks/bench_cache_keys.py
+"""
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.cache_keys import generate_cache_key
+
+
+def legacy_cache_key(args: tuple, kwargs: dict) -> str:
+    """Chave usada antes: hash de `str()` dos argumentos."""
+    key_parts = []
+    for arg in args:
+        if isinstance(arg, (str, int, float, bool, type(None))):
+            key_parts.append(str(arg))
+        elif hasattr(arg, '__dict__'):
+            key_parts.append(str(arg.__dict__))
+        else:
+            key_parts.append(str(arg))
+    for k, v in sorted(kwargs.items()):
+        key_parts.append(f"{k}={v}")
+    return hashlib.md5("_".join(key_parts).encode()).hexdigest()
+
+
+def make_lessons_frame(rows: int) -> pd.DataFrame:
+    """DataFrame no formato da planilha do curso."""
+    modules = ['Vocabulário', 'Pronúncia', 'Gramática']
+    return pd.DataFrame({
+        'Módulo': [modules[i % 3] for i in range(rows)],
+        'ordem': np.arange(rows),
+        'Título da Aula': [f"Aula {i}" for i in range(rows)],
+        'Duração': ['10:00'] * rows,
+        'Link do Vídeo': [f"https://drive.google.com/file/d/video{i}/view" for i in range(rows)],
+        'Link do Documento': [f"https://drive.google.com/file/d/doc{i}/view" for i in range(rows)],
+    })
+
+
+class Lesson:
+    def __init__(self, i):
+        self.id = f"aula_{i}"
+        self.title = f"Aula {i}"
+        self.tags = list(range(20))
+
+
+def timeit(func, *args, repeat: int = 5) -> float:
+    """Melhor tempo (em ms) entre `repeat` execuções."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    cases = []
+    for rows in (1_000, 10_000, 100_000):
+        cases.append((f"DataFrame {rows} linhas", (make_lessons_frame(rows),)))
+    cases.append(("ndarray 10M float64", (np.random.rand(10_000_000),)))
+    cases.append(("lista de 1000 objetos", ([Lesson(i) for i in range(1000)],)))
+
+    print(f"{'caso':<28} {'legado (ms)':>12} {'conteúdo (ms)':>14}")
+    for name, args in cases:
+        legacy = timeit(legacy_cache_key, args, {})
+        content = timeit(generate_cache_key, args, {})
+        print(f"{name:<28} {legacy:>12.2f} {content:>14.2f}")
+
+    # Colisões: DataFrames diferentes só no meio têm a mesma prévia em str()
+    a = make_lessons_frame(1_000)
+    b = a.copy()
+    b.loc[500, 'Título da Aula'] = 'Outra aula'
+    print()
+    print("colisão com a chave legada:", legacy_cache_key((a,), {}) == legacy_cache_key((b,), {}))
+    print("colisão com a chave por conteúdo:", generate_cache_key((a,), {}) == generate_cache_key((b,), {}))
+
+
+if __name__ == '__main__':
+    main()
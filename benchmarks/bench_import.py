@@ -0,0 +1,112 @@
+"""
+Benchmark do tempo de importação das dependências do `app.py` e das páginas.
+
+Cada medição roda num processo Python novo (importação a frio). O Streamlit é
+importado antes do cronômetro: o custo dele é fixo e não depende deste
+repositório. O restante (os módulos de `utils`, `auth` e `config`) precisa
+caber em `IMPORT_BUDGET_MS`; o pandas, o requests, o gspread e o Pillow só
+devem ser carregados quando forem usados pela primeira vez.
+
+Sai com código 1 se a mediana passar do orçamento ou se algum módulo pesado
+for importado, para poder ser usado na integração contínua.
+
+Uso:
+    python benchmarks/bench_import.py
+    IMPORT_BUDGET_MS=150 python benchmarks/bench_import.py
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Módulos importados pelo app.py e pelas páginas
+APP_IMPORTS = [
+    'config',
+    'auth',
+    'utils.module_utils',
+    'utils.module_page',
+    'utils.excel_utils',
+    'utils.warmup',
+    'utils.assets',
+    'utils.video_facade',
+    'utils.security',
+]
+
+# Módulos que não podem ser carregados na importação
+HEAVY_MODULES = ['pandas', 'numpy', 'pyarrow', 'requests', 'gspread', 'PIL.Image']
+
+IMPORT_BUDGET_MS = float(os.getenv('IMPORT_BUDGET_MS', 250))
+RUNS = 5
+TOP = 10
+
+_PROBE = """
+import sys, time
+sys.path.insert(0, {root!r})
+import streamlit
+sys.stderr.write('START\\n')
+start = time.perf_counter()
+{imports}
+elapsed = (time.perf_counter() - start) * 1000
+print('ELAPSED', elapsed)
+print('HEAVY', ','.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def measure(importtime: bool = False):
+    """
+    Importa `APP_IMPORTS` num processo novo.
+
+    Returns:
+        Tupla (tempo em ms, módulos pesados carregados, saída de `-X importtime`).
+    """
+    code = _PROBE.format(root=ROOT_DIR, heavy=HEAVY_MODULES,
+                         imports='\n'.join(f"import {name}" for name in APP_IMPORTS))
+    args = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    env = dict(os.environ, CACHE_WARMUP='false')
+    result = subprocess.run(args, capture_output=True, text=True, cwd=ROOT_DIR, env=env, check=True)
+    values = dict(line.split(' ', 1) for line in result.stdout.splitlines() if ' ' in line)
+    heavy = [m for m in values.get('HEAVY', '').strip().split(',') if m]
+    return float(values['ELAPSED']), heavy, result.stderr
+
+
+def slowest_imports(importtime_output: str, limit: int = TOP):
+    """Módulos com maior tempo acumulado (µs) depois do Streamlit, a partir de `-X importtime`."""
+    rows = []
+    _, _, after_streamlit = importtime_output.partition('START\n')
+    for line in after_streamlit.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)', line)
+        if match:
+            rows.append((int(match.group(1)), match.group(2)))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main() -> int:
+    times = []
+    heavy = []
+    for _ in range(RUNS):
+        elapsed, loaded, _ = measure()
+        times.append(elapsed)
+        heavy = sorted(set(heavy) | set(loaded))
+    median = statistics.median(times)
+
+    _, _, output = measure(importtime=True)
+    print(f"{'acumulado (ms)':>15}  módulo")
+    for cumulative, name in slowest_imports(output):
+        print(f"{cumulative / 1000:>15.1f}  {name}")
+
+    print(f"\nImportação a frio (mediana de {RUNS}): {median:.1f} ms (orçamento: {IMPORT_BUDGET_MS:.0f} ms)")
+    failed = False
+    if heavy:
+        print(f"ERRO: módulos pesados importados: {', '.join(heavy)}")
+        failed = True
+    if median > IMPORT_BUDGET_MS:
+        print("ERRO: orçamento de importação ultrapassado")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
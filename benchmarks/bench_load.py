@@ -0,0 +1,264 @@
+"""
+Teste de carga com várias sessões simultâneas executando as páginas reais.
+
+Cada sessão simulada é um aluno que:
+
+1. abre a página de um módulo sem estar logado e entra pelo formulário de
+   `auth.login` (usuário e senha);
+2. abre as páginas dos módulos (`pages/01_Vocabulário.py` ...), levando o
+   estado da sessão de uma página para a outra, como a navegação do Streamlit;
+3. marca lições como concluídas na página de Gramática.
+
+As páginas são executadas com `streamlit.testing.v1.AppTest`, uma instância
+por sessão. O `AppTest` não pode rodar em várias threads do mesmo processo (cada
+execução troca o `Runtime` global do Streamlit), então a concorrência vem de
+`--concurrency` processos, cada um executando as suas sessões em sequência,
+como réplicas do servidor compartilhando o cache em disco (`CACHE_SHARED`) e o
+arquivo de progresso. A planilha vem de um servidor HTTP local no lugar do
+endpoint de exportação do Google, e o cache começa vazio, como logo após um
+deploy: as primeiras sessões disputam o download.
+
+O relatório traz sessões e ações por segundo, p50/p95/p99 de cada ação, os
+erros e o pico de memória (RSS) dos processos.
+
+O `AppTest` executa o script sem o servidor Tornado e sem WebSocket: o teste
+mede o custo do Python (páginas, cache, progresso) sob concorrência, não a
+rede nem o navegador.
+
+Uso:
+    python benchmarks/bench_load.py
+    python benchmarks/bench_load.py --sessions 200 --concurrency 8 --ramp-up 10 --output carga.json
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import re
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+from unittest.mock import patch
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+# Progresso, cache e logs ficam num diretório temporário, o mesmo para os
+# processos das sessões (que herdam o ambiente)
+WORK_DIR = os.environ.get('BENCH_LOAD_DIR') or tempfile.mkdtemp(prefix='bench_load_')
+os.environ['BENCH_LOAD_DIR'] = WORK_DIR
+os.environ['HOME'] = WORK_DIR
+os.environ['CACHE_WARMUP'] = 'false'
+os.environ['LOG_LEVEL'] = 'ERROR'
+os.environ['LOG_FILE'] = os.path.join(WORK_DIR, 'app.log')
+os.environ['USER_DB'] = os.path.join(WORK_DIR, 'users.sqlite3')
+
+from streamlit import config as st_config
+from streamlit.logger import set_log_level
+from streamlit.testing.v1 import AppTest
+
+from auth import get_users
+from config import SPREADSHEET_URL
+from utils import cache_engine, catalog
+from utils.cache_engine import CacheEngine
+
+from fixtures import ExportStub, make_sheet, route_to
+
+PAGES = {
+    'Vocabulário': '01_Vocabulário.py',
+    'Pronúncia': '02_Pronúncia.py',
+    'Gramática': '03_Gramática.py',
+}
+# Chaves da sessão copiadas ao trocar de página
+SESSION_KEYS = ('authenticated', 'username', 'role', 'login_time')
+SCRIPT_TIMEOUT = 120
+CACHE_DIR = os.path.join(WORK_DIR, 'cache')
+
+# Os instantâneos do catálogo também ficam no diretório temporário
+catalog.SNAPSHOT_DIR = os.path.join(WORK_DIR, 'snapshots')
+
+
+def peak_rss_mb() -> float:
+    """Maior memória residente do processo atual até agora (MB; `ru_maxrss` é em KB no Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def init_worker(stub_url: str):
+    """Prepara um processo de sessões (o módulo já foi importado de novo, com o ambiente herdado)."""
+    # Sem os avisos do Streamlit fora de uma sessão ("missing ScriptRunContext"),
+    # também depois de cada execução do `AppTest`, que relê a configuração
+    st_config.set_option('logger.level', 'error')
+    set_log_level('error')
+    route_to(stub_url).start()
+    # Sem servidor de arquivos estáticos: as miniaturas dos vídeos não são baixadas
+    patch('utils.thumbnails.static_serving_enabled', return_value=False).start()
+    cache_engine._default_engine = CacheEngine(CACHE_DIR, purge_interval=0, shared=True)
+
+
+def open_page(module: str, state=None) -> AppTest:
+    """Página de um módulo, com o estado de sessão da página anterior (se houver)."""
+    app = AppTest.from_file(os.path.join(ROOT_DIR, 'pages', PAGES[module]), default_timeout=SCRIPT_TIMEOUT)
+    if state is not None:
+        for key in SESSION_KEYS:
+            if key in state:
+                app.session_state[key] = state[key]
+    return app
+
+
+def timed(timings, action: str, app: AppTest, run) -> None:
+    """Executa `run` (uma execução do script) e registra a duração da ação."""
+    start = time.perf_counter()
+    run()
+    timings.append((action, (time.perf_counter() - start) * 1000))
+    if app.exception:
+        raise RuntimeError(f"{action}: {app.exception[0].value}")
+
+
+def run_session(task):
+    """
+    Uma sessão simulada: login, páginas dos módulos e lições concluídas.
+
+    Args:
+        task: (número da sessão, horário de início em `time.time()`, opções da linha de comando)
+
+    Returns:
+        Durações das ações, erro (ou None) e pico de memória do processo.
+    """
+    index, start_at, args = task
+    time.sleep(max(0.0, start_at - time.time()))
+    students = [name for name, user in get_users().items() if user['role'] != 'admin']
+    timings = []
+    error = None
+    try:
+        # Login pelo formulário (a primeira execução exibe o formulário)
+        app = open_page(args.modules[0])
+        timed(timings, 'open_login', app, app.run)
+        app.text_input[0].input(students[index % len(students)])
+        app.text_input[1].input(args.password)
+        timed(timings, 'login', app, app.button[0].click().run)
+        if not app.session_state['authenticated']:
+            raise RuntimeError("login: credenciais recusadas")
+
+        for module in args.modules:
+            app = open_page(module, app.session_state)
+            timed(timings, 'open_module', app, app.run)
+
+        app = open_page('Gramática', app.session_state)
+        timed(timings, 'open_module', app, app.run)
+        completable = [button.key for button in app.button if (button.key or '').startswith('complete_')]
+        for key in completable[:args.complete]:
+            timed(timings, 'complete_lesson', app, app.button(key=key).click().run)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        if args.verbose:
+            traceback.print_exc()
+    return {'session': index, 'timings': timings, 'error': error,
+            'pid': os.getpid(), 'peak_rss_mb': peak_rss_mb()}
+
+
+def percentiles(values):
+    ordered = sorted(values)
+
+    def at(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 2)
+
+    return {
+        'count': len(values),
+        'mean_ms': round(statistics.fmean(values), 2),
+        'p50_ms': at(0.5),
+        'p95_ms': at(0.95),
+        'p99_ms': at(0.99),
+        'max_ms': round(ordered[-1], 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sessions', type=int, default=50, help="Sessões simuladas")
+    parser.add_argument('--concurrency', type=int, default=os.cpu_count() or 4,
+                        help="Processos executando sessões ao mesmo tempo")
+    parser.add_argument('--ramp-up', type=float, default=0.0,
+                        help="Segundos para iniciar todas as sessões (0 inicia todas de uma vez)")
+    parser.add_argument('--lessons', type=int, default=300, help="Lições da planilha sintética")
+    parser.add_argument('--complete', type=int, default=2, help="Lições marcadas como concluídas por sessão")
+    parser.add_argument('--modules', default=','.join(PAGES), help="Módulos abertos por sessão")
+    parser.add_argument('--password', default='123456', help="Senha dos alunos (as contas iniciais de auth.USERS)")
+    parser.add_argument('--output', help="Grava o relatório em JSON neste arquivo")
+    parser.add_argument('--verbose', action='store_true', help="Exibe o traceback dos erros")
+    args = parser.parse_args()
+    args.modules = [m for m in args.modules.split(',') if m]
+
+    buffer = io.BytesIO()
+    make_sheet(args.lessons).to_excel(buffer, index=False)
+    stub = ExportStub()
+    stub.add(re.search(r'/d/([\w-]+)', SPREADSHEET_URL).group(1), buffer.getvalue())
+    baseline_rss = peak_rss_mb()
+
+    spacing = args.ramp_up / args.sessions if args.sessions else 0
+    # "spawn": processos novos, sem as threads e os locks herdados de um fork
+    context = multiprocessing.get_context('spawn')
+    # As funções vão para os processos pelo nome do módulo: o `AppTest` troca o
+    # `__main__` dos processos pelo script da página
+    import bench_load
+    try:
+        started = time.time()
+        tasks = [(i, started + i * spacing, args) for i in range(args.sessions)]
+        with context.Pool(args.concurrency, initializer=bench_load.init_worker, initargs=(stub.base_url,)) as pool:
+            results = list(pool.imap_unordered(bench_load.run_session, tasks))
+        elapsed = time.time() - started
+    finally:
+        stub.close()
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    timings = {}
+    for result in results:
+        for action, ms in result['timings']:
+            timings.setdefault(action, []).append(ms)
+    actions = {name: percentiles(values) for name, values in timings.items()}
+    errors = [{'session': r['session'], 'error': r['error']} for r in sorted(results, key=lambda r: r['session'])
+              if r['error']]
+    workers = {}
+    for result in results:
+        workers[result['pid']] = max(workers.get(result['pid'], 0.0), result['peak_rss_mb'])
+    total_actions = sum(data['count'] for data in actions.values())
+    completed = args.sessions - len(errors)
+    report = {
+        'sessions': args.sessions,
+        'concurrency': args.concurrency,
+        'ramp_up_s': args.ramp_up,
+        'lessons': args.lessons,
+        'elapsed_s': round(elapsed, 2),
+        'completed_sessions': completed,
+        'sessions_per_s': round(completed / elapsed, 2),
+        'actions_per_s': round(total_actions / elapsed, 2),
+        'baseline_rss_mb': round(baseline_rss, 1),
+        'peak_rss_mb_per_process': round(max(workers.values(), default=0.0), 1),
+        'peak_rss_mb_total': round(sum(workers.values()), 1),
+        'actions': actions,
+        'errors': errors,
+    }
+
+    print(f"{args.sessions} sessões ({args.concurrency} processos) em {elapsed:.1f} s: "
+          f"{report['sessions_per_s']} sessões/s, {report['actions_per_s']} ações/s")
+    print(f"\n{'ação':<16} {'n':>6} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10} {'máx. (ms)':>10}")
+    for name, data in actions.items():
+        print(f"{name:<16} {data['count']:>6} {data['p50_ms']:>10.1f} {data['p95_ms']:>10.1f} "
+              f"{data['p99_ms']:>10.1f} {data['max_ms']:>10.1f}")
+    print(f"\nMemória: {baseline_rss:.0f} MB antes das sessões; pico de {report['peak_rss_mb_per_process']:.0f} MB "
+          f"por processo, {report['peak_rss_mb_total']:.0f} MB somando os {len(workers)} processos")
+    if errors:
+        print(f"\n{len(errors)} sessão(ões) com erro; primeira: {errors[0]['error']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Relatório gravado em {args.output}")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
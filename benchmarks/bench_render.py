@@ -0,0 +1,75 @@
+"""
+Benchmark da renderização dos cards de lição.
+
+Compara a renderização direta dos fragmentos de um módulo com 50 lições com a
+renderização memoizada (`utils.fragments.lesson_fragment`), com a memória do
+processo vazia e já preenchida.
+
+Uso:
+    python benchmarks/bench_render.py
+"""
+import os
+import sys
+import time
+
+# Adiciona o diretório raiz ao path para importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.fragments import _lesson_context, _render_memo, lesson_fragment, render
+
+TEMPLATES = ('lesson_header', 'completion_toggle', 'lesson_stats', 'material_actions')
+
+
+def make_lessons(count: int):
+    """Lições no formato de `get_module_lessons`."""
+    return [{
+        'id': f"gramatica_{i}",
+        'title': f"Aula {i}",
+        'duration': '10:00',
+        'level': 'Iniciante',
+        'doc_url': f"https://drive.google.com/file/d/doc{i}/view",
+        'catalog_version': 'v1',
+    } for i in range(count)]
+
+
+def render_direct(lessons):
+    for i, lesson in enumerate(lessons):
+        completed = i % 2 == 0
+        for name in TEMPLATES:
+            render(name, **_lesson_context(name, lesson, completed, 'default'))
+
+
+def render_fragments(lessons):
+    for i, lesson in enumerate(lessons):
+        completed = i % 2 == 0
+        for name in TEMPLATES:
+            lesson_fragment(name, lesson, completed, theme='default')
+
+
+def timeit(func, *args, repeat: int = 5) -> float:
+    """Melhor tempo (em ms) entre `repeat` execuções."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    lessons = make_lessons(50)
+    direct = timeit(render_direct, lessons)
+    _render_memo.cache_clear()
+    start = time.perf_counter()
+    render_fragments(lessons)
+    cold = (time.perf_counter() - start) * 1000
+    warm = timeit(render_fragments, lessons)
+
+    print(f"{'caso (50 lições)':<28} {'tempo (ms)':>12}")
+    print(f"{'sem cache':<28} {direct:>12.2f}")
+    print(f"{'memória vazia':<28} {cold:>12.2f}")
+    print(f"{'memória preenchida':<28} {warm:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
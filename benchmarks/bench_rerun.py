@@ -0,0 +1,102 @@
+"""
+Benchmark do tempo de rerun ao marcar uma lição como concluída.
+
+Antes, o clique salvava o progresso e chamava `st.rerun()`, executando a página
+de Gramática inteira duas vezes (verificação de login, estilos, cabeçalho,
+planilha e todas as lições). Agora o botão fica no fragmento
+`display_lesson_list`, e o clique executa de novo só esse fragmento.
+
+O `AppTest` do Streamlit sempre executa o script inteiro, então o benchmark
+mede separadamente a página completa e um script que contém apenas o
+fragmento (o que o servidor executa após o clique). A planilha é sintética e
+o progresso é gravado num diretório temporário.
+
+Uso:
+    python benchmarks/bench_rerun.py
+"""
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path para importar os módulos
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+# O progresso é salvo em ~/.french_course_progress.json
+os.environ['HOME'] = tempfile.mkdtemp()
+os.environ['CACHE_WARMUP'] = 'false'
+
+from streamlit.testing.v1 import AppTest
+
+from config import SPREADSHEET_URL
+from utils import cache_engine
+from utils.cache_engine import CacheEngine
+from utils.catalog import load_catalog
+
+CLICKS = 20
+
+
+def make_sheet(rows: int) -> pd.DataFrame:
+    """Planilha no formato do curso, só com lições de Gramática."""
+    return pd.DataFrame({
+        'Módulo': ['Gramática'] * rows,
+        'ordem': range(1, rows + 1),
+        'Título da Aula': [f"Aula {i}" for i in range(1, rows + 1)],
+        'Duração': ['10:00'] * rows,
+        'Link do Vídeo': [f"https://drive.google.com/file/d/video{i}/view" for i in range(rows)],
+        'Link do Documento': [f"https://drive.google.com/file/d/doc{i}/view" for i in range(rows)],
+    })
+
+
+def lesson_list_only():
+    """O que é executado após o clique: apenas o fragmento da lista de lições."""
+    from utils.module_page import get_module_view, render_lesson_card
+    from utils.module_utils import display_lesson_list
+
+    # No servidor os argumentos do fragmento ficam guardados; aqui vêm do cache em memória
+    view = get_module_view('Gramática')
+    display_lesson_list(view['lessons'], view['module_id'], render_lesson_card)
+
+
+def time_clicks(at: AppTest, clicks: int, runs_per_click: int) -> float:
+    """Tempo médio (ms) por clique no botão de conclusão da primeira lição."""
+    at.session_state['authenticated'] = True
+    at.session_state['username'] = 'bench'
+    at.session_state['role'] = 'aluno'
+    # As mensagens impressas pelas páginas não entram na saída
+    with contextlib.redirect_stdout(io.StringIO()):
+        at.run()
+        start = time.perf_counter()
+        for _ in range(clicks):
+            at.button(key='complete_gramática_1').click().run()
+            for _ in range(runs_per_click - 1):
+                at.run()
+        return (time.perf_counter() - start) / clicks * 1000
+
+
+def main():
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    print(f"{'lições':>7} {'antes: página + st.rerun (ms)':>31} {'depois: fragmento (ms)':>24}")
+    for rows in (50, 200):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_engine._default_engine = CacheEngine(cache_dir, purge_interval=0)
+            load_catalog(SPREADSHEET_URL, loader=lambda _: make_sheet(rows))
+
+            page = AppTest.from_file(os.path.join(ROOT_DIR, 'pages', '03_Gramática.py'), default_timeout=60)
+            before = time_clicks(page, CLICKS, runs_per_click=2)
+            fragment = AppTest.from_function(lesson_list_only, default_timeout=60)
+            after = time_clicks(fragment, CLICKS, runs_per_click=1)
+
+            cache_engine._default_engine.index.close()
+            cache_engine._default_engine = None
+        print(f"{rows:>7} {before:>31.1f} {after:>24.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+"""
+Suíte de benchmarks das operações do curso, com relatório JSON comparável.
+
+Mede, para planilhas sintéticas de 100, 1.000 e 10.000 lições:
+
+- `load_course_data` e `get_modules_data` (planilha local em .xlsx);
+- o download da planilha (`load_excel_from_google_drive`) e `get_module_lessons`
+  com o cache frio e quente, usando um servidor HTTP local no lugar do
+  endpoint de exportação do Google;
+- a conversão das URLs (planilha, YouTube e Google Drive);
+- a leitura e a gravação do progresso (`progress_utils`);
+- a gravação e a leitura do catálogo no motor de cache (memória e disco);
+- a renderização do fragmento da lista de lições (`AppTest`).
+
+O relatório traz mediana, média, mínimo, máximo e p95 de cada medição, mais
+o commit e a versão do Python. Com `--compare`, as medianas são comparadas
+com um relatório anterior e o script sai com código 1 se alguma piorar mais
+que `--tolerance`.
+
+Uso:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --sizes 100,1000 --output resultado.json
+    python benchmarks/bench_suite.py --compare benchmarks/results/anterior.json --tolerance 0.25
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+# Progresso, cache e logs ficam num diretório temporário
+WORK_DIR = tempfile.mkdtemp(prefix='bench_suite_')
+os.environ['HOME'] = WORK_DIR
+os.environ['CACHE_WARMUP'] = 'false'
+os.environ['LOG_LEVEL'] = 'ERROR'
+os.environ['LOG_FILE'] = os.path.join(WORK_DIR, 'app.log')
+
+import pandas as pd
+from streamlit.logger import set_log_level
+from streamlit.testing.v1 import AppTest
+
+from utils import cache_engine, catalog, excel_utils
+from utils.cache_engine import CacheEngine
+from utils.module_utils import get_module_lessons, get_modules_data, load_course_data
+from utils.progress_utils import load_progress, save_progress
+from utils.video_facade import _parse
+from utils.video_utils import get_video_embed_url
+
+from fixtures import MODULES, ExportStub, make_sheet
+
+SIZES = (100, 1000, 10000)
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+
+# Os instantâneos do catálogo também ficam no diretório temporário
+catalog.SNAPSHOT_DIR = os.path.join(WORK_DIR, 'snapshots')
+
+
+def lesson_list_only(source: str):
+    """O que o servidor executa ao clicar numa lição: só o fragmento da lista."""
+    from utils.module_page import get_module_view, render_lesson_card
+    from utils.module_utils import display_lesson_list
+
+    view = get_module_view('Gramática', source)
+    display_lesson_list(view['lessons'], view['module_id'], render_lesson_card)
+
+
+def measure(func, repeat: int, setup=None):
+    """
+    Executa `func` `repeat` vezes (chamando `setup` antes de cada execução, fora do cronômetro).
+
+    Returns:
+        Estatísticas das durações, em ms.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    ordered = sorted(times)
+    return {
+        'runs': repeat,
+        'median_ms': round(statistics.median(times), 3),
+        'mean_ms': round(statistics.fmean(times), 3),
+        'min_ms': round(ordered[0], 3),
+        'max_ms': round(ordered[-1], 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 3),
+    }
+
+
+def new_engine():
+    """Troca o motor de cache do processo por um vazio, num diretório novo."""
+    old = cache_engine._default_engine
+    if old is not None:
+        old.index.close()
+    cache_dir = tempfile.mkdtemp(dir=WORK_DIR)
+    cache_engine._default_engine = CacheEngine(cache_dir, purge_interval=0)
+    shutil.rmtree(catalog.SNAPSHOT_DIR, ignore_errors=True)
+    return cache_engine._default_engine
+
+
+def bench_size(rows: int, stub: ExportStub, repeat: int):
+    """Todas as medições para uma planilha de `rows` lições."""
+    # Planilhas grandes demoram segundos para ler; menos repetições nelas
+    slow_repeat = max(1, repeat // 2) if rows >= 10000 else repeat
+    df = make_sheet(rows)
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    xlsx_path = os.path.join(WORK_DIR, f"curso_{rows}.xlsx")
+    with open(xlsx_path, 'wb') as f:
+        f.write(buffer.getvalue())
+    source = stub.add(f"bench{rows}", buffer.getvalue())
+    results = {}
+
+    results['load_course_data'] = measure(lambda: load_course_data(xlsx_path), slow_repeat)
+    results['get_modules_data'] = measure(lambda: get_modules_data(xlsx_path), slow_repeat)
+
+    with stub.routed():
+        results['spreadsheet.download'] = measure(
+            lambda: excel_utils.load_excel_from_google_drive(source), slow_repeat)
+        results['get_module_lessons.cold'] = measure(
+            lambda: get_module_lessons(source, 'Gramática'), slow_repeat, setup=new_engine)
+        results['get_module_lessons.warm'] = measure(
+            lambda: get_module_lessons(source, 'Gramática'), repeat * 10)
+
+    urls = list(df['Link do Vídeo']) + list(df['Link do Documento'])
+    results['url_parsing'] = measure(
+        lambda: [(get_video_embed_url(url), _parse(url)) for url in urls]
+        + [excel_utils.get_google_sheets_url(source)], repeat)
+
+    # Progresso com todas as lições do curso, como o de um aluno que terminou o curso
+    with open(os.path.join(WORK_DIR, '.french_course_progress.json'), 'w', encoding='utf-8') as f:
+        json.dump({module: {f"{module}_{i}": True for i in range(rows // len(MODULES))}
+                   for module in MODULES}, f)
+    results['progress.read'] = measure(load_progress, repeat * 10)
+    results['progress.write'] = measure(lambda: save_progress('Gramática', 'Gramática_0', True), repeat * 10)
+
+    engine = new_engine()
+    results['cache.write'] = measure(lambda: engine.set('bench', f"catalog_{rows}", df, 3600), repeat)
+    results['cache.read.memory'] = measure(lambda: engine.get('bench', f"catalog_{rows}", 3600), repeat * 10)
+    results['cache.read.disk'] = measure(lambda: engine.get('bench', f"catalog_{rows}", 3600), repeat,
+                                         setup=engine.memory.clear)
+
+    # Renderização do fragmento com o catálogo já no cache (o caso de cada clique)
+    with stub.routed():
+        get_module_lessons(source, 'Gramática')
+    app = AppTest.from_function(lesson_list_only, default_timeout=120, args=(source,))
+    app.session_state['authenticated'] = True
+    app.session_state['username'] = 'bench'
+    # Sem servidor de arquivos estáticos: as miniaturas não são baixadas durante a medição
+    with patch('utils.thumbnails.static_serving_enabled', return_value=False):
+        app.run()
+        results['fragment.render'] = measure(app.run, repeat)
+
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return 'desconhecido'
+
+
+def compare(report, baseline, tolerance: float):
+    """
+    Compara as medianas com as de um relatório anterior.
+
+    Returns:
+        Lista de (nome, lições, mediana anterior, mediana atual) das medições que
+        pioraram mais que `tolerance`.
+    """
+    previous = {(r['name'], r['lessons']): r['median_ms'] for r in baseline['results']}
+    regressions = []
+    print(f"\n{'medição':<26} {'lições':>7} {'antes (ms)':>11} {'agora (ms)':>11} {'variação':>9}")
+    for result in report['results']:
+        before = previous.get((result['name'], result['lessons']))
+        if before is None:
+            continue
+        now = result['median_ms']
+        change = (now - before) / before if before else 0.0
+        flag = ' <' if change > tolerance else ''
+        print(f"{result['name']:<26} {result['lessons']:>7} {before:>11.2f} {now:>11.2f} {change:>+9.0%}{flag}")
+        if change > tolerance:
+            regressions.append((result['name'], result['lessons'], before, now))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default=','.join(str(s) for s in SIZES),
+                        help="Quantidades de lições separadas por vírgula")
+    parser.add_argument('--repeat', type=int, default=5, help="Repetições de cada medição")
+    parser.add_argument('--output', help="Arquivo do relatório (padrão: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', help="Relatório anterior para comparar as medianas")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Piora máxima aceita na comparação (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Sem os avisos do Streamlit fora de uma sessão ("missing ScriptRunContext")
+    set_log_level('error')
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    commit = git_commit()
+    report = {
+        'schema': 1,
+        'meta': {
+            'commit': commit,
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'repeat': args.repeat,
+        },
+        'results': [],
+    }
+
+    stub = ExportStub()
+    try:
+        print(f"{'medição':<26} {'lições':>7} {'mediana (ms)':>13} {'p95 (ms)':>10}")
+        for rows in sizes:
+            results = bench_size(rows, stub, args.repeat)
+            for name, stats in results.items():
+                report['results'].append({'name': name, 'lessons': rows, **stats})
+                print(f"{name:<26} {rows:>7} {stats['median_ms']:>13.2f} {stats['p95_ms']:>10.2f}")
+    finally:
+        stub.close()
+        if cache_engine._default_engine is not None:
+            cache_engine._default_engine.index.close()
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nRelatório gravado em {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\nERRO: {len(regressions)} medição(ões) pioraram mais de {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Dados sintéticos compartilhados pelos benchmarks: planilhas no formato do
+curso e um servidor HTTP local no lugar do endpoint de exportação do Google.
+"""
+import http.server
+import re
+import threading
+from unittest.mock import patch
+
+import pandas as pd
+
+from utils import excel_utils
+
+MODULES = ('Vocabulário', 'Pronúncia', 'Gramática')
+
+
+def make_sheet(rows: int) -> pd.DataFrame:
+    """Planilha no formato do curso, com as lições distribuídas entre os módulos."""
+    return pd.DataFrame({
+        'Módulo': [MODULES[i % len(MODULES)] for i in range(rows)],
+        'ordem': [i // len(MODULES) + 1 for i in range(rows)],
+        'Título da Aula': [f"Aula {i}" for i in range(rows)],
+        'Duração': ['10:00'] * rows,
+        'Link do Vídeo': [f"https://drive.google.com/file/d/video{i}/view" if i % 2
+                          else f"https://www.youtube.com/watch?v=vid{i:08d}" for i in range(rows)],
+        'Link do Documento': [f"https://drive.google.com/file/d/doc{i}/view" for i in range(rows)],
+        'link extra youtube': [f"https://youtu.be/extra{i:06d}" if i % 5 == 0 else '' for i in range(rows)],
+    })
+
+
+def route_to(base_url: str):
+    """
+    Patch que troca o endereço do Google pelo `base_url` nas URLs de exportação
+    geradas por `excel_utils` (gerenciador de contexto, ou `.start()`).
+    """
+    original = excel_utils.get_google_sheets_url
+
+    def to_stub(url):
+        export_url = original(url)
+        return export_url.replace('https://docs.google.com', base_url) if export_url else export_url
+
+    return patch.object(excel_utils, 'get_google_sheets_url', to_stub)
+
+
+class ExportStub:
+    """
+    Servidor HTTP local que responde como o endpoint de exportação do Google
+    (`/spreadsheets/d/<id>/export?format=xlsx`), com uma planilha por id.
+    """
+
+    def __init__(self):
+        self.workbooks = {}
+        workbooks = self.workbooks
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                match = re.match(r'/spreadsheets/d/([\w-]+)/export', self.path)
+                body = workbooks.get(match.group(1)) if match else None
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def add(self, sheet_id: str, body: bytes) -> str:
+        """Publica uma planilha e retorna a URL de edição (no formato do Google) correspondente."""
+        self.workbooks[sheet_id] = body
+        return f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit"
+
+    def routed(self):
+        """Redireciona as URLs de exportação geradas por `excel_utils` para o servidor local."""
+        return route_to(self.base_url)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -14,12 +14,12 @@ load_dotenv()
 BASE_DIR = Path(__file__).parent.absolute()
 DATA_DIR = BASE_DIR / 'data'
 CACHE_DIR = BASE_DIR / '.cache'
+THUMBNAIL_INDEX_DIR = BASE_DIR / '.thumbnails'  # Fora do CACHE_DIR, que o motor de cache apaga ao limpar
 ASSETS_DIR = BASE_DIR / 'assets'
 PAGES_DIR = BASE_DIR / 'pages'
 
-# Cria os diretórios necessários
-for directory in [DATA_DIR, CACHE_DIR, ASSETS_DIR, PAGES_DIR]:
-    directory.mkdir(exist_ok=True, parents=True)
+# Os diretórios de dados e de cache são criados no primeiro uso (ver
+# `get_data_path` e `get_cache_path`), e não na importação deste módulo
 
 # Configurações do aplicativo
 APP_NAME = "Curso de Francês"
@@ -27,17 +27,34 @@ APP_DESCRIPTION = "Aplicativo interativo para aprendizado de francês"
 APP_VERSION = "1.0.0"
 
 # Configurações de cache
-CACHE_TTL = 3600  # 1 hora em segundos
-MAX_CACHE_SIZE = 100 * 1024 * 1024  # 100 MB
+CACHE_TTL = int(os.getenv('CACHE_TTL', 3600))  # 1 hora em segundos
+MAX_CACHE_SIZE = int(os.getenv('MAX_CACHE_SIZE', 100 * 1024 * 1024))  # 100 MB
+CACHE_PURGE_INTERVAL = int(os.getenv('CACHE_PURGE_INTERVAL', 300))  # 5 minutos (0 desativa)
+MEMORY_CACHE_SIZE = int(os.getenv('MEMORY_CACHE_SIZE', 32 * 1024 * 1024))  # 32 MB em memória por processo
+CACHE_SHARED = os.getenv('CACHE_SHARED', 'false').lower() == 'true'  # Vários processos no mesmo CACHE_DIR
+CACHE_WARMUP = os.getenv('CACHE_WARMUP', 'true').lower() == 'true'  # Pré-carrega os caches ao iniciar o servidor
+
+# Perfil das fases das páginas (ver utils/profiler.py)
+PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', 'true').lower() == 'true'
+PROFILER_MAX_SPANS = int(os.getenv('PROFILER_MAX_SPANS', 5000))  # fases recentes guardadas para o trace
+
+# Memória do st.session_state de cada sessão (ver utils/session_memory.py)
+SESSION_GC_INTERVAL = int(os.getenv('SESSION_GC_INTERVAL', 60))  # segundos entre as limpezas de cada sessão
+SESSION_DATA_CACHE_MAX = int(os.getenv('SESSION_DATA_CACHE_MAX', 2))  # entradas data_cache_* por sessão
+SESSION_DEBUG_INFO_MAX = int(os.getenv('SESSION_DEBUG_INFO_MAX', 100))  # mensagens de depuração por sessão
 
 # Configurações de acessibilidade
 DEFAULT_FONT_SIZE = 16  # px
 HIGH_CONTRAST_MODE = False
 DARK_MODE = False
 
+# Configurações das páginas de módulos
+LESSONS_PER_PAGE = int(os.getenv('LESSONS_PER_PAGE', 10))  # Lições exibidas por página
+
 # Configurações de vídeo
 DEFAULT_VIDEO_WIDTH = 800
 DEFAULT_VIDEO_HEIGHT = 450  # 16:9 aspect ratio
+THUMBNAIL_CACHE_SIZE = int(os.getenv('THUMBNAIL_CACHE_SIZE', 20 * 1024 * 1024))  # 20 MB de miniaturas em static/thumbs
 
 # Configurações de responsividade
 MOBILE_BREAKPOINT = 768  # px
@@ -46,15 +63,28 @@ TABLET_BREAKPOINT = 1024  # px
 # Configurações do Google Sheets (opcional)
 GOOGLE_SHEETS_CREDENTIALS = os.getenv('GOOGLE_SHEETS_CREDENTIALS')
 GOOGLE_SHEET_ID = os.getenv('GOOGLE_SHEET_ID')
+# Planilha com o catálogo de aulas
+SPREADSHEET_URL = os.getenv(
+    'SPREADSHEET_URL',
+    'https://docs.google.com/spreadsheets/d/1RWd50uSh5AOTloRCXvIKPU9jBEUf4LI3/edit?usp=sharing'
+)
 
 # Configurações de autenticação (opcional)
 AUTH_ENABLED = os.getenv('AUTH_ENABLED', 'false').lower() == 'true'
 AUTH_USERNAME = os.getenv('AUTH_USERNAME', 'admin')
 AUTH_PASSWORD = os.getenv('AUTH_PASSWORD', 'password')
 
+# Diretório de usuários (ver utils/user_store.py)
+USER_DB = os.getenv('USER_DB', str(DATA_DIR / 'users.sqlite3'))
+AUTH_WORKERS = int(os.getenv('AUTH_WORKERS', 2))  # threads que verificam as senhas no login
+
 # Configurações de log
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-LOG_FILE = BASE_DIR / 'app.log'
+LOG_FILE = BASE_DIR / os.getenv('LOG_FILE', 'app.log')
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 5 * 1024 * 1024))  # 5 MB por arquivo
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 3))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))  # registros pendentes antes de descartar
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', 0.1))  # fração dos eventos DEBUG mantida
 
 # Configurações de tema
 THEME = {
@@ -97,10 +127,12 @@ def get_asset_path(filename: str) -> str:
 
 def get_cache_path(filename: str) -> str:
     """Retorna o caminho completo para um arquivo na pasta de cache."""
+    CACHE_DIR.mkdir(exist_ok=True, parents=True)
     return str(CACHE_DIR / filename)
 
 def get_data_path(filename: str) -> str:
     """Retorna o caminho completo para um arquivo na pasta de dados."""
+    DATA_DIR.mkdir(exist_ok=True, parents=True)
     return str(DATA_DIR / filename)
 
 # Cria um dicionário com todas as configurações para facilitar a exportação
@@ -4,42 +4,63 @@ Módulo de utilidades para o Curso de Francês.
 Este pacote contém várias utilidades para melhorar a performance, acessibilidade e responsividade do aplicativo.
 """
 
-# Importações dos módulos
-from .accessibility_utils import (
-    apply_accessibility_settings,
-    add_skip_link,
-    add_aria_labels,
-    init_accessibility
-)
+import importlib
 
-from .lazy_loading import (
-    LazyLoader,
-    lazy_video,
-    lazy_image
-)
+# Os submódulos são importados no primeiro acesso a um dos seus nomes
+# (`utils.display_video`, `from utils import fingerprint`...): importar o
+# pacote não carrega o Streamlit, o pandas nem os demais módulos pesados.
+_LAZY_ATTRS = {
+    # Acessibilidade
+    'apply_accessibility_settings': 'accessibility_utils',
+    'add_skip_link': 'accessibility_utils',
+    'add_aria_labels': 'accessibility_utils',
+    'init_accessibility': 'accessibility_utils',
+
+    # Carregamento preguiçoso
+    'LazyLoader': 'lazy_loading',
+    'lazy_video': 'lazy_loading',
+    'lazy_image': 'lazy_loading',
+
+    # Performance
+    'memoize_with_ttl': 'performance_utils',
+    'cached_dataframe': 'performance_utils',
+    'cached_text': 'performance_utils',
+    'cached_computation': 'performance_utils',
+    'clear_cache': 'performance_utils',
+    'invalidate_tags': 'performance_utils',
+    'get_cache_size': 'performance_utils',
+    'fingerprint': 'cache_keys',
+    'register_fingerprint': 'cache_keys',
+    'get_cache_metrics': 'cache_metrics',
+    'reset_cache_metrics': 'cache_metrics',
+
+    # Responsividade
+    'apply_responsive_styles': 'responsive_utils',
+    'responsive_columns': 'responsive_utils',
+    'is_mobile': 'responsive_utils',
+    'init_responsive': 'responsive_utils',
+
+    # Vídeos
+    'get_video_embed_url': 'video_utils',
+    'display_video': 'video_utils',
+    'get_video_thumbnail': 'video_utils',
+    'create_video_card': 'video_utils',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Os próximos acessos não passam mais por __getattr__
+    globals()[name] = value
+    return value
 
-from .performance_utils import (
-    memoize_with_ttl,
-    cached_dataframe,
-    cached_text,
-    cached_computation,
-    clear_cache,
-    get_cache_size
-)
 
-from .responsive_utils import (
-    apply_responsive_styles,
-    responsive_columns,
-    is_mobile,
-    init_responsive
-)
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
-from .video_utils import (
-    get_video_embed_url,
-    display_video,
-    get_video_thumbnail,
-    create_video_card
-)
 
 # Exporta as funções principais
 __all__ = [
@@ -60,7 +81,12 @@ __all__ = [
     'cached_text',
     'cached_computation',
     'clear_cache',
+    'invalidate_tags',
     'get_cache_size',
+    'fingerprint',
+    'register_fingerprint',
+    'get_cache_metrics',
+    'reset_cache_metrics',
     
     # Responsividade
     'apply_responsive_styles',
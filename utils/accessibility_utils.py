@@ -1,83 +1,12 @@
 import streamlit as st
 from typing import Dict, Any
 
+from .assets import include_assets
+
 def apply_accessibility_settings():
     """Aplica as configurações de acessibilidade."""
-    # Adiciona teclas de atalho
-    st.markdown("""
-    <script>
-    document.addEventListener('keydown', function(e) {
-        // Alt+1: Ir para o conteúdo principal
-        if (e.altKey && e.key === '1') {
-            document.querySelector('main').focus();
-        }
-        // Alt+2: Ir para a navegação
-        else if (e.altKey && e.key === '2') {
-            document.querySelector('header').focus();
-        }
-        // Alt+0: Mostrar ajuda de teclas de atalho
-        else if (e.altKey && e.key === '0') {
-            alert('Teclas de atalho disponíveis:\\n\\n' +
-                  'Alt+1: Ir para o conteúdo principal\\n' +
-                  'Alt+2: Ir para a navegação\\n' +
-                  'Alt+0: Mostrar esta ajuda');
-        }
-    });
-    </script>
-    """, unsafe_allow_html=True)
-    
-    # Adiciona ARIA labels para elementos importantes
-    st.markdown("""
-    <style>
-    /* Melhora o contraste */
-    body {
-        --primary-color: #1E88E5;
-        --primary-dark: #1565C0;
-        --text-color: #333333;
-        --background-color: #FFFFFF;
-        --secondary-background: #F5F5F5;
-    }
-    
-    /* Melhora o foco para navegação por teclado */
-    :focus {
-        outline: 3px solid var(--primary-color) !important;
-        outline-offset: 2px;
-    }
-    
-    /* Ajustes de contraste */
-    .stButton > button:first-child {
-        background-color: var(--primary-color);
-        color: white;
-    }
-    
-    .stButton > button:first-child:hover {
-        background-color: var(--primary-dark);
-    }
-    
-    /* Melhora a legibilidade */
-    body, .stTextInput > div > div > input {
-        color: var(--text-color);
-    }
-    
-    /* Classes para alto contraste */
-    .high-contrast {
-        --primary-color: #000000;
-        --primary-dark: #000000;
-        --text-color: #000000;
-        --background-color: #FFFFFF;
-        --secondary-background: #EEEEEE;
-    }
-    
-    /* Classes para modo escuro */
-    .dark-mode {
-        --primary-color: #90CAF9;
-        --primary-dark: #64B5F6;
-        --text-color: #E0E0E0;
-        --background-color: #121212;
-        --secondary-background: #1E1E1E;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Teclas de atalho e estilos de contraste e foco
+    include_assets('accessibility', 'accessibility_js')
 
 def add_skip_link():
     """Adiciona um link de pular para o conteúdo principal."""
@@ -21,6 +21,8 @@ from utils import (
     # Performance
     cached_dataframe,
     clear_cache,
+    get_cache_metrics,
+    reset_cache_metrics,
     
     # Responsividade
     init_responsive,
@@ -251,6 +253,10 @@ def show_sidebar():
         else:
             st.sidebar.error("❌ Erro ao limpar o cache.")
     
+    # Métricas de cache (apenas administradores)
+    if st.session_state.get("role") == "admin":
+        show_cache_metrics()
+    
     # Rodapé da barra lateral
     st.sidebar.markdown("---")
     st.sidebar.markdown(
@@ -265,6 +271,45 @@ def show_sidebar():
     
     return page
 
+def show_cache_metrics():
+    """Exibe na barra lateral as métricas de cada camada de cache."""
+    import pandas as pd
+    
+    def fmt_ms(value):
+        return "-" if value is None else f"{value:g}"
+    
+    with st.sidebar.expander("📊 Métricas de Cache"):
+        snapshot = get_cache_metrics()
+        if not snapshot:
+            st.caption("Nenhum acesso ao cache registrado ainda.")
+            return
+        
+        rows = []
+        for layer, data in snapshot.items():
+            ratio = data['hit_ratio']
+            rows.append({
+                "Camada": layer,
+                "Acertos": data['hits'],
+                "Falhas": data['misses'],
+                "Taxa": "-" if ratio is None else f"{ratio:.0%}",
+                "Remoções": data['evictions'],
+                "KB ocupados": "-" if data.get('bytes') is None else round(data['bytes'] / 1024, 1),
+                "KB gravados": round(data['stored_bytes'] / 1024, 1),
+                "p95 acerto (ms)": fmt_ms(data['hit_latency']['p95_ms']),
+                "p95 carga (ms)": fmt_ms(data['load_latency']['p95_ms']),
+            })
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        st.caption("Latências em faixas: o valor é o limite superior da faixa do p95.")
+        
+        from utils.warmup import warmup_status
+        status = warmup_status()
+        st.caption(f"Aquecimento: {status['state']}"
+                   + (f" ({len(status['errors'])} erro(s))" if status['errors'] else ""))
+        
+        if st.button("Zerar métricas", key="reset_cache_metrics"):
+            reset_cache_metrics()
+            st.rerun()
+
 def show_home():
     """Exibe a página inicial."""
     st.header("Bem-vindo ao Curso de Francês!")
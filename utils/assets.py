@@ -0,0 +1,273 @@
+"""
+Entrega dos arquivos CSS e JavaScript do aplicativo.
+
+Em vez de reenviar kilobytes de `<style>` e `<script>` a cada rerun, os
+estilos e scripts ficam em `assets/` e são agrupados em pacotes (`BUNDLES`).
+Na primeira vez que um pacote é usado no processo, ele é minificado e gravado
+em `static/` com o hash do conteúdo no nome (por exemplo,
+`static/modules.3f2a1b9c.css`), servido pelo Streamlit em `/app/static/`
+(`server.enableStaticServing = true`). Como o nome muda junto com o conteúdo,
+o navegador pode reutilizar o arquivo enquanto ele existir.
+
+Cada sessão recebe uma única vez um pequeno script que acrescenta os `<link>` e
+`<script>` ao `<head>` da página; nos reruns seguintes nada é enviado. Sem o
+servidor de arquivos estáticos, o conteúdo minificado é inserido no `<head>`
+diretamente (também uma vez por sessão).
+"""
+import hashlib
+import inspect
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from .cache_engine import write_atomic
+from .profiler import profiled
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+ASSETS_DIR = os.path.join(ROOT_DIR, 'assets')
+STATIC_DIR = os.path.join(ROOT_DIR, 'static')
+
+# Pacotes: nome -> arquivos de `assets/` (todos do mesmo tipo)
+BUNDLES: Dict[str, List[str]] = {
+    'styles': ['styles.css'],
+    'modules': ['modules.css'],
+    'layout': ['layout.css'],
+    'accessibility': ['accessibility.css'],
+    'accessibility_js': ['accessibility.js'],
+    'login': ['login.css'],
+    'script': ['script.js'],
+    'video': ['video.css'],
+    'lazy_images': ['lazy_images.js'],
+}
+
+_SESSION_KEY = '_assets_loaded'
+
+# Versões recentes do Streamlit executam JavaScript em `st.html`; nas anteriores
+# o script roda num iframe de altura zero (por isso usa `window.parent`)
+_HTML_RUNS_JAVASCRIPT = (
+    hasattr(st, 'html') and 'unsafe_allow_javascript' in inspect.signature(st.html).parameters
+)
+
+_built: Dict[str, Dict[str, str]] = {}
+_build_lock = threading.Lock()
+
+
+def minify_css(css: str) -> str:
+    """Remove comentários e espaços desnecessários de uma folha de estilos."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    # Só o espaço depois de ":" é removido (antes dele, em "a :hover", ele faz parte do seletor)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+def minify_js(js: str) -> str:
+    """
+    Minificação conservadora de JavaScript: remove comentários de bloco,
+    linhas só com comentário, indentação e linhas vazias.
+
+    Os comandos não são juntados, então scripts que dependem da inserção
+    automática de ponto e vírgula continuam funcionando.
+    """
+    js = re.sub(r'/\*.*?\*/', '', js, flags=re.S)
+    lines = []
+    for line in js.splitlines():
+        line = line.strip()
+        if line and not line.startswith('//'):
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def _bundle_type(name: str) -> str:
+    return os.path.splitext(BUNDLES[name][0])[1].lstrip('.')
+
+
+def build_bundle(name: str, static_dir: str = STATIC_DIR) -> Dict[str, str]:
+    """
+    Minifica um pacote e grava `<nome>.<hash>.<tipo>` em `static_dir`.
+
+    Versões antigas do mesmo pacote são removidas.
+
+    Returns:
+        Dicionário com `file` (nome do arquivo), `type` ("css" ou "js") e `content`.
+    """
+    kind = _bundle_type(name)
+    sources = []
+    for filename in BUNDLES[name]:
+        with open(os.path.join(ASSETS_DIR, filename), encoding='utf-8') as f:
+            sources.append(f.read())
+    minify = minify_css if kind == 'css' else minify_js
+    content = '\n'.join(minify(source) for source in sources)
+
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:8]
+    filename = f"{name}.{digest}.{kind}"
+    path = os.path.join(static_dir, filename)
+    if not os.path.exists(path):
+        write_atomic(path, content.encode('utf-8'))
+        pattern = re.compile(rf'^{re.escape(name)}\.[0-9a-f]{{8}}\.{kind}$')
+        for old in os.listdir(static_dir):
+            if old != filename and pattern.match(old):
+                try:
+                    os.remove(os.path.join(static_dir, old))
+                except OSError:
+                    pass
+    return {'file': filename, 'type': kind, 'content': content}
+
+
+def get_bundle(name: str) -> Dict[str, str]:
+    """Pacote já construído neste processo (constrói no primeiro uso)."""
+    bundle = _built.get(name)
+    if bundle is None:
+        with _build_lock:
+            bundle = _built.get(name)
+            if bundle is None:
+                bundle = _built[name] = build_bundle(name)
+    return bundle
+
+
+def static_url(path: str) -> str:
+    """URL de um arquivo de `static/` no servidor de arquivos estáticos do Streamlit."""
+    base = (st.get_option('server.baseUrlPath') or '').strip('/')
+    prefix = f"/{base}" if base else ''
+    return f"{prefix}/app/static/{path}"
+
+
+def asset_url(name: str) -> str:
+    """URL do arquivo de um pacote no servidor de arquivos estáticos do Streamlit."""
+    return static_url(get_bundle(name)['file'])
+
+
+def static_serving_enabled() -> bool:
+    """Se o Streamlit está servindo `static/` (`server.enableStaticServing`)."""
+    try:
+        return bool(st.get_option('server.enableStaticServing'))
+    except Exception:
+        return False
+
+
+def _head_element(name: str, inline: bool) -> Dict[str, str]:
+    """Descrição do elemento do `<head>` para um pacote (usada pelo script de carga)."""
+    bundle = get_bundle(name)
+    element = {'id': f"asset-{name}", 'type': bundle['type']}
+    if inline:
+        element['content'] = bundle['content']
+    else:
+        element['href'] = asset_url(name)
+    return element
+
+
+_LOADER = """
+<script>
+(function () {
+    var doc = window.parent.document;
+    var elements = %s;
+    var meta = %s;
+    var removed = %s;
+    removed.forEach(function (id) {
+        var old = doc.getElementById(id);
+        if (old) { old.remove(); }
+    });
+    meta.forEach(function (attrs) {
+        var tag = doc.createElement('meta');
+        Object.keys(attrs).forEach(function (k) { tag.setAttribute(k, attrs[k]); });
+        doc.head.appendChild(tag);
+    });
+    elements.forEach(function (item) {
+        var old = doc.getElementById(item.id);
+        if (old && (item.content || old.getAttribute(item.type === 'css' ? 'href' : 'src') === item.href)) {
+            return;
+        }
+        if (old) { old.remove(); }
+        var tag;
+        if (item.type === 'css') {
+            tag = doc.createElement(item.content ? 'style' : 'link');
+            if (!item.content) { tag.rel = 'stylesheet'; tag.href = item.href; }
+        } else {
+            tag = doc.createElement('script');
+            if (!item.content) { tag.src = item.href; }
+        }
+        if (item.content) { tag.textContent = item.content; }
+        tag.id = item.id;
+        doc.head.appendChild(tag);
+    });
+})();
+</script>
+"""
+
+
+def _send_loader(elements: List[Dict[str, str]], meta: List[Dict[str, str]],
+                 removed: List[str]) -> None:
+    # "</" escapado para que o conteúdo embutido não feche a tag <script>
+    payload = [json.dumps(value).replace('</', '<\\/') for value in (elements, meta, removed)]
+    _run_script(_LOADER % tuple(payload))
+
+
+def _run_script(script: str) -> None:
+    """Executa o script na página (sem iframe quando o Streamlit permite)."""
+    if _HTML_RUNS_JAVASCRIPT:
+        st.html(script, unsafe_allow_javascript=True)
+    else:
+        components.html(script, height=0)
+
+
+@profiled('assets')
+def include_assets(*names: str, meta: Optional[List[Dict[str, str]]] = None) -> bool:
+    """
+    Garante que os pacotes (e as meta tags) estejam no `<head>` da página.
+
+    Só envia algo na primeira chamada da sessão para cada pacote; nas demais
+    não faz nada.
+
+    Args:
+        names: Nomes dos pacotes (ver `BUNDLES`)
+        meta: Meta tags (atributos de cada uma) a acrescentar ao `<head>`
+
+    Returns:
+        True se o script de carga foi enviado nesta chamada.
+    """
+    loaded = st.session_state.setdefault(_SESSION_KEY, set())
+    pending = [name for name in names if name not in loaded]
+    meta_key = None
+    if meta:
+        meta_key = 'meta:' + hashlib.sha256(json.dumps(meta, sort_keys=True).encode()).hexdigest()[:8]
+        if meta_key in loaded:
+            meta = None
+    if not pending and not meta:
+        return False
+
+    try:
+        inline = not static_serving_enabled()
+        elements = [_head_element(name, inline) for name in pending]
+    except Exception as e:
+        st.error(f"Erro ao carregar os arquivos de estilo: {e}")
+        return False
+
+    _send_loader(elements, meta or [], [])
+    loaded.update(pending)
+    if meta:
+        loaded.add(meta_key)
+    return True
+
+
+def remove_assets(*names: str) -> bool:
+    """
+    Retira do `<head>` pacotes carregados nesta sessão (por exemplo, os estilos
+    do login depois de entrar).
+
+    Returns:
+        True se o script de remoção foi enviado nesta chamada.
+    """
+    loaded = st.session_state.get(_SESSION_KEY, set())
+    present = [name for name in names if name in loaded]
+    if not present:
+        return False
+    _send_loader([], [], [f"asset-{name}" for name in present])
+    loaded.difference_update(present)
+    return True
@@ -0,0 +1,217 @@
+"""
+Formatos de serialização das entradas do cache em disco.
+
+Cada entrada começa com um cabeçalho que identifica o codec usado, então a
+leitura não depende de tentativas ("tenta DataFrame, depois pickle"):
+
+    b'FRC1' + <1 byte: tamanho do nome> + <nome do codec> + <dados>
+
+O codec é escolhido pelo tipo e tamanho do valor:
+
+- DataFrames: Feather (Arrow) quando o pyarrow estiver instalado, Parquet se o
+  índice não for o padrão, e pickle para o que o Arrow não aceitar;
+- valores pequenos: pickle sem compressão;
+- valores grandes: pickle comprimido com zstd ou lz4 quando instalados, senão
+  pickle sem compressão (o gzip era o gargalo das gravações).
+
+Novos formatos podem ser adicionados com `register_codec`.
+"""
+import gzip
+import importlib.util
+import io
+import pickle
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+MAGIC = b'FRC1'
+
+# Acima deste tamanho (em bytes) o pickle é comprimido, se houver um compressor rápido
+COMPRESSION_THRESHOLD = 64 * 1024
+
+
+class Codec:
+    """Formato de serialização de uma entrada do cache."""
+
+    def __init__(self, name: str, encode: Callable[[Any], bytes], decode: Callable[[bytes], Any]):
+        if len(name.encode()) > 255:
+            raise ValueError("O nome do codec deve ter no máximo 255 bytes")
+        self.name = name
+        self.encode = encode
+        self.decode = decode
+
+    def __repr__(self) -> str:
+        return f"Codec({self.name!r})"
+
+
+_CODECS: Dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec) -> None:
+    """Registra (ou substitui) um codec pelo nome."""
+    _CODECS[codec.name] = codec
+
+
+def get_codec(name: str) -> Codec:
+    """Retorna um codec registrado pelo nome."""
+    try:
+        return _CODECS[name]
+    except KeyError:
+        raise ValueError(f"Codec de cache desconhecido: {name}") from None
+
+
+def available_codecs() -> List[str]:
+    """Nomes dos codecs disponíveis neste ambiente."""
+    return list(_CODECS)
+
+
+def _pickle_dumps(value: Any) -> bytes:
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+register_codec(Codec('pickle', _pickle_dumps, pickle.loads))
+register_codec(Codec(
+    'pickle+gzip',
+    lambda value: gzip.compress(_pickle_dumps(value), compresslevel=6),
+    lambda data: pickle.loads(gzip.decompress(data))
+))
+
+# Compressores opcionais
+try:
+    from compression import zstd as _zstd  # Python 3.14+
+
+    register_codec(Codec(
+        'pickle+zstd',
+        lambda value: _zstd.compress(_pickle_dumps(value), level=3),
+        lambda data: pickle.loads(_zstd.decompress(data))
+    ))
+except ImportError:
+    try:
+        import zstandard as _zstandard
+
+        register_codec(Codec(
+            'pickle+zstd',
+            lambda value: _zstandard.ZstdCompressor(level=3).compress(_pickle_dumps(value)),
+            lambda data: pickle.loads(_zstandard.ZstdDecompressor().decompress(data))
+        ))
+    except ImportError:
+        pass
+
+try:
+    import lz4.frame as _lz4
+
+    register_codec(Codec(
+        'pickle+lz4',
+        lambda value: _lz4.compress(_pickle_dumps(value)),
+        lambda data: pickle.loads(_lz4.decompress(data))
+    ))
+except ImportError:
+    pass
+
+# O pyarrow e o pandas só são importados ao gravar ou ler o primeiro DataFrame
+if importlib.util.find_spec('pyarrow') is not None:
+
+    def _feather_encode(df) -> bytes:
+        import pandas as pd
+
+        index = df.index
+        if not (isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1
+                and index.name is None):
+            # Feather não guarda o índice; nesse caso o Parquet é usado
+            raise ValueError("Feather exige o índice padrão")
+        buffer = io.BytesIO()
+        df.to_feather(buffer)
+        return buffer.getvalue()
+
+    def _feather_decode(data: bytes):
+        import pandas as pd
+
+        return pd.read_feather(io.BytesIO(data))
+
+    def _parquet_encode(df) -> bytes:
+        buffer = io.BytesIO()
+        df.to_parquet(buffer)
+        return buffer.getvalue()
+
+    def _parquet_decode(data: bytes):
+        import pandas as pd
+
+        return pd.read_parquet(io.BytesIO(data))
+
+    register_codec(Codec('feather', _feather_encode, _feather_decode))
+    register_codec(Codec('parquet', _parquet_encode, _parquet_decode))
+
+
+# Ordem de preferência por tipo de valor
+DATAFRAME_CODECS = ['feather', 'parquet', 'pickle']
+COMPRESSED_CODECS = ['pickle+zstd', 'pickle+lz4']
+
+
+def _candidates(value: Any) -> List[str]:
+    """Codecs a tentar, em ordem de preferência, para um valor."""
+    pd = sys.modules.get('pandas')
+    if pd is not None and isinstance(value, pd.DataFrame):
+        return [name for name in DATAFRAME_CODECS if name in _CODECS]
+    return ['pickle']
+
+
+def encode_entry(value: Any, codec: Optional[str] = None) -> bytes:
+    """
+    Serializa um valor com o cabeçalho do codec.
+
+    Args:
+        value: Valor a serializar
+        codec: Nome do codec (opcional; por padrão é escolhido pelo tipo e tamanho)
+    """
+    if codec is not None:
+        selected = get_codec(codec)
+        payload = selected.encode(value)
+    else:
+        candidates = _candidates(value)
+        for name in candidates:
+            selected = _CODECS[name]
+            try:
+                payload = selected.encode(value)
+                break
+            except Exception:
+                # Colunas com tipos mistos, por exemplo, não são aceitas pelo Arrow
+                if name == candidates[-1]:
+                    raise
+        if selected.name == 'pickle' and len(payload) > COMPRESSION_THRESHOLD:
+            for name in COMPRESSED_CODECS:
+                if name in _CODECS:
+                    selected = _CODECS[name]
+                    payload = selected.encode(value)
+                    break
+    name = selected.name.encode()
+    return MAGIC + bytes([len(name)]) + name + payload
+
+
+def read_codec_name(data: bytes) -> Optional[str]:
+    """Retorna o nome do codec de uma entrada ou None se ela não tiver cabeçalho."""
+    # Aceita qualquer buffer (bytes, memoryview, mmap)
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        return None
+    size = data[len(MAGIC)]
+    start = len(MAGIC) + 1
+    return bytes(data[start:start + size]).decode()
+
+
+def decode_entry(data: bytes) -> Any:
+    """
+    Lê um valor serializado com `encode_entry`.
+
+    Entradas gravadas antes do cabeçalho (pickle do pandas com gzip ou pickle
+    simples) continuam sendo lidas.
+    """
+    name = read_codec_name(data)
+    if name is None:
+        return _decode_legacy(data)
+    start = len(MAGIC) + 1 + len(name.encode())
+    # memoryview evita copiar os dados para remover o cabeçalho
+    return get_codec(name).decode(memoryview(data)[start:])
+
+
+def _decode_legacy(data: bytes) -> Any:
+    if bytes(data[:2]) == b'\x1f\x8b':
+        return pickle.loads(gzip.decompress(data))
+    return pickle.loads(data)
@@ -0,0 +1,889 @@
+"""
+Motor de cache único do aplicativo.
+
+Reúne num só lugar o que antes estava dividido entre `cache_utils` e
+`performance_utils` (diretórios, chaves, formatos e limpeza diferentes):
+
+- camada em memória: LRU limitado em bytes (`config.MEMORY_CACHE_SIZE`);
+- camada em disco: arquivos em `config.CACHE_DIR/<namespace>/`, com índice
+  persistente, limite de `config.MAX_CACHE_SIZE` e remoção das entradas
+  expiradas em segundo plano;
+- chaves derivadas do conteúdo dos argumentos (`cache_keys`) e formato de
+  serialização escolhido por tipo de valor (`cache_codecs`);
+- proteção contra recálculos simultâneos da mesma chave.
+
+Cada uso do cache fica num namespace, o que permite limpar e medir partes do
+aplicativo separadamente, mas todos dividem o mesmo orçamento de memória e disco.
+As entradas também podem receber etiquetas (URL de origem, módulo, versão do
+catálogo) para serem invalidadas em grupo com `invalidate_tags`.
+Os decoradores de `performance_utils` e `cache_utils` são adaptadores sobre o
+motor padrão (`get_engine()`).
+"""
+import math
+import os
+import pickle
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import streamlit as st
+
+from .cache_codecs import decode_entry, encode_entry
+from .cache_keys import generate_cache_key
+from .cache_metrics import metrics
+from .cache_shared import FileVersion, file_version, process_lock, read_mapped
+from .logging_utils import get_logger
+from config import (CACHE_DIR, CACHE_PURGE_INTERVAL, CACHE_SHARED, CACHE_TTL, MAX_CACHE_SIZE,
+                    MEMORY_CACHE_SIZE)
+
+logger = get_logger(__name__)
+
+DEFAULT_NAMESPACE = 'default'
+
+# Valor padrão de `MemoryCache.get` para "não conferir a versão do arquivo"
+_ANY_VERSION = object()
+
+
+class _MemoryEntry(NamedTuple):
+    value: Any
+    expires_at: float
+    size: int
+    compute_time: float
+    tags: FrozenSet[str]
+    version: Optional[FileVersion]
+
+
+class MemoryCache:
+    """
+    Cache LRU em memória limitado pelo tamanho total (em bytes) das entradas.
+    
+    Funciona como primeira camada na frente do cache em disco: as entradas mais
+    usadas ficam no processo e as menos usadas são descartadas quando o limite
+    é ultrapassado (continuando disponíveis no disco).
+    
+    Os valores são compartilhados entre as chamadas; não os modifique.
+    """
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _MemoryEntry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+    
+    def get(self, key: str, now: Optional[float] = None,
+            version: Any = _ANY_VERSION) -> Tuple[bool, Any]:
+        """
+        Busca uma entrada válida no cache.
+        
+        Args:
+            version: Versão atual do arquivo em disco (opcional); se for diferente
+                da versão guardada com a entrada, ela está desatualizada
+        
+        Returns:
+            Tupla (encontrado, valor). Entradas expiradas ou desatualizadas são removidas.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry.expires_at <= now or (version is not _ANY_VERSION and entry.version != version):
+                self._remove(key)
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry.value
+    
+    def get_timing(self, key: str) -> Optional[Tuple[float, float]]:
+        """Retorna (expiração, tempo de cálculo) de uma entrada, sem alterar a ordem do LRU."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry.expires_at, entry.compute_time
+    
+    def set(self, key: str, value: Any, expires_at: float, size: Optional[int] = None,
+            compute_time: float = 0.0, tags: Iterable[str] = (),
+            version: Optional[FileVersion] = None) -> bool:
+        """
+        Armazena uma entrada até `expires_at` (timestamp absoluto).
+        
+        Args:
+            compute_time: Quanto tempo levou o cálculo do valor, usado na renovação antecipada
+            tags: Etiquetas usadas para invalidar a entrada (ver `delete_tagged`)
+            version: Versão do arquivo em disco de onde o valor veio (cache compartilhado)
+        
+        Returns:
+            False se a entrada for maior que o limite total e não couber na memória.
+        """
+        size = _estimate_size(value) if size is None else size
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return False
+            self._entries[key] = _MemoryEntry(value, expires_at, size, compute_time, frozenset(tags), version)
+            self._size += size
+            # Descarta as entradas menos usadas até caber no limite
+            evicted = evicted_bytes = 0
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                evicted_bytes += self._entries[oldest].size
+                evicted += 1
+                self._remove(oldest)
+            metrics.record_eviction('memory', evicted, evicted_bytes)
+            return True
+    
+    def delete(self, key: str) -> None:
+        """Remove uma entrada, se existir."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+    
+    def delete_tagged(self, tags: Iterable[str]) -> int:
+        """Remove as entradas que tenham alguma das etiquetas e retorna quantas foram removidas."""
+        tags = frozenset(tags)
+        with self._lock:
+            keys = [k for k, entry in self._entries.items() if entry.tags & tags]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+    
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove as entradas cujas chaves começam com `prefix`."""
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._remove(key)
+    
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+    
+    @property
+    def size(self) -> int:
+        """Tamanho total estimado das entradas em bytes."""
+        return self._size
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+    
+    def _remove(self, key: str) -> None:
+        self._size -= self._entries.pop(key).size
+
+
+class DiskCacheIndex:
+    """
+    Índice persistente (SQLite) das entradas do cache em disco.
+    
+    Guarda chave, namespace, arquivo, tamanho, último acesso, expiração e
+    etiquetas de cada entrada.
+    O tamanho total é mantido por gatilhos numa tabela de metadados, então
+    consultá-lo custa O(1) mesmo com vários processos gravando no mesmo diretório.
+    Quando o total passa de `max_bytes`, as entradas acessadas há mais tempo
+    são removidas.
+    
+    Args:
+        db_path: Arquivo SQLite do índice
+        max_bytes: Tamanho máximo das entradas registradas
+        adopt_orphans: Ao criar o índice, registra os arquivos de cache que já
+            estavam no diretório dele (desligue se o diretório não for só seu)
+    """
+    
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY,
+        path TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        last_access REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        namespace TEXT NOT NULL DEFAULT 'default'
+    );
+    CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+    CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+    CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+    INSERT OR IGNORE INTO meta (name, value) VALUES ('total_size', 0);
+    CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+        UPDATE meta SET value = value + NEW.size WHERE name = 'total_size';
+    END;
+    CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+        UPDATE meta SET value = value - OLD.size WHERE name = 'total_size';
+    END;
+    CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE OF size ON entries BEGIN
+        UPDATE meta SET value = value - OLD.size + NEW.size WHERE name = 'total_size';
+    END;
+    CREATE TABLE IF NOT EXISTS tags (
+        tag TEXT NOT NULL,
+        key TEXT NOT NULL,
+        PRIMARY KEY (tag, key)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS tags_key ON tags (key);
+    CREATE TRIGGER IF NOT EXISTS entries_ad_tags AFTER DELETE ON entries BEGIN
+        DELETE FROM tags WHERE key = OLD.key;
+    END;
+    """
+    
+    def __init__(self, db_path: str, max_bytes: int, adopt_orphans: bool = True):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.adopt_orphans = adopt_orphans
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+    
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            is_new = not os.path.exists(self.db_path)
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self._SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+            if 'namespace' not in columns:
+                # Índices criados antes dos namespaces
+                conn.execute("ALTER TABLE entries ADD COLUMN namespace TEXT NOT NULL DEFAULT 'default'")
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_namespace ON entries (namespace)")
+            self._conn = conn
+            if is_new and self.adopt_orphans:
+                self._adopt_orphans()
+        return self._conn
+    
+    def _adopt_orphans(self) -> None:
+        """Registra arquivos de cache que já existiam antes do índice."""
+        cache_dir = os.path.dirname(self.db_path)
+        for dirpath, _, filenames in os.walk(cache_dir):
+            for filename in filenames:
+                if not filename.endswith(('.pkl', '.bin')):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                # "<namespace>/<chave>.bin" vira a chave "<namespace>/<chave>"; arquivos
+                # na raiz (de antes dos namespaces) ficam no namespace padrão
+                key = os.path.splitext(os.path.relpath(path, cache_dir))[0].replace(os.sep, '/')
+                namespace = key.rpartition('/')[0] or DEFAULT_NAMESPACE
+                # Sem o TTL original, assume o padrão a partir da última modificação
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO entries (key, path, size, last_access, expires_at, namespace) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, path, stat.st_size, stat.st_mtime, stat.st_mtime + CACHE_TTL, namespace)
+                )
+    
+    def record(self, key: str, path: str, size: int, expires_at: float,
+               namespace: str = 'default', tags: Iterable[str] = ()) -> None:
+        """Registra (ou atualiza) uma entrada e aplica o limite de tamanho."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                """INSERT INTO entries (key, path, size, last_access, expires_at, namespace)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(key) DO UPDATE SET path = excluded.path, size = excluded.size,
+                       last_access = excluded.last_access, expires_at = excluded.expires_at,
+                       namespace = excluded.namespace""",
+                (key, path, size, time.time(), expires_at, namespace)
+            )
+            # As etiquetas da nova versão substituem as anteriores
+            conn.execute("DELETE FROM tags WHERE key = ?", (key,))
+            conn.executemany("INSERT OR IGNORE INTO tags (tag, key) VALUES (?, ?)",
+                             [(tag, key) for tag in tags])
+            self._evict()
+    
+    def touch(self, key: str) -> None:
+        """Atualiza o último acesso de uma entrada."""
+        with self._lock:
+            self._connection().execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+    
+    def remove(self, key: str) -> None:
+        """Remove uma entrada e o seu arquivo."""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT path FROM entries WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._delete_entries(conn, [(key, row[0])])
+    
+    def remove_namespace(self, namespace: str) -> int:
+        """
+        Remove todas as entradas de um namespace e os seus arquivos.
+        
+        Returns:
+            Número de entradas removidas.
+        """
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(
+                "SELECT key, path FROM entries WHERE namespace = ?", (namespace,)
+            ).fetchall()
+            self._delete_entries(conn, rows)
+            return len(rows)
+    
+    def remove_tagged(self, tags: Iterable[str]) -> List[str]:
+        """
+        Remove as entradas que tenham alguma das etiquetas e os seus arquivos.
+        
+        Returns:
+            Chaves das entradas removidas.
+        """
+        tags = list(tags)
+        if not tags:
+            return []
+        with self._lock:
+            conn = self._connection()
+            placeholders = ", ".join("?" * len(tags))
+            rows = conn.execute(
+                f"""SELECT DISTINCT entries.key, entries.path FROM tags
+                    JOIN entries ON entries.key = tags.key
+                    WHERE tags.tag IN ({placeholders})""",
+                tags
+            ).fetchall()
+            self._delete_entries(conn, rows)
+            return [key for key, _ in rows]
+    
+    def tags_of(self, key: str) -> FrozenSet[str]:
+        """Etiquetas registradas para uma entrada."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT tag FROM tags WHERE key = ?", (key,)
+            ).fetchall()
+        return frozenset(tag for tag, in rows)
+    
+    def namespace_stats(self) -> Dict[str, Dict[str, int]]:
+        """Número de entradas e bytes por namespace."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) FROM entries GROUP BY namespace"
+            ).fetchall()
+        return {namespace: {'entries': count, 'bytes': size} for namespace, count, size in rows}
+    
+    def total_size(self) -> int:
+        """Tamanho total das entradas registradas em bytes (O(1))."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value FROM meta WHERE name = 'total_size'"
+            ).fetchone()
+            return int(row[0]) if row else 0
+    
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """
+        Remove as entradas expiradas e os seus arquivos.
+        
+        Returns:
+            Número de entradas removidas.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(
+                "SELECT key, path, size FROM entries WHERE expires_at <= ?", (now,)
+            ).fetchall()
+            self._delete_entries(conn, [(key, path) for key, path, _ in rows])
+            metrics.record_eviction('disk', len(rows), sum(size for _, _, size in rows))
+            return len(rows)
+    
+    def close(self) -> None:
+        """Fecha a conexão (ela é reaberta no próximo uso)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def _evict(self) -> None:
+        """Remove as entradas menos usadas até o total caber no limite."""
+        conn = self._conn
+        excess = self.total_size() - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        evicted_bytes = 0
+        for key, path, size in conn.execute(
+            "SELECT key, path, size FROM entries ORDER BY last_access"
+        ):
+            victims.append((key, path))
+            evicted_bytes += size
+            excess -= size
+            if excess <= 0:
+                break
+        self._delete_entries(conn, victims)
+        metrics.record_eviction('disk', len(victims), evicted_bytes)
+    
+    @staticmethod
+    def _delete_entries(conn: sqlite3.Connection, rows: List[Tuple[str, str]]) -> None:
+        """Remove as entradas do índice e os arquivos correspondentes."""
+        if not rows:
+            return
+        conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in rows])
+        for _, path in rows:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class _Flight:
+    """Cálculo em andamento de uma chave, aguardado pelas demais chamadas."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _SingleFlight:
+    """
+    Garante que, para cada chave, apenas uma chamada execute o cálculo por vez.
+    
+    As chamadas concorrentes para a mesma chave esperam o resultado (ou o erro)
+    da chamada que está calculando, em vez de repetir o trabalho.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+    
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Executa `fn` se não houver cálculo em andamento; senão espera o resultado dele."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        return self._run(key, flight, fn)
+    
+    def try_do(self, key: str, fn: Callable[[], Any]) -> Tuple[bool, Any]:
+        """
+        Executa `fn` apenas se ninguém estiver calculando a chave, sem esperar.
+        
+        Returns:
+            Tupla (executou, resultado).
+        """
+        with self._lock:
+            if key in self._flights:
+                return False, None
+            flight = self._flights[key] = _Flight()
+        return True, self._run(key, flight, fn)
+    
+    def _run(self, key: str, flight: _Flight, fn: Callable[[], Any]) -> Any:
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+def write_atomic(path: str, payload: bytes) -> None:
+    """Grava um arquivo de forma atômica: os leitores veem o conteúdo antigo ou o novo, nunca parte dele."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    
+    # Arquivo temporário exclusivo: gravações concorrentes (de outros processos)
+    # não se sobrepõem, e os.replace troca o arquivo de forma atômica
+    fd, temp_file = tempfile.mkstemp(suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_file, path)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+def _estimate_size(value: Any) -> int:
+    """Estima o tamanho em bytes de um valor armazenado em cache."""
+    # Sem importar o pandas: só há DataFrames se ele já foi importado
+    pd = sys.modules.get('pandas')
+    if pd is not None and isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class CacheEngine:
+    """
+    Cache em duas camadas (memória e disco) organizado por namespaces.
+    
+    Args:
+        cache_dir: Diretório do cache em disco
+        max_disk_bytes: Limite do cache em disco (todas as namespaces)
+        max_memory_bytes: Limite da camada em memória (todas as namespaces)
+        purge_interval: Intervalo em segundos da limpeza de entradas expiradas (0 desativa)
+        shared: Se True, o diretório é compartilhado com outros processos (ver
+            `utils.cache_shared`): leituras via mmap, cópias em memória conferidas
+            contra a versão do arquivo e um único cálculo por chave entre os processos
+    """
+    
+    def __init__(self, cache_dir: str, max_disk_bytes: int = MAX_CACHE_SIZE,
+                 max_memory_bytes: int = MEMORY_CACHE_SIZE,
+                 purge_interval: int = CACHE_PURGE_INTERVAL,
+                 shared: bool = CACHE_SHARED):
+        self.cache_dir = str(cache_dir)
+        self.purge_interval = purge_interval
+        self.shared = shared
+        self.memory = MemoryCache(max_memory_bytes)
+        self.index = DiskCacheIndex(os.path.join(self.cache_dir, 'index.sqlite3'), max_disk_bytes)
+        self._single_flight = _SingleFlight()
+        self._purge_thread: Optional[threading.Thread] = None
+        self._purge_lock = threading.Lock()
+    
+    # Chaves e arquivos
+    
+    @staticmethod
+    def make_key(func: Callable, args: tuple, kwargs: dict) -> str:
+        """Chave de uma chamada de função: nome legível + hash do conteúdo dos argumentos."""
+        qualified_name = f"{func.__module__}.{func.__qualname__}"
+        return f"{func.__name__}_{generate_cache_key((qualified_name,) + tuple(args), kwargs)}"
+    
+    @staticmethod
+    def _entry_id(namespace: str, key: str) -> str:
+        return f"{namespace}/{key}"
+    
+    def _path(self, namespace: str, key: str) -> str:
+        return os.path.join(self.cache_dir, namespace, f"{key}.bin")
+    
+    # Leitura e escrita
+    
+    def get(self, namespace: str, key: str, ttl_seconds: int) -> Tuple[bool, Any]:
+        """
+        Procura uma entrada válida na memória e depois no disco.
+        
+        Uma entrada lida do disco é promovida para a memória com a expiração do
+        arquivo (última gravação + `ttl_seconds`), então o TTL é o mesmo nas duas camadas.
+        
+        Returns:
+            Tupla (encontrado, valor).
+        """
+        start = time.perf_counter()
+        found, value = self._lookup(namespace, key, ttl_seconds)
+        if found:
+            metrics.record_hit(namespace, time.perf_counter() - start)
+        else:
+            metrics.record_miss(namespace)
+        return found, value
+    
+    def _lookup(self, namespace: str, key: str, ttl_seconds: int) -> Tuple[bool, Any]:
+        """Busca nas duas camadas, registrando as métricas de cada uma."""
+        self._ensure_purge_thread()
+        entry_id = self._entry_id(namespace, key)
+        start = time.perf_counter()
+        now = time.time()
+        
+        if self.shared:
+            # Outro processo pode ter regravado ou invalidado a entrada
+            path = self._path(namespace, key)
+            version = file_version(path)
+            found, value = self.memory.get(entry_id, now, version=version)
+        else:
+            path = None
+            version = None
+            found, value = self.memory.get(entry_id, now)
+        if found:
+            metrics.record_hit('memory', time.perf_counter() - start)
+            return True, value
+        metrics.record_miss('memory')
+        
+        path = path or self._path(namespace, key)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            metrics.record_miss('disk')
+            return False, None
+        expires_at = stat.st_mtime + ttl_seconds
+        if expires_at <= now:
+            metrics.record_miss('disk')
+            return False, None
+        try:
+            value = self._read(path)
+        except Exception as e:
+            st.warning(f"Erro ao carregar do cache: {e}")
+            metrics.record_miss('disk')
+            return False, None
+        # O tamanho do arquivo serve de estimativa na memória (sem serializar de novo)
+        self.memory.set(entry_id, value, expires_at, size=stat.st_size, tags=self.index.tags_of(entry_id),
+                        version=version)
+        self.index.touch(entry_id)
+        metrics.record_hit('disk', time.perf_counter() - start)
+        return True, value
+    
+    def get_stale(self, namespace: str, key: str) -> Tuple[bool, Any]:
+        """Lê uma entrada do disco mesmo que já tenha expirado."""
+        try:
+            return True, self._read(self._path(namespace, key))
+        except Exception:
+            return False, None
+    
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: int,
+            compute_time: float = 0.0, tags: Iterable[str] = ()) -> None:
+        """
+        Grava uma entrada nas duas camadas.
+        
+        Args:
+            tags: Etiquetas da entrada (por exemplo, a URL de origem ou o módulo),
+                usadas para invalidá-la com `invalidate_tags`
+        """
+        entry_id = self._entry_id(namespace, key)
+        path = self._path(namespace, key)
+        expires_at = time.time() + ttl_seconds
+        tags = frozenset(tags)
+        size = None
+        try:
+            size = self._write(path, value)
+            self.index.record(entry_id, path, size, expires_at, namespace, tags)
+            metrics.record_store('disk', size)
+            metrics.record_store(namespace, size)
+        except Exception as e:
+            st.warning(f"Erro ao salvar no cache: {e}")
+        self.memory.set(entry_id, value, expires_at, size=size, compute_time=compute_time, tags=tags,
+                        version=file_version(path) if self.shared else None)
+    
+    def set_in_memory(self, namespace: str, key: str, value: Any, ttl_seconds: int,
+                      size: Optional[int] = None, tags: Iterable[str] = ()) -> None:
+        """
+        Guarda uma entrada só na camada em memória (por exemplo, um valor
+        provisório que não deve ser gravado no disco com o TTL normal).
+        """
+        path = self._path(namespace, key)
+        self.memory.set(self._entry_id(namespace, key), value, time.time() + ttl_seconds, size=size,
+                        tags=tags, version=file_version(path) if self.shared else None)
+    
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove uma entrada das duas camadas."""
+        entry_id = self._entry_id(namespace, key)
+        self.memory.delete(entry_id)
+        self.index.remove(entry_id)
+    
+    def get_or_compute(self, namespace: str, key: str, compute: Callable[[], Any],
+                       ttl_seconds: int = CACHE_TTL, serve_stale: bool = False,
+                       early_refresh_beta: float = 0.0,
+                       cache_if: Optional[Callable[[Any], bool]] = None,
+                       tags: Iterable[str] = ()) -> Any:
+        """
+        Retorna a entrada do cache ou calcula, grava e retorna o valor.
+        
+        Apenas uma chamada por processo calcula uma mesma chave por vez; as
+        demais esperam por ela.
+        
+        Args:
+            namespace: Namespace da entrada
+            key: Chave da entrada dentro do namespace
+            compute: Função sem argumentos que calcula o valor
+            ttl_seconds: Tempo de vida da entrada em segundos
+            serve_stale: Se True, enquanto o valor é recalculado as demais chamadas
+                recebem o valor expirado que ainda estiver no disco em vez de esperar
+            early_refresh_beta: Se maior que zero, renova a entrada de forma
+                probabilística antes de expirar (quanto maior, mais cedo); a chance
+                cresce com a proximidade da expiração e com o tempo de cálculo
+            cache_if: Função que decide se um resultado deve ser gravado (opcional)
+            tags: Etiquetas da entrada (ver `set`)
+        """
+        entry_id = self._entry_id(namespace, key)
+        
+        def compute_and_store():
+            start = time.perf_counter()
+            result = compute()
+            compute_time = time.perf_counter() - start
+            metrics.record_load(namespace, compute_time)
+            if cache_if is None or cache_if(result):
+                self.set(namespace, key, result, ttl_seconds, compute_time, tags)
+            return result
+        
+        def load_or_compute():
+            # Outra chamada pode ter gravado o valor enquanto esperávamos
+            found, value = self._lookup(namespace, key, ttl_seconds)
+            return value if found else compute_and_store()
+        
+        if self.shared:
+            local_load_or_compute = load_or_compute
+            
+            def load_or_compute():
+                # Também entre processos: um calcula, os outros esperam e leem do disco
+                with process_lock(os.path.join(self.cache_dir, 'locks'), entry_id):
+                    return local_load_or_compute()
+        
+        found, value = self.get(namespace, key, ttl_seconds)
+        if found:
+            if early_refresh_beta > 0 and self._should_refresh_early(entry_id, early_refresh_beta):
+                # Só quem for sorteado recalcula; se já houver um cálculo em andamento, usa o valor atual
+                refreshed, result = self._single_flight.try_do(entry_id, compute_and_store)
+                if refreshed:
+                    return result
+            return value
+        
+        if serve_stale and self._single_flight.in_flight(entry_id):
+            found, value = self.get_stale(namespace, key)
+            if found:
+                return value
+        
+        return self._single_flight.do(entry_id, load_or_compute)
+    
+    def memoize(self, namespace: str = DEFAULT_NAMESPACE, ttl_seconds: int = CACHE_TTL,
+                serve_stale: bool = False, early_refresh_beta: float = 0.0,
+                cache_if: Optional[Callable[[Any], bool]] = None,
+                tags: Union[Iterable[str], Callable[..., Iterable[str]]] = ()):
+        """
+        Decorador que guarda no cache o resultado da função (ver `get_or_compute`).
+        
+        Args:
+            tags: Etiquetas fixas ou uma função que recebe os mesmos argumentos
+                da função decorada e retorna as etiquetas de cada chamada
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                return self.get_or_compute(
+                    namespace,
+                    self.make_key(func, args, kwargs),
+                    lambda: func(*args, **kwargs),
+                    ttl_seconds=ttl_seconds,
+                    serve_stale=serve_stale,
+                    early_refresh_beta=early_refresh_beta,
+                    cache_if=cache_if,
+                    tags=tags(*args, **kwargs) if callable(tags) else tags
+                )
+            return wrapper
+        return decorator
+    
+    # Limpeza e estatísticas
+    
+    def clear(self, namespace: Optional[str] = None) -> bool:
+        """
+        Limpa o cache inteiro ou apenas um namespace.
+        
+        Returns:
+            True se a limpeza foi concluída.
+        """
+        import shutil
+        
+        if namespace is not None:
+            self.memory.delete_prefix(self._entry_id(namespace, ''))
+            self.index.remove_namespace(namespace)
+            return True
+        
+        self.memory.clear()
+        self.index.close()
+        if os.path.exists(self.cache_dir):
+            # Tarefas em segundo plano (revalidação do catálogo) podem gravar
+            # durante a remoção; os arquivos gravados nesse meio-tempo ficam
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return True
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Remove (da memória e do disco) as entradas que tenham alguma das etiquetas.
+        
+        Returns:
+            Número de entradas removidas.
+        """
+        removed = set(self.index.remove_tagged(tags))
+        # Entradas que já saíram do disco podem continuar na memória
+        memory_removed = self.memory.delete_tagged(tags)
+        return max(len(removed), memory_removed)
+    
+    def disk_size(self) -> int:
+        """Tamanho total do cache em disco em bytes (O(1))."""
+        return self.index.total_size()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Uso de memória e disco, no total e por namespace."""
+        return {
+            'memory': {'entries': len(self.memory), 'bytes': self.memory.size,
+                       'max_bytes': self.memory.max_bytes},
+            'disk': {'bytes': self.disk_size(), 'max_bytes': self.index.max_bytes},
+            'namespaces': self.index.namespace_stats(),
+        }
+    
+    def purge_expired(self) -> int:
+        """Remove as entradas expiradas do disco."""
+        return self.index.purge_expired()
+    
+    # Internos
+    
+    def _read(self, path: str) -> Any:
+        if self.shared:
+            return read_mapped(path, decode_entry)
+        with open(path, 'rb') as f:
+            return decode_entry(f.read())
+    
+    def _write(self, path: str, value: Any) -> int:
+        """Grava uma entrada de forma atômica e retorna o tamanho em bytes."""
+        payload = encode_entry(value)
+        write_atomic(path, payload)
+        return len(payload)
+    
+    def _should_refresh_early(self, entry_id: str, beta: float) -> bool:
+        """
+        Decide se uma entrada ainda válida deve ser renovada antes de expirar.
+        
+        Usa a expiração antecipada probabilística ("XFetch"): renova quando
+        `agora - tempo_de_calculo * beta * ln(u) >= expiracao`, com u uniforme em (0, 1].
+        """
+        timing = self.memory.get_timing(entry_id)
+        if timing is None:
+            return False
+        expires_at, compute_time = timing
+        if compute_time <= 0:
+            return False
+        return time.time() - compute_time * beta * math.log(1.0 - random.random()) >= expires_at
+    
+    def _purge_loop(self) -> None:
+        while True:
+            time.sleep(self.purge_interval)
+            try:
+                self.purge_expired()
+            except Exception:
+                logger.exception("erro ao remover entradas expiradas do cache")
+    
+    def _ensure_purge_thread(self) -> None:
+        """Inicia (uma vez por motor) a limpeza do cache em segundo plano."""
+        if self._purge_thread is not None or self.purge_interval <= 0:
+            return
+        with self._purge_lock:
+            if self._purge_thread is None:
+                self._purge_thread = threading.Thread(
+                    target=self._purge_loop, name="cache-purge", daemon=True
+                )
+                self._purge_thread.start()
+
+
+_default_engine: Optional[CacheEngine] = None
+_default_engine_lock = threading.Lock()
+
+
+def get_engine() -> CacheEngine:
+    """Retorna o motor de cache padrão do processo (criado no primeiro uso)."""
+    global _default_engine
+    if _default_engine is None:
+        with _default_engine_lock:
+            if _default_engine is None:
+                _default_engine = engine = CacheEngine(CACHE_DIR)
+                metrics.register_gauge('memory', 'bytes', lambda: engine.memory.size)
+                metrics.register_gauge('memory', 'entries', lambda: len(engine.memory))
+                metrics.register_gauge('disk', 'bytes', engine.disk_size)
+    return _default_engine
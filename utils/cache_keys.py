@@ -0,0 +1,239 @@
+"""
+Geração de chaves de cache baseadas no conteúdo dos argumentos.
+
+As chaves são derivadas de um hash incremental (SHA-256) do conteúdo de cada
+argumento, e não da sua representação em texto: `str()` de um DataFrame é uma
+prévia truncada (DataFrames diferentes geravam a mesma chave) e é lenta para
+objetos grandes.
+
+- DataFrames e Series usam `pd.util.hash_pandas_object`, além das colunas e tipos;
+- arrays do numpy são lidos diretamente do buffer;
+- funções usam o nome qualificado, o bytecode, as constantes e as variáveis
+  capturadas (lambdas diferentes não colidem);
+- objetos que se referenciam (ciclos) entram no hash pela posição da referência;
+- outros tipos podem registrar uma função com `register_fingerprint` ou
+  implementar o método `__cache_fingerprint__()`.
+
+O pandas e o numpy não são importados por este módulo: um DataFrame só existe
+depois que alguém importou o pandas, então basta consultar `sys.modules`.
+"""
+import hashlib
+import struct
+import sys
+import types
+from typing import Any, Callable, Dict, List, Optional
+
+# Funções de impressão digital registradas por tipo
+_FINGERPRINTS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def register_fingerprint(cls: type, func: Callable[[Any], Any]) -> None:
+    """
+    Registra como gerar a impressão digital dos objetos de um tipo.
+
+    Args:
+        cls: Tipo (as subclasses também são atendidas)
+        func: Função que recebe o objeto e devolve um valor que o identifique
+            (bytes, str, números ou coleções desses valores)
+    """
+    _FINGERPRINTS[cls] = func
+
+
+def unregister_fingerprint(cls: type) -> None:
+    """Remove a impressão digital registrada para um tipo."""
+    _FINGERPRINTS.pop(cls, None)
+
+
+def fingerprint(obj: Any) -> str:
+    """Retorna o hash hexadecimal do conteúdo de um objeto."""
+    hasher = hashlib.sha256()
+    _update(hasher, obj)
+    return hasher.hexdigest()[:32]
+
+
+def generate_cache_key(args: tuple, kwargs: dict) -> str:
+    """Gera uma chave de cache única para os argumentos fornecidos."""
+    # SHA-256 tem aceleração por hardware na maioria das CPUs e é o mais
+    # rápido do hashlib para buffers grandes (arrays, DataFrames)
+    hasher = hashlib.sha256()
+    _update(hasher, tuple(args))
+    _update(hasher, {k: kwargs[k] for k in sorted(kwargs)})
+    return hasher.hexdigest()[:32]
+
+
+def _tag(hasher, name: str) -> None:
+    """Marca o tipo do próximo valor para que 1, 1.0, '1' e True não colidam."""
+    hasher.update(name.encode())
+    hasher.update(b'\x00')
+
+
+def _update_bytes(hasher, data: bytes) -> None:
+    # O tamanho vem antes do conteúdo para que concatenações diferentes não colidam
+    hasher.update(struct.pack('<Q', len(data)))
+    hasher.update(data)
+
+
+def _update(hasher, obj: Any, path: Optional[List[int]] = None) -> None:
+    """
+    Acrescenta o conteúdo de `obj` ao hash.
+
+    Args:
+        path: Identificadores dos contêineres sendo percorridos; uma referência
+            a um deles (ciclo) entra no hash pela posição no caminho
+    """
+    if obj is None or isinstance(obj, (bool, int, float, complex)):
+        _tag(hasher, type(obj).__name__)
+        _update_bytes(hasher, repr(obj).encode())
+        return
+    if isinstance(obj, str):
+        _tag(hasher, 'str')
+        _update_bytes(hasher, obj.encode('utf-8', 'surrogatepass'))
+        return
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        _tag(hasher, 'bytes')
+        _update_bytes(hasher, bytes(obj))
+        return
+
+    path = [] if path is None else path
+    if id(obj) in path:
+        _tag(hasher, 'cycle')
+        hasher.update(struct.pack('<Q', path.index(id(obj))))
+        return
+    path.append(id(obj))
+    try:
+        _update_container(hasher, obj, path)
+    finally:
+        path.pop()
+
+
+def _update_container(hasher, obj: Any, path: List[int]) -> None:
+    """Coleções, funções, arrays e objetos arbitrários."""
+    if isinstance(obj, (list, tuple)):
+        _tag(hasher, type(obj).__name__)
+        hasher.update(struct.pack('<Q', len(obj)))
+        for item in obj:
+            _update(hasher, item, path)
+    elif isinstance(obj, dict):
+        _tag(hasher, 'dict')
+        hasher.update(struct.pack('<Q', len(obj)))
+        for key, value in _sorted_items(obj):
+            _update(hasher, key, path)
+            _update(hasher, value, path)
+    elif isinstance(obj, (set, frozenset)):
+        _tag(hasher, 'set')
+        # A ordem de iteração de um conjunto não é estável; ordena pelos hashes dos itens
+        for item_hash in sorted(_digest(item, path) for item in obj):
+            hasher.update(item_hash.encode())
+    elif isinstance(obj, (types.FunctionType, types.MethodType, types.BuiltinFunctionType,
+                          types.CodeType, type)):
+        _update_callable(hasher, obj, path)
+    elif not _update_array(hasher, obj):
+        _update_object(hasher, obj, path)
+
+
+def _digest(obj: Any, path: List[int]) -> str:
+    hasher = hashlib.sha256()
+    _update(hasher, obj, path)
+    return hasher.hexdigest()
+
+
+def _update_callable(hasher, obj: Any, path: List[int]) -> None:
+    """
+    Funções, métodos, classes e código, pelo nome qualificado e, nas funções,
+    pelo bytecode, constantes, nomes usados, valores padrão e variáveis
+    capturadas: duas lambdas com o mesmo nome e corpos diferentes não colidem.
+    """
+    if isinstance(obj, types.MethodType):
+        _tag(hasher, 'method')
+        _update(hasher, obj.__func__, path)
+        _update(hasher, obj.__self__, path)
+    elif isinstance(obj, types.CodeType):
+        _tag(hasher, 'code')
+        _update_bytes(hasher, obj.co_code)
+        _update(hasher, obj.co_consts, path)
+        _update(hasher, obj.co_names, path)
+    else:
+        _tag(hasher, type(obj).__name__)
+        _update(hasher, (getattr(obj, '__module__', None), getattr(obj, '__qualname__', repr(obj))), path)
+        if isinstance(obj, types.FunctionType):
+            _update(hasher, obj.__code__, path)
+            _update(hasher, obj.__defaults__, path)
+            _update(hasher, obj.__kwdefaults__, path)
+            cells = []
+            for cell in obj.__closure__ or ():
+                try:
+                    cells.append(cell.cell_contents)
+                except ValueError:  # variável capturada ainda sem valor
+                    cells.append(None)
+            _update(hasher, cells, path)
+
+
+def _update_array(hasher, obj: Any) -> bool:
+    """Objetos do pandas e do numpy (se já importados); retorna False para os demais."""
+    pd = sys.modules.get('pandas')
+    np = sys.modules.get('numpy')
+    if pd is not None and isinstance(obj, pd.DataFrame):
+        _tag(hasher, 'DataFrame')
+        _update(hasher, [str(c) for c in obj.columns])
+        _update(hasher, [str(t) for t in obj.dtypes])
+        _update_bytes(hasher, _hash_pandas(obj))
+    elif pd is not None and isinstance(obj, (pd.Series, pd.Index)):
+        _tag(hasher, type(obj).__name__)
+        _update(hasher, str(getattr(obj, 'name', None)))
+        _update(hasher, str(obj.dtype))
+        _update_bytes(hasher, _hash_pandas(obj))
+    elif np is not None and isinstance(obj, np.ndarray):
+        _tag(hasher, 'ndarray')
+        _update(hasher, (obj.dtype.str, obj.shape))
+        if obj.dtype.hasobject:
+            # Arrays de objetos não têm um buffer com o conteúdo
+            _update(hasher, obj.tolist())
+        else:
+            _update_bytes(hasher, np.ascontiguousarray(obj).data.cast('B'))
+    elif np is not None and isinstance(obj, np.generic):
+        _update(hasher, obj.item())
+    else:
+        return False
+    return True
+
+
+def _update_object(hasher, obj: Any, path: List[int]) -> None:
+    """Objetos arbitrários: registro, protocolo, atributos ou representação textual."""
+    cls = type(obj)
+    _tag(hasher, f"{cls.__module__}.{cls.__qualname__}")
+
+    for registered_cls in cls.__mro__:
+        func = _FINGERPRINTS.get(registered_cls)
+        if func is not None:
+            _update(hasher, func(obj), path)
+            return
+
+    method = getattr(obj, '__cache_fingerprint__', None)
+    if callable(method):
+        _update(hasher, method(), path)
+        return
+
+    if isinstance(getattr(obj, '__dict__', None), dict):
+        _update(hasher, vars(obj), path)
+        return
+
+    _update_bytes(hasher, repr(obj).encode())
+
+
+def _sorted_items(mapping: dict) -> list:
+    """Ordena os itens de um dicionário de forma estável mesmo com chaves de tipos diferentes."""
+    try:
+        return sorted(mapping.items())
+    except TypeError:
+        return sorted(mapping.items(), key=lambda item: (type(item[0]).__name__, repr(item[0])))
+
+
+def _hash_pandas(obj) -> bytes:
+    """Hash por linha de um objeto do pandas, incluindo o índice."""
+    pd = sys.modules['pandas']
+    try:
+        hashes = pd.util.hash_pandas_object(obj, index=True)
+    except TypeError:
+        # Colunas com valores não hasheáveis (listas, dicionários) usam a representação textual
+        hashes = pd.util.hash_pandas_object(obj.astype(str), index=True)
+    return hashes.to_numpy().tobytes()
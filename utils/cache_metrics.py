@@ -0,0 +1,206 @@
+"""
+Métricas dos caches do aplicativo (acertos, falhas, remoções, bytes e latência).
+
+Cada camada de cache registra os seus eventos num contador nomeado ("memory",
+"disk", "session", e um por namespace do motor de cache, como "catalog").
+Os contadores são inteiros protegidos por um lock por camada e as latências
+vão para histogramas de faixas fixas, então o custo por evento é de poucos
+microssegundos e as métricas podem ficar ativas em produção.
+
+Valores que mudam devagar (bytes ocupados) são medidos só na leitura, por
+funções registradas com `register_gauge`.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+# Limites superiores (em ms) das faixas dos histogramas de latência; a última faixa é "acima de 5 s"
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class LatencyHistogram:
+    """Histograma de latências com faixas fixas (padrão: `LATENCY_BUCKETS_MS`)."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'total_ms', 'max_ms')
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Limite superior (em ms) da faixa que contém o percentil pedido."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else None,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': self.max_ms,
+            'buckets_ms': dict(zip([str(b) for b in self.buckets] + ['+inf'], self.counts)),
+        }
+
+
+class LayerMetrics:
+    """Contadores de uma camada de cache."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self.stores = 0
+        self.stored_bytes = 0
+        self.hit_latency = LatencyHistogram()
+        self.load_latency = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else None,
+                'evictions': self.evictions,
+                'evicted_bytes': self.evicted_bytes,
+                'stores': self.stores,
+                'stored_bytes': self.stored_bytes,
+                'hit_latency': self.hit_latency.to_dict(),
+                'load_latency': self.load_latency.to_dict(),
+            }
+
+
+class CacheMetrics:
+    """Registro das métricas de todas as camadas de cache do processo."""
+
+    def __init__(self):
+        self._layers: Dict[str, LayerMetrics] = {}
+        self._gauges: Dict[str, Dict[str, Callable[[], int]]] = {}
+        self._lock = threading.Lock()
+
+    def layer(self, name: str) -> LayerMetrics:
+        """Retorna (criando no primeiro uso) os contadores de uma camada."""
+        layer = self._layers.get(name)
+        if layer is None:
+            with self._lock:
+                layer = self._layers.setdefault(name, LayerMetrics(name))
+        return layer
+
+    def record_hit(self, name: str, seconds: Optional[float] = None) -> None:
+        """Registra um acerto e, opcionalmente, quanto tempo levou para servi-lo."""
+        layer = self.layer(name)
+        with layer._lock:
+            layer.hits += 1
+            if seconds is not None:
+                layer.hit_latency.observe(seconds)
+
+    def record_miss(self, name: str) -> None:
+        """Registra uma falha (a entrada não estava no cache ou tinha expirado)."""
+        layer = self.layer(name)
+        with layer._lock:
+            layer.misses += 1
+
+    def record_load(self, name: str, seconds: float) -> None:
+        """Registra quanto tempo levou para calcular/carregar um valor após uma falha."""
+        layer = self.layer(name)
+        with layer._lock:
+            layer.load_latency.observe(seconds)
+
+    def record_store(self, name: str, size: int = 0) -> None:
+        """Registra a gravação de uma entrada de `size` bytes."""
+        layer = self.layer(name)
+        with layer._lock:
+            layer.stores += 1
+            layer.stored_bytes += size
+
+    def record_eviction(self, name: str, count: int = 1, size: int = 0) -> None:
+        """Registra a remoção de entradas por falta de espaço ou expiração."""
+        if count <= 0:
+            return
+        layer = self.layer(name)
+        with layer._lock:
+            layer.evictions += count
+            layer.evicted_bytes += size
+
+    @contextmanager
+    def time_load(self, name: str) -> Iterator[None]:
+        """Mede o bloco como o tempo de carga de uma camada."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_load(name, time.perf_counter() - start)
+
+    def register_gauge(self, name: str, metric: str, func: Callable[[], int]) -> None:
+        """
+        Registra uma medida calculada apenas na leitura das métricas.
+
+        Args:
+            name: Camada
+            metric: Nome da medida (por exemplo, "bytes")
+            func: Função sem argumentos que retorna o valor atual
+        """
+        with self._lock:
+            self._gauges.setdefault(name, {})[metric] = func
+        self.layer(name)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Retorna as métricas atuais de todas as camadas."""
+        with self._lock:
+            layers = dict(self._layers)
+            gauges = {name: dict(funcs) for name, funcs in self._gauges.items()}
+        result = {}
+        for name, layer in sorted(layers.items()):
+            data = layer.to_dict()
+            for metric, func in gauges.get(name, {}).items():
+                try:
+                    data[metric] = func()
+                except Exception:
+                    data[metric] = None
+            result[name] = data
+        return result
+
+    def reset(self) -> None:
+        """Zera os contadores (as medidas registradas são mantidas)."""
+        with self._lock:
+            for name in list(self._layers):
+                self._layers[name] = LayerMetrics(name)
+
+
+# Métricas compartilhadas por todas as camadas do processo
+metrics = CacheMetrics()
+
+
+def get_cache_metrics() -> Dict[str, Dict]:
+    """Retorna as métricas atuais de todas as camadas de cache."""
+    return metrics.snapshot()
+
+
+def reset_cache_metrics() -> None:
+    """Zera os contadores de todas as camadas de cache."""
+    metrics.reset()
@@ -0,0 +1,86 @@
+"""
+Suporte ao cache compartilhado entre vários processos do Streamlit no mesmo host.
+
+Ativado com `CACHE_SHARED=true`. Os processos já gravam no mesmo diretório de
+cache; este módulo acrescenta o que falta para que eles dividam uma única cópia
+dos dados em vez de cada um baixar e manter a sua:
+
+- leitura sem locks: os arquivos do cache nunca são alterados no lugar (cada
+  gravação cria um arquivo novo e o troca com `os.replace`), então os leitores
+  mapeiam o arquivo atual com `mmap` e nunca veem uma gravação pela metade.
+  As páginas mapeadas vêm do cache de páginas do sistema operacional,
+  compartilhado por todos os processos;
+- versão do arquivo (inode + mtime): a camada em memória de cada processo
+  confere a versão antes de usar a sua cópia, então gravações e invalidações
+  feitas por outro processo são vistas imediatamente;
+- lock entre processos (`flock`) apenas no cálculo de uma chave: só um processo
+  baixa a planilha ou recalcula o valor; os outros esperam e leem do disco.
+"""
+import hashlib
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem lock entre processos
+    fcntl = None
+
+FileVersion = Tuple[int, int]
+
+
+def file_version(path: str) -> Optional[FileVersion]:
+    """Identifica a versão atual de um arquivo (inode, mtime em ns) ou None se ele não existir."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def read_mapped(path: str, decode: Callable[[Any], Any]) -> Any:
+    """
+    Lê um arquivo com `mmap` e o decodifica sem copiar os bytes para a memória do processo.
+
+    Args:
+        path: Arquivo do cache
+        decode: Função que recebe um objeto com interface de buffer
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return decode(b'')
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return decode(mapped)
+    finally:
+        try:
+            mapped.close()
+        except BufferError:
+            # Ainda há uma referência ao buffer (por exemplo, num traceback); o GC fecha depois
+            pass
+
+
+@contextmanager
+def process_lock(lock_dir: str, key: str) -> Iterator[None]:
+    """
+    Lock exclusivo entre processos para uma chave.
+
+    Em sistemas sem `fcntl` o bloco é executado sem lock (cada processo calcula
+    o valor por conta própria, como sem o cache compartilhado).
+    """
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(lock_dir, exist_ok=True)
+    name = hashlib.sha256(key.encode()).hexdigest()[:32]
+    fd = os.open(os.path.join(lock_dir, f"{name}.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
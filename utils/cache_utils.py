@@ -1,70 +1,43 @@
-import streamlit as st
-import pandas as pd
-import time
-from functools import wraps
-import hashlib
-import os
+"""
+Cache de DataFrames usado pelas primeiras páginas do curso.
 
-# Configuração do diretório de cache
-CACHE_DIR = ".cache"
-if not os.path.exists(CACHE_DIR):
-    os.makedirs(CACHE_DIR)
+Mantido por compatibilidade: os decoradores usam o motor de cache único
+(`utils.cache_engine`), no namespace "dataframe", dividindo o mesmo orçamento
+e a mesma limpeza que `utils.performance_utils`.
+"""
+import sys
 
-def get_cache_key(func_name, *args, **kwargs):
-    """Gera uma chave única para o cache baseada nos argumentos da função."""
-    key_parts = [func_name] + list(args) + [f"{k}={v}" for k, v in sorted(kwargs.items())]
-    key_string = "_".join(str(part) for part in key_parts)
-    return hashlib.md5(key_string.encode()).hexdigest()
+from .cache_engine import get_engine
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+NAMESPACE = 'dataframe'
+
+def _is_non_empty_dataframe(result):
+    # Sem importar o pandas: se ele não foi carregado, o resultado não é um DataFrame
+    pd = sys.modules.get('pandas')
+    return pd is not None and isinstance(result, pd.DataFrame) and not result.empty
 
 def cached_dataframe(ttl=3600):
-    ""
+    """
     Decorador para armazenar em cache DataFrames retornados por funções.
     
+    Apenas DataFrames não vazios são guardados; outros resultados são
+    recalculados a cada chamada.
+    
     Args:
         ttl: Tempo de vida do cache em segundos (padrão: 1 hora)
     """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            # Gera uma chave única para este conjunto de argumentos
-            cache_key = get_cache_key(func.__name__, *args, **kwargs)
-            cache_file = os.path.join(CACHE_DIR, f"{cache_key}.pkl")
-            
-            # Verifica se o cache é válido
-            if os.path.exists(cache_file):
-                file_age = time.time() - os.path.getmtime(cache_file)
-                if file_age < ttl:
-                    try:
-                        # Tenta carregar do cache
-                        return pd.read_pickle(cache_file)
-                    except:
-                        # Se houver erro ao ler o cache, continua para recriá-lo
-                        pass
-            
-            # Se não tiver cache ou estiver expirado, executa a função
-            result = func(*args, **kwargs)
-            
-            # Salva o resultado no cache
-            if isinstance(result, pd.DataFrame) and not result.empty:
-                try:
-                    result.to_pickle(cache_file)
-                except:
-                    # Se não conseguir salvar o cache, apenas continua
-                    pass
-            
-            return result
-        return wrapper
-    return decorator
+    return get_engine().memoize(namespace=NAMESPACE, ttl_seconds=ttl,
+                                cache_if=_is_non_empty_dataframe)
 
 def clear_cache():
-    """Limpa todos os arquivos de cache."""
-    for filename in os.listdir(CACHE_DIR):
-        file_path = os.path.join(CACHE_DIR, filename)
-        try:
-            if os.path.isfile(file_path):
-                os.unlink(file_path)
-        except Exception as e:
-            print(f"Erro ao deletar {file_path}: {e}")
+    """Limpa os DataFrames em cache."""
+    try:
+        get_engine().clear(NAMESPACE)
+    except Exception as e:
+        logger.error("erro ao limpar o cache", extra={'error': str(e)})
 
 # Exemplo de uso:
 # @cached_dataframe(ttl=3600)  # Cache por 1 hora
@@ -0,0 +1,284 @@
+"""
+Catálogo de aulas (a planilha do curso) com cache e invalidação por módulo.
+
+A planilha é baixada uma vez por `CATALOG_TTL` e guardada no motor de cache
+(namespace "catalog"). A cada carga, calcula-se uma versão (hash do conteúdo)
+para cada módulo e compara-se com a versão da carga anterior: só os módulos
+que mudaram têm as suas entradas derivadas invalidadas (etiqueta `module_tag`),
+em vez de limpar o cache inteiro.
+
+As entradas derivadas do catálogo (lições, HTML renderizado) devem ser gravadas
+com as etiquetas `source_tag`, `module_tag` e `version_tag`.
+
+Cada download bem-sucedido também é gravado como um instantâneo em
+`config.CACHE_DIR/snapshots/`, fora dos limites e da expiração do cache. Quando
+o catálogo não está no cache (por exemplo, logo após reiniciar o servidor),
+o instantâneo é servido imediatamente e a planilha é baixada de novo em
+segundo plano. O instantâneo lido fica na camada em memória por
+`SNAPSHOT_MEMORY_TTL` segundos, e cada planilha tem no máximo um novo download
+em segundo plano a cada `REVALIDATE_BACKOFF` segundos (com a rede fora do ar,
+as páginas não disparam um download por chamada).
+"""
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from .cache_codecs import decode_entry, encode_entry
+from .cache_engine import get_engine, write_atomic
+from .cache_keys import fingerprint
+from .logging_utils import get_logger
+from .profiler import profiled
+from config import CACHE_DIR, CACHE_TTL
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = get_logger(__name__)
+
+CATALOG_NAMESPACE = 'catalog'
+VERSIONS_NAMESPACE = 'catalog_versions'
+
+# Tempo até a planilha ser baixada de novo
+CATALOG_TTL = CACHE_TTL
+
+# As versões por módulo precisam durar mais que o catálogo para que a comparação seja possível
+VERSIONS_TTL = 30 * 24 * 3600
+
+MODULE_COLUMN = 'Módulo'
+
+SNAPSHOT_DIR = os.path.join(str(CACHE_DIR), 'snapshots')
+
+# Tempo que o instantâneo lido fica na memória enquanto a planilha não é baixada
+SNAPSHOT_MEMORY_TTL = 60
+
+# Intervalo mínimo entre as tentativas de download em segundo plano de uma planilha
+REVALIDATE_BACKOFF = 60
+
+# Planilhas sendo baixadas em segundo plano e horário da última tentativa de cada uma
+_revalidating = set()
+_revalidated_at: Dict[str, float] = {}
+_revalidating_lock = threading.Lock()
+
+
+def normalize_module(module_name: str) -> str:
+    """Nome do módulo usado nas etiquetas e comparações (sem espaços extras, minúsculo)."""
+    return str(module_name).strip().lower()
+
+
+def source_tag(source: str) -> str:
+    """Etiqueta das entradas derivadas de uma planilha."""
+    return f"source:{source}"
+
+
+def module_tag(module_name: str) -> str:
+    """Etiqueta das entradas derivadas de um módulo."""
+    return f"module:{normalize_module(module_name)}"
+
+
+def version_tag(module_name: str, version: str) -> str:
+    """Etiqueta das entradas derivadas de uma versão específica de um módulo."""
+    return f"catalog:{normalize_module(module_name)}:{version}"
+
+
+def _default_loader(source: str) -> 'pd.DataFrame':
+    """Lê uma planilha do Google Sheets ou um arquivo Excel local."""
+    if source.startswith(('http://', 'https://')):
+        from .excel_utils import load_excel_from_google_drive
+        return load_excel_from_google_drive(source)
+    import pandas as pd
+    return pd.read_excel(source)
+
+
+def module_versions(df: 'pd.DataFrame') -> Dict[str, str]:
+    """
+    Calcula a versão (hash do conteúdo) de cada módulo do catálogo.
+
+    O índice é descartado para que inserir linhas num módulo não altere a
+    versão dos demais.
+    """
+    if df is None or df.empty or MODULE_COLUMN not in df.columns:
+        return {}
+    keys = df[MODULE_COLUMN].fillna('').astype(str).map(normalize_module)
+    return {
+        module: fingerprint(rows.reset_index(drop=True))
+        for module, rows in df.groupby(keys, sort=True)
+    }
+
+
+def sync_versions(source: str, df: 'pd.DataFrame') -> List[str]:
+    """
+    Compara as versões dos módulos com as da carga anterior e invalida as
+    entradas dos módulos que mudaram (ou foram removidos).
+
+    Returns:
+        Módulos alterados. Na primeira carga (sem versão anterior) nada é invalidado.
+    """
+    engine = get_engine()
+    versions = module_versions(df)
+    key = fingerprint(source)
+    found, previous = engine.get(VERSIONS_NAMESPACE, key, VERSIONS_TTL)
+
+    changed = []
+    if found:
+        changed = sorted(
+            module for module in set(previous) | set(versions)
+            if previous.get(module) != versions.get(module)
+        )
+        if changed:
+            engine.invalidate_tags(*[module_tag(module) for module in changed])
+
+    engine.set(VERSIONS_NAMESPACE, key, versions, VERSIONS_TTL, tags=[source_tag(source)])
+    return changed
+
+
+def _snapshot_path(source: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"{fingerprint(source)}.bin")
+
+
+def _snapshot_size(source: str) -> Optional[int]:
+    try:
+        return os.path.getsize(_snapshot_path(source))
+    except OSError:
+        return None
+
+
+def save_snapshot(source: str, df: 'pd.DataFrame') -> None:
+    """Grava o instantâneo do catálogo usado para servir rapidamente após reiniciar."""
+    try:
+        write_atomic(_snapshot_path(source), encode_entry(df))
+    except Exception as e:
+        logger.error("erro ao salvar o instantâneo do catálogo", extra={'source': source, 'error': str(e)})
+
+
+def load_snapshot(source: str) -> Optional['pd.DataFrame']:
+    """Lê o último instantâneo do catálogo, ou None se não houver."""
+    try:
+        with open(_snapshot_path(source), 'rb') as f:
+            return decode_entry(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error("erro ao ler o instantâneo do catálogo", extra={'source': source, 'error': str(e)})
+        return None
+
+
+def revalidate_in_background(source: str,
+                             loader: Optional[Callable[[str], 'pd.DataFrame']] = None) -> bool:
+    """
+    Baixa o catálogo de novo numa thread em segundo plano (uma por planilha).
+
+    Returns:
+        False se já houver um download em andamento para a planilha ou se a
+        última tentativa foi há menos de `REVALIDATE_BACKOFF` segundos.
+    """
+    now = time.time()
+    with _revalidating_lock:
+        if source in _revalidating or now - _revalidated_at.get(source, 0) < REVALIDATE_BACKOFF:
+            return False
+        _revalidating.add(source)
+        _revalidated_at[source] = now
+
+    def run():
+        try:
+            refresh_catalog(source, loader)
+        except Exception:
+            logger.exception("erro ao atualizar o catálogo em segundo plano", extra={'source': source})
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(source)
+
+    threading.Thread(target=run, name="catalog-revalidate", daemon=True).start()
+    return True
+
+
+@profiled('spreadsheet.catalog')
+def load_catalog(source: str, loader: Optional[Callable[[str], 'pd.DataFrame']] = None) -> 'pd.DataFrame':
+    """
+    Carrega o catálogo de aulas, usando o cache enquanto ele for válido.
+
+    Se o catálogo não estiver no cache mas houver um instantâneo gravado, o
+    instantâneo é retornado imediatamente (e guardado na memória por
+    `SNAPSHOT_MEMORY_TTL` segundos) e a planilha é baixada em segundo plano.
+
+    Args:
+        source: URL da planilha do Google Sheets ou caminho de um arquivo Excel
+        loader: Função que lê a planilha (opcional; por padrão escolhe pelo tipo de origem)
+
+    Returns:
+        DataFrame com as aulas (vazio em caso de erro; erros não são guardados no cache)
+    """
+    loader = loader or _default_loader
+    engine = get_engine()
+
+    found, df = engine.get(CATALOG_NAMESPACE, fingerprint(source), CATALOG_TTL)
+    if found:
+        return df
+
+    snapshot = load_snapshot(source)
+    if snapshot is not None:
+        # Só na memória: no disco, o instantâneo passaria por um catálogo recém-baixado
+        engine.set_in_memory(CATALOG_NAMESPACE, fingerprint(source), snapshot, SNAPSHOT_MEMORY_TTL,
+                             size=_snapshot_size(source), tags=[source_tag(source)])
+        revalidate_in_background(source, loader)
+        return snapshot
+
+    def fetch():
+        df = loader(source)
+        if df is not None and not df.empty:
+            sync_versions(source, df)
+            save_snapshot(source, df)
+        return df
+
+    return engine.get_or_compute(
+        CATALOG_NAMESPACE,
+        fingerprint(source),
+        fetch,
+        ttl_seconds=CATALOG_TTL,
+        cache_if=lambda df: df is not None and not df.empty,
+        tags=[source_tag(source)]
+    )
+
+
+def refresh_catalog(source: str, loader: Optional[Callable[[str], 'pd.DataFrame']] = None) -> List[str]:
+    """
+    Baixa o catálogo de novo, ignorando o cache.
+
+    Returns:
+        Módulos cujas entradas foram invalidadas por terem mudado.
+    """
+    loader = loader or _default_loader
+    df = loader(source)
+    if df is None or df.empty:
+        return []
+    changed = sync_versions(source, df)
+    get_engine().set(CATALOG_NAMESPACE, fingerprint(source), df, CATALOG_TTL,
+                     tags=[source_tag(source)])
+    save_snapshot(source, df)
+    return changed
+
+
+def get_catalog_version(source: str, module_name: str) -> Optional[str]:
+    """Versão atual de um módulo, ou None se o catálogo ainda não foi carregado."""
+    found, versions = get_engine().get(VERSIONS_NAMESPACE, fingerprint(source), VERSIONS_TTL)
+    if not found:
+        return None
+    return versions.get(normalize_module(module_name))
+
+
+def catalog_tags(source: str, module_name: str, version: Optional[str] = None) -> List[str]:
+    """Etiquetas de uma entrada derivada de um módulo do catálogo."""
+    tags = [source_tag(source), module_tag(module_name)]
+    if version is not None:
+        tags.append(version_tag(module_name, version))
+    return tags
+
+
+def invalidate_source(source: str) -> int:
+    """Remove do cache o catálogo de uma planilha e tudo o que foi derivado dele."""
+    return get_engine().invalidate_tags(source_tag(source))
+
+
+def invalidate_module(module_name: str) -> int:
+    """Remove do cache tudo o que foi derivado de um módulo."""
+    return get_engine().invalidate_tags(module_tag(module_name))
@@ -1,10 +1,10 @@
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import pandas as pd
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 import streamlit as st
 
-def get_google_sheet_data(credentials_file: str, spreadsheet_url: str, worksheet_name: str = None) -> pd.DataFrame:
+if TYPE_CHECKING:
+    import pandas as pd
+
+def get_google_sheet_data(credentials_file: str, spreadsheet_url: str, worksheet_name: str = None) -> 'pd.DataFrame':
     """
     Lê dados de uma planilha do Google Sheets.
     
@@ -16,6 +16,10 @@ def get_google_sheet_data(credentials_file: str, spreadsheet_url: str, worksheet
     Returns:
         DataFrame do pandas com os dados da planilha
     """
+    import gspread
+    import pandas as pd
+    from oauth2client.service_account import ServiceAccountCredentials
+
     try:
         # Configura as permissões
         scope = ['https://spreadsheets.google.com/feeds',
@@ -43,7 +47,7 @@ def get_google_sheet_data(credentials_file: str, spreadsheet_url: str, worksheet
         st.error(f"Erro ao acessar o Google Sheets: {str(e)}")
         return pd.DataFrame()
 
-def display_videos_from_dataframe(df: pd.DataFrame, video_column: str, title_column: str = None, 
+def display_videos_from_dataframe(df: 'pd.DataFrame', video_column: str, title_column: str = None, 
                                description_column: str = None) -> None:
     """
     Exibe vídeos a partir de um DataFrame.
@@ -1,10 +1,11 @@
-import pandas as pd
 import streamlit as st
-import requests
 from urllib.parse import urlparse, parse_qs
 from io import BytesIO
 import time
 
+from .profiler import profiled
+from config import SESSION_DEBUG_INFO_MAX
+
 def get_google_sheets_url(url):
     """
     Converte a URL de edição para URL de exportação CSV
@@ -44,6 +45,7 @@ def get_google_sheets_url(url):
         st.error(f"URL fornecida: {url}")
         return None
 
+@profiled('spreadsheet.download')
 def load_excel_from_google_drive(url, max_retries=3, retry_delay=2):
     """
     Carrega um arquivo Excel do Google Drive com tratamento de erros e retentativas
@@ -56,6 +58,10 @@ def load_excel_from_google_drive(url, max_retries=3, retry_delay=2):
     Returns:
         DataFrame com os dados da planilha ou DataFrame vazio em caso de erro
     """
+    # pandas e requests só são importados no primeiro download
+    import pandas as pd
+    import requests
+
     # Inicializa a sessão de debug se não existir
     if 'debug_info' not in st.session_state:
         st.session_state.debug_info = []
@@ -64,6 +70,8 @@ def load_excel_from_google_drive(url, max_retries=3, retry_delay=2):
         """Adiciona uma mensagem ao log de depuração"""
         timestamp = pd.Timestamp.now().strftime('%H:%M:%S')
         st.session_state.debug_info.append(f"[{timestamp}] {message}")
+        # Guarda só as mensagens mais recentes
+        del st.session_state.debug_info[:-SESSION_DEBUG_INFO_MAX]
     
     add_debug_info(f"Iniciando carregamento da planilha: {url}")
     
@@ -136,6 +144,8 @@ def display_videos(df, video_column='Link do Vídeo', title_column='Título da A
     """
     Exibe vídeos a partir de um DataFrame com as colunas específicas da planilha
     """
+    import pandas as pd
+
     if df.empty:
         st.warning("Nenhum vídeo encontrado na planilha.")
         return
@@ -0,0 +1,191 @@
+"""
+Fragmentos de HTML das lições, com templates pré-compilados e memoização.
+
+Os templates (cabeçalho do card, botão de conclusão, estatísticas, ações do
+material e botões de links) são montados uma vez na importação, já com os
+ícones SVG embutidos. O HTML renderizado fica num `lru_cache` do processo,
+identificado pelo template e pelos valores dos campos: re-renderizar um
+módulo com 50 lições é, na maior parte, uma sequência de consultas a um
+dicionário. Como a chave são os próprios valores, uma lição alterada na
+planilha gera um fragmento novo sem precisar invalidar nada.
+
+Os fragmentos não vão para o motor de cache: ler um fragmento do disco custa
+mais do que renderizá-lo.
+"""
+import html
+from functools import lru_cache
+from string import Template
+from typing import Any, Dict, Optional, Tuple
+
+import streamlit as st
+
+# Fragmentos guardados por processo (algumas variações de cada lição do curso)
+FRAGMENT_CACHE_ENTRIES = 4096
+
+_SVG = ('<svg width="{size}" height="{size}" viewBox="0 0 24 24" fill="none" stroke="currentColor" '
+        'stroke-width="2" stroke-linecap="round" stroke-linejoin="round">{body}</svg>')
+
+ICONS = {
+    'icon_clock': _SVG.format(size=16, body='<circle cx="12" cy="12" r="10"></circle>'
+                                            '<polyline points="12 6 12 12 16 14"></polyline>'),
+    'icon_level': _SVG.format(size=16, body='<path d="M22 11.08V12a10 10 0 1 1-5.93-9.14"></path>'
+                                            '<polyline points="22 4 12 14.01 9 11.01"></polyline>'),
+    'icon_heart': _SVG.format(size=20, body='<path d="M20.84 4.61a5.5 5.5 0 0 0-7.78 0L12 5.67l-1.06-1.06a5.5 5.5 0 0 0-7.78 7.78l1.06 1.06L12 21.23l7.78-7.78 1.06-1.06a5.5 5.5 0 0 0 0-7.78z"></path>'),
+    'icon_share': _SVG.format(size=20, body='<circle cx="18" cy="5" r="3"></circle><circle cx="6" cy="12" r="3"></circle>'
+                                            '<circle cx="18" cy="19" r="3"></circle>'
+                                            '<line x1="8.59" y1="13.51" x2="15.42" y2="17.49"></line>'
+                                            '<line x1="15.41" y1="6.51" x2="8.59" y2="10.49"></line>'),
+    'icon_eye': _SVG.format(size=18, body='<path d="M1 12s4-8 11-8 11 8 11 8-4 8-11 8-11-8-11-8z"></path>'
+                                          '<circle cx="12" cy="12" r="3"></circle>'),
+    'icon_heart_small': _SVG.format(size=18, body='<path d="M20.84 4.61a5.5 5.5 0 0 0-7.78 0L12 5.67l-1.06-1.06a5.5 5.5 0 0 0-7.78 7.78l1.06 1.06L12 21.23l7.78-7.78 1.06-1.06a5.5 5.5 0 0 0 0-7.78z"></path>'),
+    'icon_download': _SVG.format(size=18, body='<path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path>'
+                                               '<polyline points="7 10 12 15 17 10"></polyline>'
+                                               '<line x1="12" y1="15" x2="12" y2="3"></line>'),
+    'icon_copy': _SVG.format(size=18, body='<rect x="9" y="9" width="13" height="13" rx="2" ry="2"></rect>'
+                                           '<path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"></path>'),
+    'icon_file': _SVG.format(size=20, body='<path d="M14 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2V8z"></path>'
+                                           '<polyline points="14 2 14 8 20 8"></polyline>'
+                                           '<line x1="16" y1="13" x2="8" y2="13"></line>'
+                                           '<line x1="16" y1="17" x2="8" y2="17"></line>'
+                                           '<polyline points="10 9 9 9 8 9"></polyline>'),
+    'icon_check': ('<svg viewBox="0 0 24 24" id="ghq-svg-check" role="presentation" aria-hidden="true">'
+                   '<path d="M9.86 18a1 1 0 01-.73-.32l-4.86-5.17a1 1 0 111.46-1.37l4.12 4.39 8.41-9.2a1 1 0 111.48 1.34l-9.14 10a1 1 0 01-.73.33h-.01z"></path></svg>'),
+}
+
+_RAW_TEMPLATES = {
+    'lesson_header': """
+<div class="$card_class" data-theme="$theme" data-aos="fade-up">
+    <div class="lesson-header">
+        <div class="header-content">
+            <h3>$title</h3>
+            <div class="lesson-meta">
+                <span class="lesson-duration">$icon_clock $duration</span>
+                <span class="lesson-level">$icon_level $level</span>
+            </div>
+        </div>
+        <div class="lesson-actions">
+            <button class="action-btn favorite" title="Favoritar">$icon_heart</button>
+            <button class="action-btn share" title="Compartilhar">$icon_share</button>
+        </div>
+    </div>
+""",
+    'completion_toggle': """
+<div class="completion-toggle">
+    <label class="toggle-container">
+        <input type="checkbox" id="complete_$lesson_id" class="toggle-input" $checked
+               onchange="this.closest('.stCheckbox').querySelector('input[type=checkbox]').click()">
+        <div class="toggle-track">
+            <div class="toggle-indicator"><div class="checkmark">$icon_check</div></div>
+        </div>
+        <div class="toggle-label"><span class="toggle-label-text">$toggle_label</span></div>
+    </label>
+</div>
+""",
+    'lesson_stats': """
+<div class="lesson-stats">
+    <div class="stat-item">$icon_eye<span>1.2k visualizações</span></div>
+    <div class="stat-item">$icon_heart_small<span>845 favoritos</span></div>
+</div>
+""",
+    'material_actions': """
+<div class="material-actions">
+    <a href="$download_url" class="btn" download>$icon_download<span>Baixar Material</span></a>
+    <a href="$view_url" class="btn btn-outline" target="_blank" rel="noopener noreferrer">$icon_eye<span>Visualizar</span></a>
+    <button class="btn btn-icon" onclick="copyToClipboard('$view_url', this)">$icon_copy<span>Copiar Link</span></button>
+</div>
+
+<div class="material-preview">
+    <div class="preview-header">$icon_file<span>Pré-visualização do Material</span></div>
+    <div class="preview-content">
+        <h4>$title</h4>
+        <p>Clique em "Visualizar" para ver o conteúdo completo deste material de estudo.</p>
+    </div>
+</div>
+""",
+    'download_button': (
+        '<a href="$url" style="display: inline-flex; align-items: center; background-color: #1E88E5; '
+        'color: white; padding: 10px 20px; border-radius: 4px; text-decoration: none; font-weight: bold; '
+        'margin: 10px 0;" target="_blank">📥 Baixar Material</a>'
+    ),
+    'youtube_button': (
+        '<a href="$url" style="display: inline-flex; align-items: center; background-color: #FF0000; '
+        'color: white; padding: 10px 20px; border-radius: 4px; text-decoration: none; font-weight: bold; '
+        'margin: 10px 0;" target="_blank">▶️ Assistir no YouTube</a>'
+    ),
+}
+
+# Templates com os ícones já embutidos; só os campos da lição ficam para a renderização
+TEMPLATES: Dict[str, Template] = {
+    name: Template(Template(raw).safe_substitute(ICONS)) for name, raw in _RAW_TEMPLATES.items()
+}
+
+# Fragmentos que mudam com o estado de conclusão
+_COMPLETION_TEMPLATES = {'lesson_header', 'completion_toggle'}
+
+
+def render(name: str, **context: Any) -> str:
+    """Renderiza um template sem cache (os valores são escapados)."""
+    return TEMPLATES[name].substitute({k: html.escape(str(v)) for k, v in context.items()})
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_ENTRIES)
+def _render_memo(name: str, fields: Tuple[Tuple[str, str], ...]) -> str:
+    return render(name, **dict(fields))
+
+
+def render_cached(name: str, **context: Any) -> str:
+    """Renderiza um template, reutilizando o HTML de chamadas com os mesmos valores."""
+    return _render_memo(name, tuple(sorted((key, str(value)) for key, value in context.items())))
+
+
+def current_theme() -> str:
+    """Tema da sessão atual."""
+    return 'high-contrast' if st.session_state.get('high_contrast', False) else 'default'
+
+
+def material_urls(doc_url: str) -> Dict[str, str]:
+    """Links de download e visualização de um material (Google Drive ou link direto)."""
+    doc_url = str(doc_url).strip()
+    if 'drive.google.com' in doc_url:
+        if '/file/d/' in doc_url:
+            file_id = doc_url.split('/file/d/')[1].split('/')[0]
+        else:  # Para links de compartilhamento
+            file_id = doc_url.split('id=')[1].split('&')[0]
+        return {
+            'download_url': f"https://drive.google.com/uc?export=download&id={file_id}",
+            'view_url': f"https://drive.google.com/file/d/{file_id}/view",
+        }
+    return {'download_url': doc_url, 'view_url': doc_url}
+
+
+def _lesson_context(name: str, lesson: Dict[str, Any], completed: bool, theme: str) -> Dict[str, Any]:
+    if name == 'lesson_header':
+        return {
+            'card_class': "lesson-card" + (" completed" if completed else ""),
+            'theme': theme,
+            'title': lesson.get('title', ''),
+            'duration': lesson.get('duration', ''),
+            'level': lesson.get('level', 'Iniciante'),
+        }
+    if name == 'completion_toggle':
+        return {
+            'lesson_id': lesson.get('id', ''),
+            'checked': "checked" if completed else "",
+            'toggle_label': "Lição Concluída" if completed else "Marcar como Concluído",
+        }
+    if name == 'material_actions':
+        return dict(material_urls(lesson.get('doc_url', '')), title=lesson.get('title', ''))
+    return {}
+
+
+def lesson_fragment(name: str, lesson: Dict[str, Any], completed: bool = False,
+                    theme: Optional[str] = None) -> str:
+    """HTML de um fragmento de lição no estado de conclusão e tema informados."""
+    theme = theme or current_theme()
+    completed = bool(completed) and name in _COMPLETION_TEMPLATES
+    return render_cached(name, **_lesson_context(name, lesson, completed, theme))
+
+
+def link_button(name: str, url: str) -> str:
+    """Botões de link das páginas (`download_button`, `youtube_button`)."""
+    return render_cached(name, url=url)
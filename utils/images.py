@@ -0,0 +1,140 @@
+"""
+Variantes redimensionadas de imagens para o servidor de arquivos estáticos.
+
+As imagens locais (por exemplo, as de `assets/`) são gravadas uma vez por
+processo em `static/img/`, em várias larguras e em WebP mais o formato de
+origem, com o hash do conteúdo no nome (`<nome>.<hash>-<largura>.<formato>`).
+A página referencia as URLs no `srcset` e o navegador escolhe a variante; os
+bytes da imagem não passam pelo WebSocket do Streamlit a cada rerun, como
+acontece com `st.image`.
+"""
+import hashlib
+import io
+import os
+import re
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Tuple
+
+from .assets import STATIC_DIR
+from .cache_engine import write_atomic
+from .logging_utils import get_logger
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = get_logger(__name__)
+
+IMAGE_WIDTHS = (480, 960, 1440)
+IMAGE_QUALITY = 80
+
+IMAGES_DIR = os.path.join(STATIC_DIR, 'img')
+
+_variants: Dict[Tuple[str, float, int], Dict[str, str]] = {}
+_variants_lock = threading.Lock()
+
+
+def write_variants(image: 'Image.Image', directory: str, stem: str, widths: Sequence[int],
+                   formats: Dict[str, str], quality: int = IMAGE_QUALITY) -> Dict[str, Tuple[str, int]]:
+    """
+    Grava a imagem redimensionada para cada largura e formato.
+
+    Larguras maiores que a da imagem não a ampliam (a variante fica no tamanho original).
+
+    Args:
+        image: Imagem já aberta
+        directory: Diretório de destino
+        stem: Início do nome dos arquivos (`<stem>-<largura>.<extensão>`)
+        widths: Larguras das variantes
+        formats: Extensão -> formato do Pillow (por exemplo, {"webp": "WEBP"})
+        quality: Qualidade dos formatos com perdas
+
+    Returns:
+        Dicionário "<largura>.<extensão>" -> (nome do arquivo, tamanho em bytes).
+    """
+    from PIL import Image
+
+    written = {}
+    for width in widths:
+        variant = image
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            variant = image.resize((width, height), Image.LANCZOS)
+        for ext, image_format in formats.items():
+            buffer = io.BytesIO()
+            if image_format == 'JPEG' and variant.mode != 'RGB':
+                variant = variant.convert('RGB')
+            variant.save(buffer, image_format, quality=quality, optimize=True)
+            name = f"{stem}-{width}.{ext}"
+            write_atomic(os.path.join(directory, name), buffer.getvalue())
+            written[f"{width}.{ext}"] = (name, buffer.tell())
+    return written
+
+
+def _source_format(image: 'Image.Image') -> Tuple[str, str]:
+    """Formato de reserva (para navegadores sem WebP): PNG com transparência, senão JPEG."""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        return 'png', 'PNG'
+    return 'jpg', 'JPEG'
+
+
+def _build_variants(path: str, directory: str, widths: Sequence[int]) -> Dict[str, str]:
+    from PIL import Image
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()[:8]
+    name = re.sub(r'[^\w-]', '_', os.path.splitext(os.path.basename(path))[0])
+    stem = f"{name}.{digest}"
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        fallback_ext, fallback_format = _source_format(image)
+        # Sem variantes maiores que a imagem original: elas repetiriam a mesma resolução
+        useful = [w for w in widths if w < image.width] + [image.width]
+        formats = {'webp': 'WEBP', fallback_ext: fallback_format}
+        filenames = {f"{w}.{ext}": f"{stem}-{w}.{ext}" for w in useful for ext in formats}
+        if not all(os.path.exists(os.path.join(directory, f)) for f in filenames.values()):
+            image = image.convert('RGBA' if fallback_format == 'PNG' else 'RGB')
+            write_variants(image, directory, stem, useful, formats)
+            pattern = re.compile(rf'^{re.escape(name)}\.[0-9a-f]{{8}}-\d+\.\w+$')
+            for old in os.listdir(directory):
+                if not old.startswith(stem) and pattern.match(old):
+                    try:
+                        os.remove(os.path.join(directory, old))
+                    except OSError:
+                        pass
+
+    return {
+        'widths': ','.join(str(w) for w in useful),
+        'fallback': fallback_ext,
+        **filenames,
+    }
+
+
+def image_variants(path: str, directory: Optional[str] = None,
+                   widths: Sequence[int] = IMAGE_WIDTHS) -> Optional[Dict[str, str]]:
+    """
+    Variantes de uma imagem local (geradas na primeira chamada do processo e
+    sempre que o arquivo mudar).
+
+    Returns:
+        Dicionário com `widths` (larguras separadas por vírgula), `fallback`
+        (extensão do formato de reserva) e "<largura>.<extensão>" -> nome do
+        arquivo; None se a imagem não puder ser lida.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+    variants = _variants.get(key)
+    if variants is None:
+        with _variants_lock:
+            variants = _variants.get(key)
+            if variants is None:
+                try:
+                    variants = _variants[key] = _build_variants(path, directory or IMAGES_DIR, widths)
+                except Exception as e:
+                    logger.error("erro ao gerar as variantes da imagem", extra={'path': path, 'error': str(e)})
+                    return None
+    return variants
@@ -1,6 +1,11 @@
 import streamlit as st
 from typing import Optional, Union, Dict, Any
 import base64
+import html
+
+from .assets import include_assets, static_serving_enabled, static_url
+from .images import image_variants
+from .video_facade import video_facade
 
 class LazyLoader:
     """Classe para gerenciar carregamento preguiçoso de mídia."""
@@ -23,48 +28,27 @@ class LazyLoader:
             start_time: Tempo de início em segundos (opcional)
             **kwargs: Argumentos adicionais para st.video
         """
-        # Se for uma URL, usa o player nativo do Streamlit
+        # Vídeos do Google Drive, YouTube e Vimeo: fachada com miniatura, o
+        # player só é criado quando o aluno clica em "Assistir"
         if video_path.startswith(('http://', 'https://')):
-            st.video(video_path, format=format, start_time=start_time, **kwargs)
+            if not video_facade(video_path, key=kwargs.pop('key', None)):
+                st.video(video_path, format=format, start_time=start_time, **kwargs)
             return
             
-        # Para arquivos locais, usa um player personalizado com carregamento preguiçoso
-        video_id = f"video-{abs(hash(video_path))}"
-        
+        # Para arquivos locais, o navegador só baixa o vídeo ao tocar (preload="none")
         st.markdown(f"""
         <div style="position: relative; padding-bottom: 56.25%; height: 0; overflow: hidden;">
             <video 
-                id="{video_id}"
                 width="100%" 
                 style="position: absolute; top: 0; left: 0; width: 100%; height: 100%;"
                 controls
                 preload="none"
-                poster="data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
-                onclick="this.paused ? this.play() : this.pause();"
+                src="{video_path}#t={start_time}"
+                type="{format}"
             >
-                <source src="{video_path}" type="{format}">
                 Seu navegador não suporta o elemento de vídeo.
             </video>
         </div>
-        <script>
-            document.getElementById('{video_id}').addEventListener('click', function() {{
-                this.paused ? this.play() : this.pause();
-            }});
-            
-            // Carrega o vídeo quando estiver visível na tela
-            const observer = new IntersectionObserver((entries) => {{
-                entries.forEach(entry => {{
-                    if (entry.isIntersecting) {{
-                        const video = entry.target;
-                        video.setAttribute('src', video.getAttribute('data-src'));
-                        video.load();
-                        observer.unobserve(video);
-                    }}
-                }});
-            }}, {{ rootMargin: '200px' }});
-            
-            observer.observe(document.getElementById('{video_id}'));
-        </script>
         """, unsafe_allow_html=True)
     
     @staticmethod
@@ -78,49 +62,62 @@ class LazyLoader:
         """
         Exibe uma imagem com carregamento preguiçoso.
         
+        A imagem só é baixada quando chega perto da área visível. As imagens
+        locais são servidas de `static/img/` em várias larguras (`srcset`), em
+        WebP e no formato de origem, sem reenviar os bytes a cada rerun.
+        
         Args:
             image_path: Caminho ou URL da imagem
             caption: Legenda da imagem (opcional)
             width: Largura da imagem (opcional)
             use_column_width: Se deve usar a largura da coluna
-            **kwargs: Argumentos adicionais para st.image
+            **kwargs: Argumentos adicionais para st.image (e `sizes`, o atributo
+                `sizes` do srcset; padrão: a largura da imagem ou 100vw)
         """
-        image_id = f"img-{abs(hash(image_path))}"
+        # Um único observador por página atende todas as imagens (ver assets/lazy_images.js)
+        include_assets('lazy_images')
         
-        # Placeholder base64 transparente
-        placeholder = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+        style = f"width: {'100%' if use_column_width else (f'{width}px' if width else 'auto')}; max-width: 100%; height: auto;"
+        sizes = kwargs.pop('sizes', None) or (f"{width}px" if width and not use_column_width else "100vw")
+        alt = html.escape(caption or '')
         
-        # Se for uma URL, carrega a imagem normalmente
         if image_path.startswith(('http://', 'https://')):
-            st.markdown(f"""
-            <img 
-                id="{image_id}"
-                src="{placeholder}" 
-                data-src="{image_path}"
-                alt="{caption or ''}"
-                style="width: {'100%' if use_column_width else (f'{width}px' if width else 'auto')}; 
-                       max-width: 100%; 
-                       height: auto;"
-                class="lazy"
-            >
-            <script>
-                // Carrega a imagem quando estiver visível na tela
-                const observer = new IntersectionObserver((entries) => {{
-                    entries.forEach(entry => {{
-                        if (entry.isIntersectionRatio > 0) {{
-                            const img = entry.target;
-                            img.src = img.getAttribute('data-src');
-                            observer.unobserve(img);
-                        }}
-                    }});
-                }}, {{ rootMargin: '200px' }});
-                
-                observer.observe(document.getElementById('{image_id}'));
-            </script>
-            """, unsafe_allow_html=True)
+            picture = _lazy_img(html.escape(image_path), '', sizes, alt, style)
         else:
-            # Para arquivos locais, usa o st.image normal
-            st.image(image_path, caption=caption, width=width, use_column_width=use_column_width, **kwargs)
+            variants = image_variants(image_path) if static_serving_enabled() else None
+            if variants is None:
+                # Sem o servidor de arquivos estáticos, usa o st.image normal
+                st.image(image_path, caption=caption, width=width, use_column_width=use_column_width, **kwargs)
+                return
+            picture = _variants_picture(variants, sizes, alt, style)
+        
+        caption_html = f"<figcaption>{alt}</figcaption>" if caption else ''
+        st.markdown(f'<figure class="lazy-figure">{picture}{caption_html}</figure>', unsafe_allow_html=True)
+
+
+# GIF transparente de 1x1 exibido até a imagem entrar na tela
+_PLACEHOLDER = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+
+
+def _lazy_img(src: str, srcset: str, sizes: str, alt: str, style: str) -> str:
+    srcset_attr = f' data-srcset="{srcset}" sizes="{sizes}"' if srcset else ''
+    return (f'<img class="lazy" src="{_PLACEHOLDER}" data-src="{src}"{srcset_attr} '
+            f'alt="{alt}" style="{style}" decoding="async">')
+
+
+def _variants_picture(variants: Dict[str, str], sizes: str, alt: str, style: str) -> str:
+    """`<picture>` com o srcset WebP e o do formato de reserva das variantes locais."""
+    widths = [int(w) for w in variants['widths'].split(',')]
+    
+    def srcset(ext: str) -> str:
+        return ', '.join(f"{static_url('img/' + variants[f'{w}.{ext}'])} {w}w" for w in widths)
+    
+    fallback = variants['fallback']
+    largest = static_url('img/' + variants[f"{widths[-1]}.{fallback}"])
+    # O <source> também fica em data-srcset: o navegador só o usa depois que o
+    # observador copia o atributo (junto com o da <img>)
+    return (f'<picture><source type="image/webp" data-srcset="{srcset("webp")}" sizes="{sizes}">'
+            f'{_lazy_img(largest, srcset(fallback), sizes, alt, style)}</picture>')
 
 # Funções de conveniência
 def lazy_video(*args, **kwargs):
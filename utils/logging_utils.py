@@ -0,0 +1,224 @@
+"""
+Logs estruturados do aplicativo.
+
+Os módulos obtêm o logger com `get_logger(__name__)` e registram eventos com
+campos extras (`logger.info("catálogo carregado", extra={'rows': 120})`). O
+nível vem de `config.LOG_LEVEL`: mensagens abaixo dele custam só a comparação
+do nível, sem formatação nem I/O.
+
+A thread que executa a página nunca escreve no terminal ou no arquivo: o
+`QueueHandler` coloca o registro numa fila e uma thread do `QueueListener` o
+grava no stderr (texto) e em `config.LOG_FILE` (uma linha JSON por evento, com
+rotação por tamanho). Se a fila encher, os registros novos são descartados e
+contados em `dropped_records`, sem bloquear a página.
+
+Os eventos DEBUG são amostrados por mensagem (`LOG_DEBUG_SAMPLE_RATE`): a
+primeira ocorrência de cada mensagem sempre passa, e as seguintes na proporção
+configurada.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from config import LOG_BACKUP_COUNT, LOG_DEBUG_SAMPLE_RATE, LOG_FILE, LOG_LEVEL, LOG_MAX_BYTES, LOG_QUEUE_SIZE
+
+# Logger raiz do aplicativo; não propaga para o logger raiz do Python (o do Streamlit)
+ROOT_LOGGER = 'curso'
+
+# Atributos de todo LogRecord; os demais vêm de `extra` e são os campos estruturados
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+def _fields(record: logging.LogRecord) -> Dict[str, object]:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por evento: horário, nível, logger, mensagem e campos extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        event.update(_fields(record))
+        # Registros vindos da fila já trazem o traceback formatado em `exc_text`
+        if record.exc_text:
+            event['exc'] = record.exc_text
+        elif record.exc_info:
+            event['exc'] = self.formatException(record.exc_info)
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Formato legível para o terminal, com os campos extras no fim da linha."""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _fields(record)
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class DebugSampler(logging.Filter):
+    """
+    Deixa passar uma fração dos eventos DEBUG de cada mensagem.
+
+    Args:
+        rate: Fração mantida (1 mantém todos, 0 só a primeira ocorrência)
+    """
+
+    def __init__(self, rate: float = LOG_DEBUG_SAMPLE_RATE):
+        super().__init__()
+        self.rate = min(max(rate, 0.0), 1.0)
+        self._credit: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            # Crédito inicial 1: a primeira ocorrência sempre passa
+            credit = self._credit.get(key, 1.0)
+            keep = credit >= 1
+            self._credit[key] = (credit - 1 if keep else credit) + self.rate
+        return keep
+
+
+_EXC_FORMATTER = logging.Formatter()
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """`QueueHandler` que descarta o registro quando a fila está cheia."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Prepara o registro para a fila sem formatá-lo.
+
+        O `prepare` padrão junta o traceback ao texto da mensagem; aqui a
+        mensagem fica só com o texto e o traceback vai formatado em `exc_text`
+        (o objeto do traceback não atravessa a fila), para que o JSON o grave
+        no campo `exc`.
+        """
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_handler: Optional[_NonBlockingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+def setup_logging(level: str = LOG_LEVEL, log_file: Optional[str] = None,
+                  sample_rate: float = LOG_DEBUG_SAMPLE_RATE, stream=None) -> logging.Logger:
+    """
+    Configura o logger do aplicativo, substituindo a configuração anterior.
+
+    Args:
+        level: Nível mínimo (DEBUG, INFO, WARNING...)
+        log_file: Arquivo dos eventos em JSON (padrão: `config.LOG_FILE`; vazio desativa)
+        sample_rate: Fração dos eventos DEBUG mantida para cada mensagem
+        stream: Destino do texto legível (padrão: stderr)
+
+    Returns:
+        O logger raiz do aplicativo.
+    """
+    with _setup_lock:
+        return _configure(level, log_file, sample_rate, stream)
+
+
+def _configure(level: str = LOG_LEVEL, log_file: Optional[str] = None,
+               sample_rate: float = LOG_DEBUG_SAMPLE_RATE, stream=None) -> logging.Logger:
+    global _handler, _listener
+    shutdown_logging()
+
+    console = logging.StreamHandler(stream or sys.stderr)
+    console.setFormatter(TextFormatter())
+    handlers = [console]
+
+    log_file = str(LOG_FILE) if log_file is None else log_file
+    if log_file:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True)
+            file_handler.setFormatter(JsonFormatter())
+            handlers.append(file_handler)
+        except OSError as e:
+            sys.stderr.write(f"Não foi possível abrir o arquivo de log {log_file}: {e}\n")
+
+    _handler = _NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    _handler.addFilter(DebugSampler(sample_rate))
+    _listener = logging.handlers.QueueListener(_handler.queue, *handlers)
+    _listener.start()
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.handlers = [_handler]
+    logger.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+    logger.propagate = False
+    return logger
+
+
+def shutdown_logging() -> None:
+    """Grava os eventos pendentes na fila e para a thread de escrita."""
+    global _handler, _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger(ROOT_LOGGER).removeHandler(_handler)
+        _handler = None
+
+
+def dropped_records() -> int:
+    """Quantidade de registros descartados porque a fila estava cheia."""
+    return _handler.dropped if _handler is not None else 0
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger de um módulo, filho do logger do aplicativo (configurado no primeiro uso).
+
+    Args:
+        name: Normalmente `__name__`
+    """
+    if _listener is None:
+        with _setup_lock:
+            if _listener is None:
+                _configure()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+atexit.register(shutdown_logging)
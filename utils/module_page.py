@@ -0,0 +1,236 @@
+"""
+Página genérica dos módulos do curso (Vocabulário, Pronúncia, Gramática...).
+
+Cada página em `pages/` só chama `render_module_page` com o nome do módulo; a
+configuração (ícone, descrição e os identificadores usados no progresso salvo)
+fica em `MODULE_PAGES`. O carregamento e a preparação das lições acontecem uma
+vez por versão do catálogo:
+
+1. `get_module_lessons` filtra as lições do módulo (cache "lessons");
+2. `get_module_view` monta o modelo de exibição: identificadores estáveis,
+   link de download, vídeos suportados e links extras já validados (cache
+   "module_views", invalidado junto com a versão do módulo);
+3. `render_module_page` exibe o cabeçalho e a lista paginada como fragmento,
+   com os botões de link memoizados em `utils.fragments`.
+
+Um módulo novo na planilha só precisa de uma entrada em `MODULE_PAGES` (ou
+nenhuma, com os valores padrão) e de uma página de duas linhas.
+"""
+import re
+from typing import Any, Dict, List
+
+import streamlit as st
+
+from .cache_engine import get_engine
+from .cache_keys import fingerprint
+from .catalog import catalog_tags, get_catalog_version, load_catalog, normalize_module
+from .fragments import link_button
+from .module_utils import (
+    apply_responsive_styles,
+    completion_button,
+    display_lesson_list,
+    display_page_header,
+    get_module_lessons,
+)
+from .profiler import show_profiler_panel, span
+from .session_memory import collect_session, show_session_memory_panel
+from .video_facade import video_facade, video_source
+from .warmup import register_warmup_task, start_warmup
+from auth import auth_required
+from config import SPREADSHEET_URL
+
+VIEWS_NAMESPACE = 'module_views'
+
+# Configuração das páginas. `module_id` e `lesson_prefix` mantêm as chaves do
+# progresso já salvo pelos alunos (padrão: o nome do módulo em minúsculas)
+MODULE_PAGES: Dict[str, Dict[str, str]] = {
+    'Vocabulário': {
+        'icon': '📚',
+        'title': 'Vocabulário Francês',
+        'description': 'Lições com o vocabulário essencial para melhorar sua comunicação em francês',
+        'module_id': 'vocabulário',
+        'lesson_prefix': 'vocab',
+    },
+    'Pronúncia': {
+        'icon': '🎤',
+        'title': 'Pronúncia Francesa',
+        'description': 'Vídeos e materiais para aperfeiçoar sua pronúncia em francês',
+        'module_id': 'pronuncia',
+        'lesson_prefix': 'pron',
+    },
+    'Gramática': {
+        'icon': '📚',
+        'title': 'Gramática Francesa',
+        'description': 'Aprenda as regras e estruturas da língua francesa',
+        'module_id': 'gramatica',
+    },
+}
+
+_DRIVE_FILE_ID = re.compile(r'/file/d/([\w-]+)')
+
+
+def module_config(module_name: str) -> Dict[str, str]:
+    """Configuração de um módulo, com os valores padrão para os módulos sem entrada."""
+    config = {
+        'icon': '📚',
+        'title': f"{module_name} Francês",
+        'description': '',
+        'module_id': normalize_module(module_name),
+        'lesson_prefix': normalize_module(module_name),
+    }
+    for name, overrides in MODULE_PAGES.items():
+        if normalize_module(name) == normalize_module(module_name):
+            config.update(overrides)
+            break
+    return config
+
+
+def _clean_url(value: Any) -> str:
+    url = str(value or '').strip()
+    return '' if url.lower() in ('nan', 'none') else url
+
+
+def build_lesson_view(lesson: Dict[str, Any], lesson_prefix: str) -> Dict[str, Any]:
+    """
+    Prepara uma lição para exibição (executado uma vez por versão do catálogo).
+
+    Returns:
+        Cópia da lição com `id` no formato do progresso salvo, `video_url` e
+        `youtube_url` só quando houver um player suportado, `video_link` (URL
+        sem player, exibida como link) e `download_url` do material de apoio.
+    """
+    view = dict(lesson)
+    view['id'] = f"{lesson_prefix}_{lesson.get('order', 0)}"
+    view['title'] = str(lesson.get('title') or 'Sem título')
+
+    video_url = _clean_url(lesson.get('video_url'))
+    playable = video_url.startswith(('http://', 'https://')) and video_source(video_url) is not None
+    view['video_url'] = video_url if playable else ''
+    view['video_link'] = video_url if video_url and not playable else ''
+
+    youtube_url = _clean_url(lesson.get('youtube_url'))
+    view['youtube_url'] = youtube_url
+    view['youtube_playable'] = bool(youtube_url) and video_source(youtube_url) is not None
+
+    match = _DRIVE_FILE_ID.search(_clean_url(lesson.get('doc_url')))
+    view['download_url'] = f"https://drive.google.com/uc?export=download&id={match.group(1)}" if match else ''
+    return view
+
+
+def get_module_view(module_name: str, spreadsheet_url: str = SPREADSHEET_URL) -> Dict[str, Any]:
+    """
+    Modelo de exibição de um módulo, calculado uma vez por versão do catálogo.
+
+    Returns:
+        Dicionário com `module_id` e `lessons` (ver `build_lesson_view`), ou
+        vazio se o módulo não tiver lições.
+    """
+    config = module_config(module_name)
+
+    def build():
+        data = get_module_lessons(spreadsheet_url, module_name) or {}
+        lessons = [build_lesson_view(lesson, config['lesson_prefix']) for lesson in data.get('lessons', [])]
+        if not lessons:
+            return {}
+        return {'module_id': config['module_id'], 'lessons': lessons}
+
+    load_catalog(spreadsheet_url)
+    version = get_catalog_version(spreadsheet_url, module_name)
+    return get_engine().get_or_compute(
+        VIEWS_NAMESPACE,
+        f"{normalize_module(module_name)}_{fingerprint((spreadsheet_url, version, config))}",
+        build,
+        cache_if=bool,
+        tags=catalog_tags(spreadsheet_url, module_name, version)
+    )
+
+
+def render_lesson_card(lesson: Dict[str, Any], module_id: str, is_completed: bool, focused: bool,
+                       icon: str = '📚'):
+    """Exibe o card de uma lição já preparada por `build_lesson_view`."""
+    lesson_id = lesson['id']
+
+    with st.expander(f"{icon} {lesson['title']} ({lesson.get('duration', '')})",
+                     expanded=is_completed or focused):
+        if lesson['video_url'] or lesson['video_link']:
+            st.markdown("### 🎥 Assista à Aula")
+            if lesson['video_url']:
+                video_facade(lesson['video_url'], key=lesson_id, title=lesson['title'])
+            else:
+                st.markdown(f"🔗 [Acessar vídeo]({lesson['video_link']})")
+
+        if lesson['download_url']:
+            st.markdown("### 📄 Material de Apoio")
+            st.markdown(link_button('download_button', lesson['download_url']), unsafe_allow_html=True)
+
+        if lesson['youtube_url']:
+            st.markdown("### 🎥 Vídeo Extra no YouTube")
+            if lesson['youtube_playable']:
+                video_facade(lesson['youtube_url'], key=f"{lesson_id}_youtube", title=lesson['title'])
+            st.markdown(link_button('youtube_button', lesson['youtube_url']), unsafe_allow_html=True)
+
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            completion_button(module_id, lesson_id, is_completed)
+
+
+def render_module_page(module_name: str, spreadsheet_url: str = SPREADSHEET_URL):
+    """
+    Página completa de um módulo: configuração, cabeçalho e lista de lições.
+
+    Deve ser a primeira chamada da página (inclui `st.set_page_config`).
+
+    Args:
+        module_name: Nome do módulo como aparece na coluna "Módulo" da planilha
+        spreadsheet_url: URL da planilha do curso
+    """
+    config = module_config(module_name)
+
+    # Verifica autenticação
+    auth_required()
+
+    st.set_page_config(
+        page_title=f"{module_name} - Curso de Francês",
+        page_icon=config['icon'],
+        layout="wide"
+    )
+
+    # Pré-carrega os caches em segundo plano (uma vez por processo)
+    start_warmup()
+
+    # Limpa e mede o estado da sessão (no máximo a cada SESSION_GC_INTERVAL segundos)
+    collect_session()
+
+    with span('page.header', module=module_name):
+        apply_responsive_styles()
+        display_page_header(module_name, config['icon'], config['description'], title=config['title'])
+
+    with st.spinner(f"Carregando lições de {module_name.lower()}..."), span('page.view', module=module_name):
+        view = get_module_view(module_name, spreadsheet_url)
+
+    # Perfil das fases e memória das sessões (apenas administradores)
+    if st.session_state.get("role") == "admin":
+        show_profiler_panel()
+        show_session_memory_panel()
+
+    if not view:
+        st.warning(f"Nenhuma lição de {module_name.lower()} encontrada.")
+        return
+
+    # Barra de progresso e lições num fragmento: marcar uma lição como
+    # concluída executa de novo só o fragmento, e não a página inteira
+    icon = config['icon']
+    display_lesson_list(
+        view['lessons'], view['module_id'],
+        lambda lesson, module_id, is_completed, focused:
+            render_lesson_card(lesson, module_id, is_completed, focused, icon)
+    )
+
+
+def _warmup(source: str, modules: List[str]) -> None:
+    """Monta os modelos de exibição de todos os módulos no aquecimento do servidor."""
+    for module in modules:
+        get_module_view(module, source)
+
+
+register_warmup_task('module_views', _warmup)
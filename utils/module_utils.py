@@ -1,158 +1,56 @@
-import pandas as pd
 import streamlit as st
-from .excel_utils import load_excel_from_google_drive
 from .user_progress import UserProgress, DataCache
-from typing import Dict, List, Any, Optional, Callable
+from .cache_engine import get_engine
+from .cache_keys import fingerprint
+from .catalog import load_catalog, get_catalog_version, catalog_tags, normalize_module
+from .fragments import lesson_fragment
+from .assets import include_assets
+from .video_facade import video_facade
+from .logging_utils import get_logger
+from .profiler import profiled
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple
+import math
 import re
 import time
 from datetime import datetime
+from .progress_utils import get_completed_lessons, save_progress
+from config import LESSONS_PER_PAGE
 
-def load_css():
-    """Carrega os estilos CSS diretamente no código"""
-    css = """
-    /* Estilos básicos */
-    :root {
-        --primary-color: #4a6fa5;
-        --secondary-color: #166088;
-        --accent-color: #4fc3a1;
-        --background-color: #f8f9fa;
-        --text-color: #333333;
-        --border-radius: 8px;
-        --box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-    }
-    
-    /* Estilos gerais */
-    body {
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-        line-height: 1.6;
-        color: var(--text-color);
-        background-color: var(--background-color);
+logger = get_logger(__name__)
+
+# Fragmentos (Streamlit 1.37+, ou a versão experimental a partir da 1.33): um
+# clique num widget do fragmento executa de novo só a função, e não o script todo.
+# Em versões sem suporte a função é executada normalmente.
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+# Destaque das lições concluídas (uma vez por página)
+COMPLETED_LESSON_STYLE = """
+<style>
+    div[data-testid="stExpander"][data-test-state*="expanded"] {
+        border-left: 5px solid #4CAF50;
+        padding-left: 10px;
     }
-    
-    /* Estilos para dispositivos móveis */
-    @media (max-width: 768px) {
-        .main .block-container {
-            padding: 1rem 1rem 10rem;
-        }
-        
-        .streamlit-expanderHeader {
-            font-size: 1rem;
-            padding: 0.75rem 1rem;
-        }
-        
-        .stVideo {
-            position: relative;
-            padding-bottom: 56.25%;
-            height: 0;
-            overflow: hidden;
-            margin: 1rem 0;
-        }
+    div[data-testid="stExpander"] > div[role="button"] > div:first-child > div:first-child::before {
+        content: '✓ ';
+        color: #4CAF50;
+        font-weight: bold;
     }
-    """
-    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+</style>
+"""
+
+def load_css():
+    """Carrega os estilos do curso (`assets/styles.css`) uma vez por sessão"""
+    include_assets('styles')
 
 def apply_responsive_styles():
     """Aplica estilos CSS para melhorar a responsividade em dispositivos móveis"""
-    st.markdown("""
-    <style>
-        /* Estilos gerais para dispositivos móveis */
-        @media (max-width: 768px) {
-            /* Ajusta o padding do conteúdo principal */
-            .main .block-container {
-                padding: 1rem 1rem 10rem;
-            }
-            
-            /* Melhora a visualização dos expanders */
-            .streamlit-expanderHeader {
-                font-size: 1rem;
-                padding: 0.75rem 1rem;
-            }
-            
-            /* Ajusta o player de vídeo */
-            .stVideo {
-                position: relative;
-                padding-bottom: 56.25%; /* Proporção 16:9 */
-                height: 0;
-                overflow: hidden;
-                margin: 1rem 0;
-            }
-            
-            .stVideo iframe {
-                position: absolute;
-                top: 0;
-                left: 0;
-                width: 100%;
-                height: 100%;
-                border: none;
-            }
-            
-            /* Melhora botões */
-            .stButton > button {
-                width: 100%;
-                margin: 0.25rem 0;
-            }
-            
-            /* Ajusta os títulos */
-            h1 {
-                font-size: 1.75rem !important;
-            }
-            
-            h2 {
-                font-size: 1.5rem !important;
-            }
-            
-            h3 {
-                font-size: 1.25rem !important;
-            }
-            
-            /* Melhora a barra lateral em dispositivos móveis */
-            [data-testid="stSidebar"] {
-                width: 85% !important;
-                min-width: 200px !important;
-                max-width: 300px !important;
-            }
-            
-            /* Ajusta o menu de navegação */
-            .css-1d391kg {
-                padding: 0.5rem;
-            }
-            
-            /* Melhora a exibição de mensagens de erro/sucesso */
-            .stAlert {
-                margin: 0.5rem 0;
-            }
-        }
-        
-        /* Melhorias gerais para todos os dispositivos */
-        .stVideo iframe {
-            border-radius: 8px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }
-        
-        /* Ajusta o container principal para evitar quebras de layout */
-        .main .block-container {
-            max-width: 1200px;
-            padding: 2rem 2rem 12rem;
-        }
-        
-        /* Melhora a experiência de toque em dispositivos móveis */
-        button, [role="button"], a {
-            touch-action: manipulation;
-        }
-        
-        /* Previne zoom em campos de input em iOS */
-        @media screen and (-webkit-min-device-pixel-ratio:0) { 
-            input, select, textarea { 
-                font-size: 16px !important;
-            }
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    include_assets('modules')
     
     # Carrega o CSS personalizado
     load_css()
 
-def display_page_header(module_name: str, icon: str, description: str, total_lessons: int = 0):
+def display_page_header(module_name: str, icon: str, description: str, total_lessons: int = 0,
+                        title: Optional[str] = None):
     """
     Exibe o cabeçalho padronizado da página com barra de progresso
     
@@ -161,14 +59,15 @@ def display_page_header(module_name: str, icon: str, description: str, total_les
         icon: Ícone do módulo (emoji)
         description: Breve descrição do módulo
         total_lessons: Número total de lições no módulo (opcional)
+        title: Título exibido (padrão: "<Módulo> Francês")
     """
     # Formata o nome do módulo para exibição
-    display_name = module_name.capitalize()
+    title = title or f"{module_name.capitalize()} Francês"
     
     # Exibe o cabeçalho
     st.markdown(f"""
     <div class="header">
-        <h1>{icon} {display_name} Francês</h1>
+        <h1>{icon} {title}</h1>
         <p>{description}</p>
     </div>
     """, unsafe_allow_html=True)
@@ -207,6 +106,145 @@ def display_progress_bar(module_name: str, total_lessons: int, progress: int = 0
     </div>
     """, unsafe_allow_html=True)
 
+def filter_lessons(lessons: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+    """
+    Filtra as lições pelo título (sem diferenciar maiúsculas e minúsculas)
+    
+    Args:
+        lessons: Lições do módulo
+        query: Texto buscado (vazio retorna todas as lições)
+    """
+    query = (query or '').strip().lower()
+    if not query:
+        return lessons
+    return [lesson for lesson in lessons if query in str(lesson.get('title', '')).lower()]
+
+def page_count(total: int, page_size: int = LESSONS_PER_PAGE) -> int:
+    """Número de páginas (pelo menos uma) para `total` lições"""
+    return max(1, math.ceil(total / page_size))
+
+def next_incomplete(lessons: List[Dict[str, Any]], completed_ids: Iterable[str]) -> Optional[int]:
+    """Posição da primeira lição não concluída, ou None se todas estiverem concluídas"""
+    completed_ids = set(completed_ids)
+    for index, lesson in enumerate(lessons):
+        if lesson.get('id') not in completed_ids:
+            return index
+    return None
+
+def paginate_lessons(lessons: List[Dict[str, Any]], module_id: str, completed_ids: Iterable[str],
+                     page_size: int = LESSONS_PER_PAGE) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Exibe a busca, a paginação e o atalho para a próxima lição pendente, e
+    retorna apenas as lições da página atual
+    
+    Assim, cada rerun envia no máximo `page_size` lições, qualquer que seja o
+    tamanho do módulo.
+    
+    Args:
+        lessons: Lições do módulo (cada uma com 'id' e 'title')
+        module_id: Identificador do módulo (usado nas chaves da sessão)
+        completed_ids: IDs das lições concluídas
+        page_size: Número de lições por página
+    
+    Returns:
+        Tupla (lições da página atual, ID da lição a destacar ou None).
+    """
+    page_key = f"{module_id}_page"
+    search_key = f"{module_id}_search"
+    focus_key = f"{module_id}_focus"
+    
+    def reset_page():
+        st.session_state[page_key] = 1
+        st.session_state.pop(focus_key, None)
+    
+    def jump_to_next():
+        st.session_state[search_key] = ''
+        index = next_incomplete(lessons, completed_ids)
+        if index is None:
+            st.session_state.pop(focus_key, None)
+            return
+        st.session_state[page_key] = index // page_size + 1
+        st.session_state[focus_key] = lessons[index].get('id')
+    
+    col_search, col_next = st.columns([3, 1])
+    with col_search:
+        query = st.text_input("🔎 Buscar lição", key=search_key, on_change=reset_page,
+                              placeholder="Digite parte do título")
+    with col_next:
+        st.button("⏭️ Próxima pendente", key=f"{module_id}_next", on_click=jump_to_next,
+                  use_container_width=True)
+    
+    filtered = filter_lessons(lessons, query)
+    if not filtered:
+        st.info("Nenhuma lição encontrada para a busca.")
+        return [], None
+    
+    pages = page_count(len(filtered), page_size)
+    # A página salva pode não existir mais (módulo menor ou nova busca)
+    if not 1 <= st.session_state.get(page_key, 1) <= pages:
+        st.session_state[page_key] = 1
+    
+    if pages > 1:
+        page = st.number_input("Página", min_value=1, max_value=pages, step=1, key=page_key)
+    else:
+        page = 1
+    start = (page - 1) * page_size
+    visible = filtered[start:start + page_size]
+    st.caption(f"Lições {start + 1}–{start + len(visible)} de {len(filtered)}")
+    
+    return visible, st.session_state.get(focus_key)
+
+def completion_button(module_id: str, lesson_id: str, is_completed: bool):
+    """
+    Botão que marca (ou desmarca) uma lição como concluída
+    
+    O progresso é salvo no callback, antes do rerun, então a barra e o card
+    já são exibidos com o novo estado sem precisar de `st.rerun()`.
+    """
+    st.button(
+        "✅ Concluído" if is_completed else "✅ Marcar como concluída",
+        key=f"complete_{lesson_id}",
+        type="primary" if is_completed else "secondary",
+        on_click=save_progress,
+        args=(module_id, lesson_id, not is_completed)
+    )
+
+@fragment
+@profiled('page.lesson_list')
+def display_lesson_list(lessons: List[Dict[str, Any]], module_id: str,
+                        render_lesson: Callable[[Dict[str, Any], str, bool, bool], None]):
+    """
+    Exibe a barra de progresso e a página atual de lições como um fragmento
+    
+    Marcar uma lição como concluída, buscar ou mudar de página executa de novo
+    apenas este fragmento: a verificação de login, o carregamento da planilha e
+    o cabeçalho da página não são refeitos. A barra fica no mesmo fragmento que
+    os cards porque um fragmento não consegue atualizar outro.
+    
+    Args:
+        lessons: Lições do módulo (cada uma com 'id' e 'title')
+        module_id: Identificador do módulo no progresso salvo
+        render_lesson: Função que exibe o card de uma lição; recebe a lição, o
+            módulo, se ela está concluída e se deve ser destacada
+    """
+    completed_ids = get_completed_lessons(module_id)
+    total = len(lessons)
+    progress = int(len(completed_ids) / total * 100) if total else 0
+    display_progress_bar(module_id, total, progress)
+    
+    st.markdown("## 📋 Lições Disponíveis")
+    
+    # Busca e paginação: só as lições da página atual são renderizadas
+    visible, focus_id = paginate_lessons(lessons, module_id, completed_ids)
+    if any(lesson.get('id') in completed_ids for lesson in visible):
+        st.markdown(COMPLETED_LESSON_STYLE, unsafe_allow_html=True)
+    
+    for lesson in visible:
+        lesson_id = lesson.get('id')
+        render_lesson(lesson, module_id, lesson_id in completed_ids, lesson_id == focus_id)
+
+LESSONS_NAMESPACE = 'lessons'
+
 def get_module_lessons(spreadsheet_url: str, module_name: str) -> Dict[str, List[Dict[str, Any]]]:
     """
     Obtém as lições de um módulo específico com cache
@@ -219,8 +257,10 @@ def get_module_lessons(spreadsheet_url: str, module_name: str) -> Dict[str, List
         Dicionário com as lições do módulo
     """
     def load_data():
+        import pandas as pd
+
         try:
-            df = load_excel_from_google_drive(spreadsheet_url)
+            df = load_catalog(spreadsheet_url)
             if df is None or df.empty:
                 st.error("Não foi possível carregar os dados da planilha.")
                 return {}
@@ -270,7 +310,11 @@ def get_module_lessons(spreadsheet_url: str, module_name: str) -> Dict[str, List
                     return None
                 
                 # Processa os dados da linha
-                order = int(row['ordem']) if pd.notna(row.get('ordem')) and str(row['ordem']).isdigit() else 0
+                # A planilha pode trazer a ordem como número decimal ("3.0")
+                try:
+                    order = int(float(str(row.get('ordem')).strip() or '0'))
+                except (TypeError, ValueError):
+                    order = 0
                 video_url = clean_string(row.get('Link do Vídeo'))
                 doc_url = clean_string(row.get('Link do Documento'))
                 youtube_url = clean_string(row.get('link extra youtube', ''))
@@ -285,7 +329,8 @@ def get_module_lessons(spreadsheet_url: str, module_name: str) -> Dict[str, List
                     'youtube_url': youtube_url,
                     'duration': clean_string(row.get('Duração', '00:00')),
                     'order': order,
-                    'level': clean_string(row.get('Nível', 'Iniciante'))
+                    'level': clean_string(row.get('Nível', 'Iniciante')),
+                    'catalog_version': version
                 }
                 lessons.append(lesson)
                 
@@ -297,9 +342,17 @@ def get_module_lessons(spreadsheet_url: str, module_name: str) -> Dict[str, List
             st.error(traceback.format_exc())
             return {}
     
-    # Usa o cache para carregar os dados
-    from .user_progress import load_cached_data
-    return load_cached_data(spreadsheet_url, load_data)
+    # A versão do módulo entra na chave: quando a planilha muda, a entrada antiga
+    # deixa de ser usada e é removida pela invalidação por etiqueta
+    load_catalog(spreadsheet_url)
+    version = get_catalog_version(spreadsheet_url, module_name)
+    return get_engine().get_or_compute(
+        LESSONS_NAMESPACE,
+        f"{normalize_module(module_name)}_{fingerprint((spreadsheet_url, version))}",
+        load_data,
+        cache_if=bool,
+        tags=catalog_tags(spreadsheet_url, module_name, version)
+    )
 
 def display_lesson(lesson: Dict[str, Any], module_name: str):
     """
@@ -309,104 +362,29 @@ def display_lesson(lesson: Dict[str, Any], module_name: str):
         lesson: Dicionário com os dados da lição
         module_name: Nome do módulo para controle de progresso
     """
+    import pandas as pd
+
     try:
         # Verifica se a lição está concluída
         is_complete = UserProgress.is_lesson_complete(lesson['id'], module_name)
         
-        # Define as classes CSS baseadas no status de conclusão
-        card_class = "lesson-card" + (" completed" if is_complete else "")
-        
         # Cria o cabeçalho da lição com animação e efeitos
-        st.markdown(f"""
-        <div class="{card_class}" data-aos="fade-up">
-            <div class="lesson-header">
-                <div class="header-content">
-                    <h3>{lesson['title']}</h3>
-                    <div class="lesson-meta">
-                        <span class="lesson-duration">
-                            <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                                <circle cx="12" cy="12" r="10"></circle>
-                                <polyline points="12 6 12 12 16 14"></polyline>
-                            </svg>
-                            {lesson.get('duration', '')}
-                        </span>
-                        <span class="lesson-level">
-                            <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                                <path d="M22 11.08V12a10 10 0 1 1-5.93-9.14"></path>
-                                <polyline points="22 4 12 14.01 9 11.01"></polyline>
-                            </svg>
-                            {lesson.get('level', 'Iniciante')}
-                        </span>
-                    </div>
-                </div>
-                <div class="lesson-actions">
-                    <button class="action-btn favorite" title="Favoritar">
-                        <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                            <path d="M20.84 4.61a5.5 5.5 0 0 0-7.78 0L12 5.67l-1.06-1.06a5.5 5.5 0 0 0-7.78 7.78l1.06 1.06L12 21.23l7.78-7.78 1.06-1.06a5.5 5.5 0 0 0 0-7.78z"></path>
-                        </svg>
-                    </button>
-                    <button class="action-btn share" title="Compartilhar">
-                        <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                            <circle cx="18" cy="5" r="3"></circle>
-                            <circle cx="6" cy="12" r="3"></circle>
-                            <circle cx="18" cy="19" r="3"></circle>
-                            <line x1="8.59" y1="13.51" x2="15.42" y2="17.49"></line>
-                            <line x1="15.41" y1="6.51" x2="8.59" y2="10.49"></line>
-                        </svg>
-                    </button>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(lesson_fragment('lesson_header', lesson, is_complete),
+                    unsafe_allow_html=True)
         
-        # Exibe o vídeo se houver URL
-        video_placeholder = st.empty()
-        video_id = lesson.get('video_id')
+        # Exibe o vídeo se houver URL (fachada: o player só é criado ao clicar)
+        video_url = str(lesson.get('video_url', '') or '').strip()
         
-        if video_id:
+        if video_url and video_url.lower() not in ['nan', 'none']:
             try:
-                # Determina se é um vídeo do YouTube ou Google Drive
-                if 'youtube.com' in str(lesson.get('video_url', '')) or 'youtu.be' in str(lesson.get('video_url', '')):
-                    embed_url = f"https://www.youtube.com/embed/{video_id}?rel=0&modestbranding=1"
-                    fallback_url = f"https://youtu.be/{video_id}"
-                    source_name = "YouTube"
-                else:
-                    embed_url = f"https://drive.google.com/file/d/{video_id}/preview"
-                    fallback_url = f"https://drive.google.com/file/d/{video_id}/view"
-                    source_name = "Google Drive"
-                
-                # Tenta incorporar o vídeo diretamente
-                try:
-                    # Para vídeos do YouTube
-                    if 'youtube.com' in str(lesson.get('video_url', '')) or 'youtu.be' in str(lesson.get('video_url', '')):
-                        st.video(lesson.get('video_url'))
-                    # Para vídeos do Google Drive
-                    elif 'drive.google.com' in str(lesson.get('video_url', '')):
-                        video_id = lesson.get('video_id', '')
-                        if video_id:
-                            embed_url = f"https://drive.google.com/file/d/{video_id}/preview"
-                            st.components.v1.iframe(embed_url, height=500)
-                    else:
-                        # Para outros tipos de vídeo
-                        st.video(lesson.get('video_url'))
-                except Exception as e:
-                    # Se houver erro na incorporação, mostra o link
-                    st.warning("Não foi possível carregar o vídeo incorporado.")
-                    st.markdown(f"""
-                    <div style="padding: 1rem; background-color: #f8f9fa; border-radius: 8px; margin: 1rem 0;">
-                        <p>Para assistir ao vídeo, clique no link abaixo:</p>
-                        <a href="{fallback_url}" target="_blank" rel="noopener noreferrer" 
-                           style="display: inline-block; padding: 0.5rem 1rem; background-color: #4361ee; 
-                                  color: white; text-decoration: none; border-radius: 4px;">
-                            Assistir vídeo no {source_name}
-                        </a>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
+                if not video_facade(video_url, key=lesson['id'], title=lesson.get('title', '')):
+                    # Para outros tipos de vídeo
+                    st.video(video_url)
             except Exception as e:
-                video_placeholder.error(f"❌ Não foi possível carregar o vídeo desta lição. Erro: {str(e)}")
-                print(f"Erro ao carregar vídeo: {str(e)}")
+                st.error(f"❌ Não foi possível carregar o vídeo desta lição. Erro: {str(e)}")
+                logger.warning("erro ao carregar vídeo", extra={'lesson': lesson.get('id'), 'error': str(e)})
         else:
-            video_placeholder.info("ℹ️ Nenhum vídeo disponível para esta lição.")
+            st.info("ℹ️ Nenhum vídeo disponível para esta lição.")
         
         # Seção de materiais e ações
         with st.container():
@@ -414,30 +392,8 @@ def display_lesson(lesson: Dict[str, Any], module_name: str):
             
             with col1:
                 # Botão para marcar/desmarcar como concluído com efeito moderno
-                st.markdown("""
-                <div class="completion-toggle">
-                    <label class="toggle-container">
-                        <input type="checkbox" id="complete_""" + str(lesson['id']) + """" 
-                               class="toggle-input" 
-                               """ + ("checked" if is_complete else "") + """
-                               onchange="this.closest('.stCheckbox').querySelector('input[type=checkbox]').click()">
-                        <div class="toggle-track">
-                            <div class="toggle-indicator">
-                                <div class="checkmark">
-                                    <svg viewBox="0 0 24 24" id="ghq-svg-check" role="presentation" aria-hidden="true">
-                                        <path d="M9.86 18a1 1 0 01-.73-.32l-4.86-5.17a1 1 0 111.46-1.37l4.12 4.39 8.41-9.2a1 1 0 111.48 1.34l-9.14 10a1 1 0 01-.73.33h-.01z"></path>
-                                    </svg>
-                                </div>
-                            </div>
-                        </div>
-                        <div class="toggle-label">
-                            <span class="toggle-label-text">
-                                """ + ("Lição Concluída" if is_complete else "Marcar como Concluído") + """
-                            </span>
-                        </div>
-                    </label>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(lesson_fragment('completion_toggle', lesson, is_complete),
+                            unsafe_allow_html=True)
                 
                 # Adiciona o checkbox real do Streamlit (invisível)
                 new_status = st.checkbox(
@@ -454,42 +410,14 @@ def display_lesson(lesson: Dict[str, Any], module_name: str):
                     st.rerun()
                 
                 # Adiciona estatísticas da lição
-                st.markdown("""
-                <div class="lesson-stats">
-                    <div class="stat-item">
-                        <svg width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                            <path d="M1 12s4-8 11-8 11 8 11 8-4 8-11 8-11-8-11-8z"></path>
-                            <circle cx="12" cy="12" r="3"></circle>
-                        </svg>
-                        <span>1.2k visualizações</span>
-                    </div>
-                    <div class="stat-item">
-                        <svg width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                            <path d="M20.84 4.61a5.5 5.5 0 0 0-7.78 0L12 5.67l-1.06-1.06a5.5 5.5 0 0 0-7.78 7.78l1.06 1.06L12 21.23l7.78-7.78 1.06-1.06a5.5 5.5 0 0 0 0-7.78z"></path>
-                        </svg>
-                        <span>845 favoritos</span>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(lesson_fragment('lesson_stats', lesson),
+                            unsafe_allow_html=True)
             
             with col2:
                 # Botão para baixar material (se houver)
                 doc_url = lesson.get('doc_url', '')
                 if doc_url and pd.notna(doc_url) and str(doc_url).strip():
                     try:
-                        doc_url = str(doc_url).strip()
-                        if 'drive.google.com' in doc_url:
-                            # Extrai o ID do arquivo do Google Drive
-                            if '/file/d/' in doc_url:
-                                file_id = doc_url.split('/file/d/')[1].split('/')[0]
-                            else:  # Para links de compartilhamento
-                                file_id = doc_url.split('id=')[1].split('&')[0]
-                            download_url = f"https://drive.google.com/uc?export=download&id={file_id}"
-                            view_url = f"https://drive.google.com/file/d/{file_id}/view"
-                        else:
-                            download_url = doc_url
-                            view_url = doc_url
-                        
                         # Adiciona o script de cópia para área de transferência apenas uma vez
                         if 'copy_script_added' not in st.session_state:
                             st.markdown("""
@@ -519,60 +447,97 @@ def display_lesson(lesson: Dict[str, Any], module_name: str):
                             st.session_state.copy_script_added = True
                             
                         # Gera os botões de ação
-                        st.markdown(f"""
-                        <div class="material-actions">
-                            <a href="{download_url}" class="btn" download>
-                                <svg width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                                    <path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path>
-                                    <polyline points="7 10 12 15 17 10"></polyline>
-                                    <line x1="12" y1="15" x2="12" y2="3"></line>
-                                </svg>
-                                <span>Baixar Material</span>
-                            </a>
-                            <a href="{view_url}" class="btn btn-outline" target="_blank" rel="noopener noreferrer">
-                                <svg width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                                    <path d="M1 12s4-8 11-8 11 8 11 8-4 8-11 8-11-8-11-8z"></path>
-                                    <circle cx="12" cy="12" r="3"></circle>
-                                </svg>
-                                <span>Visualizar</span>
-                            </a>
-                            <button class="btn btn-icon" onclick="copyToClipboard('{view_url}', this)">
-                                <svg width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                                    <rect x="9" y="9" width="13" height="13" rx="2" ry="2"></rect>
-                                    <path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"></path>
-                                </svg>
-                                <span>Copiar Link</span>
-                            </button>
-                        </div>
-                        
-                        <div class="material-preview">
-                            <div class="preview-header">
-                                <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                                    <path d="M14 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2V8z"></path>
-                                    <polyline points="14 2 14 8 20 8"></polyline>
-                                    <line x1="16" y1="13" x2="8" y2="13"></line>
-                                    <line x1="16" y1="17" x2="8" y2="17"></line>
-                                    <polyline points="10 9 9 9 8 9"></polyline>
-                                </svg>
-                                <span>Pré-visualização do Material</span>
-                            </div>
-                            <div class="preview-content">
-                                <h4>{lesson['title']}</h4>
-                                <p>Clique em "Visualizar" para ver o conteúdo completo deste material de estudo.</p>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        st.markdown(lesson_fragment('material_actions', lesson),
+                                    unsafe_allow_html=True)
                     except Exception as e:
                         st.warning("⚠️ Não foi possível carregar o material desta lição.")
-                        print(f"Erro ao carregar material: {str(e)}")
+                        logger.warning("erro ao carregar material",
+                                       extra={'lesson': lesson.get('id'), 'error': str(e)})
         
         # Fecha a div do card da lição
         st.markdown("</div>", unsafe_allow_html=True)
         
     except Exception as e:
         st.error(f"Ocorreu um erro ao carregar a lição: {str(e)}")
-        import traceback
-        print(f"Erro em display_lesson: {traceback.format_exc()}")
+        logger.exception("erro em display_lesson", extra={'lesson': lesson.get('id')})
+
+def load_course_data(file_path):
+    """
+    Carrega a planilha local do curso (usada pela página principal)
+    
+    Args:
+        file_path: Caminho para o arquivo Excel local
+        
+    Returns:
+        Dicionário módulo -> lições ordenadas, ou None se a planilha não puder ser usada
+    """
+    try:
+        import pandas as pd
+
+        # Lê o arquivo Excel diretamente a cada chamada
+        df = pd.read_excel(file_path, engine='openpyxl')
+        logger.debug("planilha local lida", extra={'path': file_path, 'rows': len(df)})
+        
+        # Verifica colunas obrigatórias
+        required_columns = ['Módulo', 'Título da Aula', 'Link do Vídeo']
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        if missing_columns:
+            logger.warning("colunas obrigatórias ausentes", extra={'columns': missing_columns})
+            return None
+        
+        # Preenche valores vazios com string vazia
+        df = df.fillna('')
+        
+        # Remove linhas sem link de vídeo
+        df = df[df['Link do Vídeo'].astype(str).str.strip() != '']
+        
+        if len(df) == 0:
+            logger.warning("nenhuma linha com link de vídeo válido", extra={'path': file_path})
+            return None
+            
+        # Converte para o formato esperado
+        modules = {}
+        for _, row in df.iterrows():
+            try:
+                module_name = str(row['Módulo']).strip() if row['Módulo'] else "Outros"
+                if module_name not in modules:
+                    modules[module_name] = []
+                
+                # Extrai o ID do vídeo do YouTube se disponível
+                youtube_url = str(row.get('link extra youtube', '')).strip()
+                youtube_id = None
+                if 'youtube.com' in youtube_url or 'youtu.be' in youtube_url:
+                    if 'youtu.be' in youtube_url:
+                        youtube_id = youtube_url.split('/')[-1].split('?')[0]
+                    else:
+                        youtube_id = youtube_url.split('v=')[1].split('&')[0]
+                
+                lesson_data = {
+                    'id': str(row.get('ID', '')).strip(),
+                    'title': str(row['Título da Aula']).strip() if row['Título da Aula'] else "Sem título",
+                    'video_url': str(row['Link do Vídeo']).strip(),
+                    'doc_url': str(row.get('Link do Documento', '')).strip(),
+                    'youtube_url': youtube_url,
+                    'youtube_id': youtube_id,
+                    'duration': str(row.get('Duração', '')).strip(),
+                    'order': int(row.get('ordem', 0)) if str(row.get('ordem', '0')).isdigit() else 0
+                }
+                
+                modules[module_name].append(lesson_data)
+                
+            except Exception as e:
+                logger.warning("erro ao processar linha da planilha", extra={'row': _, 'error': str(e)})
+                continue
+            
+        # Ordena os itens
+        for module in modules:
+            modules[module].sort(key=lambda x: x.get('order', 0))
+            
+        return modules
+        
+    except Exception:
+        logger.exception("erro ao carregar dados", extra={'path': file_path})
+        return None
 
 def get_modules_data(file_path):
     """
@@ -584,16 +549,15 @@ def get_modules_data(file_path):
     Returns:
         Dicionário com os módulos e suas lições
     """
-    print(f"[DEBUG] Iniciando carregamento do arquivo: {file_path}")
-    
+    import pandas as pd
+
     try:
         # Lê o arquivo Excel local
-        print("[DEBUG] Lendo arquivo Excel...")
         df = pd.read_excel(file_path)
-        print(f"[DEBUG] Arquivo lido. Colunas: {df.columns.tolist()}")
+        logger.debug("arquivo Excel lido", extra={'path': file_path, 'rows': len(df)})
         
         if df.empty:
-            print("[ERRO] O arquivo Excel está vazio")
+            logger.error("o arquivo Excel está vazio", extra={'path': file_path})
             return {}
         
         # Verifica colunas obrigatórias
@@ -601,8 +565,7 @@ def get_modules_data(file_path):
         missing_columns = [col for col in required_columns if col not in df.columns]
         
         if missing_columns:
-            error_msg = f"Colunas obrigatórias não encontradas: {', '.join(missing_columns)}"
-            print(f"[ERRO] {error_msg}")
+            logger.error("colunas obrigatórias não encontradas", extra={'columns': missing_columns})
             return {}
         
         # Remove linhas sem link de vídeo
@@ -611,10 +574,10 @@ def get_modules_data(file_path):
         removed_count = initial_count - len(df)
         
         if removed_count > 0:
-            print(f"[INFO] Removidas {removed_count} linhas sem link de vídeo")
+            logger.info("linhas sem link de vídeo removidas", extra={'removed': removed_count})
         
         if df.empty:
-            print("[ERRO] Nenhuma linha com link de vídeo válido encontrada")
+            logger.error("nenhuma linha com link de vídeo válido", extra={'path': file_path})
             return {}
         
         # Agrupa por módulo
@@ -644,7 +607,7 @@ def get_modules_data(file_path):
                 })
                 
             except Exception as e:
-                print(f"[ERRO] Erro ao processar linha {idx+2}: {str(e)}")
+                logger.warning("erro ao processar linha da planilha", extra={'row': idx + 2, 'error': str(e)})
                 continue
         
         # Ordena os itens de cada módulo
@@ -652,15 +615,13 @@ def get_modules_data(file_path):
             try:
                 modules[module_name].sort(key=lambda x: x.get('order', 0))
             except Exception as e:
-                print(f"[ERRO] Erro ao ordenar módulo {module_name}: {str(e)}")
+                logger.warning("erro ao ordenar módulo", extra={'module': module_name, 'error': str(e)})
         
-        print(f"[DEBUG] Processamento concluído. Módulos carregados: {len(modules)}")
+        logger.debug("planilha processada", extra={'modules': len(modules)})
         return modules
         
-    except Exception as e:
-        print(f"[ERRO] Erro ao processar o arquivo: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+    except Exception:
+        logger.exception("erro ao processar o arquivo", extra={'path': file_path})
         return {}
 
 
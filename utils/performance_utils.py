@@ -1,138 +1,95 @@
-import streamlit as st
-from functools import wraps
-import time
-import hashlib
-import os
-from typing import Callable, Any, Dict, List, Optional, Union
-import pandas as pd
+"""
+Decoradores de cache do aplicativo.
 
-# Configuração do diretório de cache
-CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", ".cache")
-os.makedirs(CACHE_DIR, exist_ok=True)
+São adaptadores sobre o motor de cache único (`utils.cache_engine`): todas as
+funções decoradas dividem o mesmo orçamento de memória e disco, as mesmas
+chaves baseadas no conteúdo e a mesma limpeza.
+"""
+from typing import Any, Callable, Iterable, Optional, Union
 
-def memoize_with_ttl(ttl_seconds: int = 3600):
+from .cache_engine import DEFAULT_NAMESPACE, get_engine
+from config import CACHE_TTL
+
+def memoize_with_ttl(ttl_seconds: int = CACHE_TTL, serve_stale: bool = False,
+                     early_refresh_beta: float = 0.0, namespace: str = DEFAULT_NAMESPACE,
+                     tags: Union[Iterable[str], Callable[..., Iterable[str]]] = ()):
     """
     Decorator para armazenar em cache o resultado de uma função com tempo de vida.
     
-    Args:
-        ttl_seconds: Tempo de vida do cache em segundos (padrão: 1 hora)
-    """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            # Gera uma chave única para esta chamada de função
-            cache_key = f"{func.__name__}_{_generate_cache_key(args, kwargs)}"
-            cache_file = os.path.join(CACHE_DIR, f"{cache_key}.pkl")
-            
-            # Verifica se o cache é válido
-            if _is_cache_valid(cache_file, ttl_seconds):
-                try:
-                    return _load_from_cache(cache_file)
-                except Exception as e:
-                    st.warning(f"Erro ao carregar do cache: {e}")
-            
-            # Se o cache não for válido, executa a função
-            result = func(*args, **kwargs)
-            
-            # Salva o resultado no cache
-            try:
-                _save_to_cache(result, cache_file)
-            except Exception as e:
-                st.warning(f"Erro ao salvar no cache: {e}")
-            
-            return result
-        return wrapper
-    return decorator
-
-def _generate_cache_key(args: tuple, kwargs: dict) -> str:
-    """Gera uma chave de cache única para os argumentos fornecidos."""
-    key_parts = []
+    O cache tem duas camadas: um LRU em memória (limitado em bytes) atende as
+    chaves mais usadas sem acessar o disco, e o cache em disco serve de apoio.
+    Uma entrada lida do disco é promovida para a memória com o mesmo prazo de
+    expiração do arquivo, de modo que o TTL vale igualmente para as duas camadas.
     
-    # Adiciona argumentos posicionais
-    for arg in args:
-        if isinstance(arg, (str, int, float, bool, type(None))):
-            key_parts.append(str(arg))
-        elif hasattr(arg, '__dict__'):
-            key_parts.append(str(arg.__dict__))
-        else:
-            key_parts.append(str(arg))
+    O disco é limitado por `config.MAX_CACHE_SIZE`: ao ultrapassá-lo, as entradas
+    acessadas há mais tempo são removidas, e as expiradas são apagadas em segundo plano.
     
-    # Adiciona argumentos nomeados
-    for k, v in sorted(kwargs.items()):
-        key_parts.append(f"{k}={v}")
+    Quando uma entrada expira, apenas uma chamada por processo recalcula o valor;
+    as chamadas concorrentes para a mesma chave esperam por ela (ou recebem o valor
+    antigo, se `serve_stale` estiver ativo).
     
-    # Cria um hash da chave
-    key_string = "_".join(key_parts)
-    return hashlib.md5(key_string.encode()).hexdigest()
+    Args:
+        ttl_seconds: Tempo de vida do cache em segundos (padrão: config.CACHE_TTL)
+        serve_stale: Se True, enquanto o valor é recalculado as demais chamadas
+            recebem o valor expirado que ainda estiver no disco em vez de esperar
+        early_refresh_beta: Se maior que zero, renova a entrada de forma
+            probabilística antes de expirar (quanto maior, mais cedo); a chance
+            cresce com a proximidade da expiração e com o tempo de cálculo
+        namespace: Namespace das entradas (permite limpar só esta parte do cache)
+        tags: Etiquetas das entradas, fixas ou calculadas a partir dos argumentos
+            da função (permite invalidá-las com `invalidate_tags`)
+    """
+    return get_engine().memoize(
+        namespace=namespace,
+        ttl_seconds=ttl_seconds,
+        serve_stale=serve_stale,
+        early_refresh_beta=early_refresh_beta,
+        tags=tags
+    )
 
-def _is_cache_valid(cache_file: str, ttl_seconds: int) -> bool:
-    """Verifica se o cache é válido."""
-    if not os.path.exists(cache_file):
-        return False
-    
-    file_age = time.time() - os.path.getmtime(cache_file)
-    return file_age < ttl_seconds
+def _ttl_decorator(default_ttl: int, namespace: str,
+                   cache_if: Optional[Callable[[Any], bool]] = None):
+    """
+    Cria um decorador que pode ser usado direto (`@cached_text`) ou com um
+    tempo de vida próprio (`@cached_text(ttl=60)`).
+    """
+    def decorator(func: Optional[Callable] = None, *, ttl: int = default_ttl):
+        memoize = get_engine().memoize(namespace=namespace, ttl_seconds=ttl, cache_if=cache_if)
+        if func is None:
+            return memoize
+        return memoize(func)
+    return decorator
 
-def _save_to_cache(data: Any, cache_file: str) -> None:
-    """Salva dados no cache."""
-    import pickle
-    
-    # Cria o diretório de cache se não existir
-    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
-    
-    # Salva os dados em um arquivo temporário primeiro
-    temp_file = f"{cache_file}.tmp"
-    with open(temp_file, 'wb') as f:
-        if isinstance(data, pd.DataFrame):
-            data.to_pickle(f, compression='gzip')
-        else:
-            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+def clear_cache(namespace: Optional[str] = None) -> bool:
+    """
+    Limpa o cache (memória e disco).
     
-    # Substitui o arquivo antigo pelo novo
-    if os.path.exists(cache_file):
-        os.remove(cache_file)
-    os.rename(temp_file, cache_file)
-
-def _load_from_cache(cache_file: str) -> Any:
-    """Carrega dados do cache."""
-    import pickle
+    Args:
+        namespace: Limpa apenas este namespace (opcional; por padrão limpa tudo)
     
-    with open(cache_file, 'rb') as f:
-        # Tenta carregar como DataFrame primeiro
-        try:
-            import pandas as pd
-            return pd.read_pickle(f, compression='gzip')
-        except:
-            f.seek(0)  # Volta para o início do arquivo
-            return pickle.load(f)
+    Returns:
+        True se a limpeza foi concluída.
+    """
+    return get_engine().clear(namespace)
 
-def clear_cache() -> None:
-    """Limpa todo o cache."""
-    import shutil
+def invalidate_tags(*tags: str) -> int:
+    """
+    Remove do cache as entradas que tenham alguma das etiquetas.
     
-    if os.path.exists(CACHE_DIR):
-        shutil.rmtree(CACHE_DIR)
-        os.makedirs(CACHE_DIR, exist_ok=True)
-        return True
-    return False
+    Returns:
+        Número de entradas removidas.
+    """
+    return get_engine().invalidate_tags(*tags)
 
 def get_cache_size() -> int:
-    """Retorna o tamanho total do cache em bytes."""
-    total_size = 0
-    
-    if os.path.exists(CACHE_DIR):
-        for dirpath, _, filenames in os.walk(CACHE_DIR):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                total_size += os.path.getsize(fp)
-    
-    return total_size
+    """Retorna o tamanho total do cache em disco em bytes (lido do índice, O(1))."""
+    return get_engine().disk_size()
 
 # Decorador para funções que retornam DataFrames
-cached_dataframe = memoize_with_ttl(ttl_seconds=3600)  # 1 hora de cache por padrão
+cached_dataframe = _ttl_decorator(3600, 'dataframe')  # 1 hora de cache por padrão
 
 # Decorador para funções que retornam strings
-cached_text = memoize_with_ttl(ttl_seconds=1800)  # 30 minutos de cache por padrão
+cached_text = _ttl_decorator(1800, 'text')  # 30 minutos de cache por padrão
 
 # Decorador para funções de processamento pesado
-cached_computation = memoize_with_ttl(ttl_seconds=86400)  # 24 horas de cache por padrão
+cached_computation = _ttl_decorator(86400, 'computation')  # 24 horas de cache por padrão
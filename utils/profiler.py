@@ -0,0 +1,235 @@
+"""
+Perfil do tempo gasto em cada fase da execução das páginas.
+
+As fases são marcadas com `span("nome")` (gerenciador de contexto) ou
+`@profiled("nome")` (decorador): autenticação, cabeçalhos de segurança, CSS,
+carga da planilha, leitura do progresso, renderização das lições... Cada fase
+concluída alimenta:
+
+- um histograma por nome de fase (faixas de ~25%), agregado entre todas as
+  sessões do processo, de onde saem p50/p95/p99;
+- um buffer circular com as últimas `PROFILER_MAX_SPANS` fases, com início,
+  duração, thread e sessão, exportado no formato de trace do Chrome
+  (`chrome://tracing` ou https://ui.perfetto.dev).
+
+Fases aninhadas aparecem dentro da fase mãe no trace e também são agregadas
+separadamente. O custo por fase é de duas leituras do relógio e um lock, então
+o perfil pode ficar ativo em produção; `PROFILER_ENABLED=false` o desliga.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .cache_metrics import LatencyHistogram
+from config import PROFILER_ENABLED, PROFILER_MAX_SPANS
+
+# Faixas dos histogramas das fases: de 0,05 ms a ~10 s, cada uma 25% maior que a anterior
+PHASE_BUCKETS_MS = tuple(round(0.05 * 1.25 ** i, 3) for i in range(56))
+
+
+def session_id() -> Optional[str]:
+    """Sessão do Streamlit que executa a thread atual (None fora de uma execução de script)."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except Exception:
+        return None
+    return ctx.session_id if ctx is not None else None
+
+
+class Profiler:
+    """
+    Registro das fases concluídas do processo.
+
+    Args:
+        max_spans: Quantidade de fases recentes guardadas para o trace
+        enabled: Se False, `span` não mede nada
+    """
+
+    def __init__(self, max_spans: int = PROFILER_MAX_SPANS, enabled: bool = PROFILER_ENABLED):
+        self.enabled = enabled
+        self._phases: Dict[str, LatencyHistogram] = {}
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Origem dos tempos do trace (os eventos contam a partir da criação do perfil)
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str, **fields: Any) -> Iterator[None]:
+        """
+        Mede o bloco como uma fase.
+
+        Args:
+            name: Nome da fase (por exemplo, "auth" ou "page.view")
+            **fields: Dados extras exibidos no trace
+        """
+        if not self.enabled:
+            yield
+            return
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            self.record(name, start, end, depth=len(stack), **fields)
+
+    def record(self, name: str, start: float, end: float, depth: int = 0, **fields: Any) -> None:
+        """Registra uma fase já medida (`start` e `end` de `time.perf_counter()`)."""
+        event = {
+            'name': name,
+            'start': start,
+            'duration': end - start,
+            'depth': depth,
+            'thread': threading.get_ident(),
+            'session': session_id(),
+            'fields': fields,
+        }
+        with self._lock:
+            histogram = self._phases.get(name)
+            if histogram is None:
+                histogram = self._phases[name] = LatencyHistogram(PHASE_BUCKETS_MS)
+            histogram.observe(end - start)
+            self._spans.append(event)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Estatísticas de cada fase: contagem, média, p50, p95, p99 e máximo (em ms)."""
+        with self._lock:
+            phases = {name: histogram.to_dict() for name, histogram in self._phases.items()}
+        for data in phases.values():
+            data.pop('buckets_ms')
+            # O percentil é o limite da faixa; não passa da maior duração observada
+            for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+                data[key] = min(data[key], data['max_ms'])
+        return dict(sorted(phases.items()))
+
+    def recent_spans(self) -> List[Dict]:
+        """Fases recentes, da mais antiga para a mais nova."""
+        with self._lock:
+            return list(self._spans)
+
+    def chrome_trace(self) -> Dict:
+        """Fases recentes no formato de trace do Chrome (eventos completos, "ph": "X")."""
+        pid = os.getpid()
+        events = []
+        for span in self.recent_spans():
+            args = dict(span['fields'])
+            if span['session']:
+                args['session'] = span['session']
+            events.append({
+                'name': span['name'],
+                'cat': span['name'].split('.')[0],
+                'ph': 'X',
+                'ts': round((span['start'] - self._origin) * 1e6, 1),
+                'dur': round(span['duration'] * 1e6, 1),
+                'pid': pid,
+                'tid': span['thread'],
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_json(self) -> str:
+        """Estatísticas das fases e fases recentes (durações em ms) em JSON."""
+        spans = [
+            {
+                'name': span['name'],
+                'start_ms': round((span['start'] - self._origin) * 1000, 3),
+                'duration_ms': round(span['duration'] * 1000, 3),
+                'depth': span['depth'],
+                'session': span['session'],
+                **span['fields'],
+            }
+            for span in self.recent_spans()
+        ]
+        return json.dumps({'phases': self.snapshot(), 'spans': spans}, ensure_ascii=False, default=str)
+
+    def reset(self) -> None:
+        """Descarta as estatísticas e as fases recentes."""
+        with self._lock:
+            self._phases.clear()
+            self._spans.clear()
+
+
+# Perfil compartilhado por todas as sessões do processo
+profiler = Profiler()
+
+
+def span(name: str, **fields: Any):
+    """Mede o bloco como uma fase do perfil do processo (ver `Profiler.span`)."""
+    return profiler.span(name, **fields)
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """
+    Decorador que mede cada chamada da função como uma fase.
+
+    Args:
+        name: Nome da fase (padrão: "<módulo>.<função>")
+    """
+    def decorator(func: Callable) -> Callable:
+        phase = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiler.span(phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def show_profiler_panel(container=None):
+    """
+    Exibe as estatísticas das fases e os botões de exportação (para administradores).
+
+    Args:
+        container: Onde exibir (padrão: barra lateral)
+    """
+    import streamlit as st
+
+    container = container or st.sidebar
+    with container.expander("⏱️ Perfil das Páginas"):
+        phases = profiler.snapshot()
+        if not phases:
+            st.caption("Nenhuma fase registrada ainda." if profiler.enabled
+                       else "O perfil está desligado (PROFILER_ENABLED=false).")
+            return
+
+        def fmt_ms(value):
+            return "-" if value is None else f"{value:.1f}"
+
+        st.dataframe(
+            [
+                {
+                    "Fase": name,
+                    "Execuções": data['count'],
+                    "p50 (ms)": fmt_ms(data['p50_ms']),
+                    "p95 (ms)": fmt_ms(data['p95_ms']),
+                    "p99 (ms)": fmt_ms(data['p99_ms']),
+                    "Máx. (ms)": fmt_ms(data['max_ms']),
+                }
+                for name, data in phases.items()
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("JSON", profiler.export_json(), file_name="perfil.json",
+                               mime="application/json", key="profiler_json")
+        with col2:
+            st.download_button("Trace (Chrome)", json.dumps(profiler.chrome_trace()),
+                               file_name="perfil.trace.json", mime="application/json",
+                               key="profiler_trace")
+        if st.button("Zerar perfil", key="profiler_reset"):
+            profiler.reset()
@@ -3,10 +3,13 @@ import os
 from pathlib import Path
 import streamlit as st
 
+from .profiler import profiled
+
 def get_progress_file_path():
     """Retorna o caminho do arquivo de progresso"""
     return os.path.join(str(Path.home()), ".french_course_progress.json")
 
+@profiled('progress.load')
 def load_progress():
     """Carrega o progresso salvo do arquivo"""
     progress_file = get_progress_file_path()
@@ -18,6 +21,7 @@ def load_progress():
             return {}
     return {}
 
+@profiled('progress.save')
 def save_progress(module_id, lesson_id, completed):
     """Salva o progresso de uma lição"""
     progress = load_progress()
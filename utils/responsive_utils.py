@@ -2,211 +2,11 @@ import streamlit as st
 from typing import Dict, List, Optional, Tuple, Union
 import base64
 
+from .assets import include_assets
+
 def apply_responsive_styles():
     """Aplica estilos CSS para melhorar a responsividade."""
-    st.markdown("""
-    <style>
-    /* Estilos base responsivos */
-    .main .block-container {
-        max-width: 1200px;
-        padding: 1rem 1.5rem;
-    }
-    
-    /* Ajustes para telas médias (tablets) */
-    @media (max-width: 992px) {
-        .main .block-container {
-            padding: 0.75rem 1rem;
-        }
-        
-        /* Ajusta o tamanho da fonte para melhor legibilidade */
-        body {
-            font-size: 15px;
-        }
-        
-        /* Ajusta o padding dos expanders */
-        .streamlit-expanderHeader {
-            padding: 0.75rem 1rem;
-        }
-    }
-    
-    /* Ajustes para telas pequenas (smartphones) */
-    @media (max-width: 768px) {
-        .main .block-container {
-            padding: 0.5rem 0.75rem;
-        }
-        
-        /* Ajusta o tamanho da fonte */
-        body {
-            font-size: 14px;
-        }
-        
-        /* Melhora o espaçamento dos elementos */
-        .stButton > button {
-            width: 100%;
-            margin: 0.25rem 0;
-        }
-        
-        /* Ajusta o layout das colunas para empilhar */
-        .stHorizontalBlock > div[data-testid="stHorizontalBlock"] > div {
-            width: 100% !important;
-            margin-bottom: 1rem;
-        }
-        
-        /* Ajusta o tamanho dos vídeos */
-        .stVideo, 
-        .stVideo > div, 
-        .stVideo > div > video, 
-        .stVideo > div > iframe {
-            width: 100% !important;
-            height: auto !important;
-            aspect-ratio: 16/9;
-        }
-        
-        /* Melhora a aparência dos botões em dispositivos móveis */
-        .stButton > button {
-            padding: 0.5rem 1rem;
-            font-size: 0.9em;
-        }
-    }
-    
-    /* Ajustes para telas muito pequenas */
-    @media (max-width: 480px) {
-        .main .block-container {
-            padding: 0.5rem;
-        }
-        
-        /* Reduz ainda mais o tamanho da fonte */
-        body {
-            font-size: 13px;
-        }
-        
-        /* Ajusta o padding dos expanders */
-        .streamlit-expanderHeader {
-            padding: 0.5rem 0.75rem;
-        }
-        
-        /* Ajusta o tamanho dos títulos */
-        h1 { font-size: 1.75rem; }
-        h2 { font-size: 1.5rem; }
-        h3 { font-size: 1.25rem; }
-    }
-    
-    /* Melhora a aparência das abas em dispositivos móveis */
-    @media (max-width: 768px) {
-        .stTabs [data-baseweb="tab-list"] {
-            display: flex;
-            flex-wrap: wrap;
-        }
-        
-        .stTabs [data-baseweb="tab"] {
-            flex: 1;
-            text-align: center;
-            padding: 0.5rem 0.25rem;
-        }
-    }
-    
-    /* Ajustes para o player de vídeo responsivo */
-    .video-responsive {
-        position: relative;
-        padding-bottom: 56.25%; /* Proporção 16:9 */
-        height: 0;
-        overflow: hidden;
-        margin: 1rem 0;
-        border-radius: 8px;
-    }
-    
-    .video-responsive iframe,
-    .video-responsive video {
-        position: absolute;
-        top: 0;
-        left: 0;
-        width: 100%; 
-        height: 100%;
-        border: none;
-    }
-    
-    /* Melhora a aparência dos cards de lição */
-    .lesson-card {
-        margin-bottom: 1.5rem;
-        border-radius: 8px;
-        overflow: hidden;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        transition: transform 0.2s, box-shadow 0.2s;
-    }
-    
-    .lesson-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-    }
-    
-    /* Ajustes para o cabeçalho */
-    .main-header {
-        padding: 1rem 0;
-        margin-bottom: 1.5rem;
-        border-bottom: 1px solid #eee;
-    }
-    
-    /* Ajustes para a barra lateral */
-    @media (max-width: 768px) {
-        .main .block-container {
-            padding-left: 1rem;
-            padding-right: 1rem;
-        }
-        
-        /* Esconde a barra lateral em telas pequenas */
-        section[data-testid="stSidebar"] {
-            width: 0 !important;
-            min-width: 0 !important;
-            transform: translateX(-100%);
-            transition: transform 0.3s ease-in-out;
-        }
-        
-        section[data-testid="stSidebar"][aria-expanded="true"] {
-            transform: translateX(0);
-            width: 75% !important;
-            min-width: 0 !important;
-            position: fixed;
-            z-index: 1000;
-            height: 100%;
-            background: white;
-            box-shadow: 2px 0 8px rgba(0,0,0,0.1);
-        }
-        
-        /* Botão para mostrar/ocultar a barra lateral */
-        .sidebar-toggle {
-            position: fixed;
-            top: 10px;
-            left: 10px;
-            z-index: 1001;
-            background: white;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            padding: 8px 12px;
-            cursor: pointer;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-    }
-    
-    /* Melhora a aparência dos botões de ação */
-    .action-button {
-        margin: 0.5rem 0;
-        width: 100%;
-    }
-    
-    /* Ajustes para o rodapé */
-    footer {
-        text-align: center;
-        padding: 1rem 0;
-        margin-top: 2rem;
-        border-top: 1px solid #eee;
-        font-size: 0.85em;
-        color: #666;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    include_assets('layout')
 
 def responsive_columns(sizes: List[int] = None, gap: str = '1rem') -> Tuple:
     """
@@ -3,18 +3,26 @@ Configurações de segurança para o aplicativo Streamlit.
 """
 import streamlit as st
 
+from .assets import include_assets
+from .profiler import profiled
+
+@profiled('security_headers')
 def set_security_headers():
     """
     Configura os cabeçalhos de segurança HTTP, incluindo Content Security Policy (CSP).
     """
-    # Configura a CSP para permitir iframes do Google Drive
+    # A CSP vai para o <head> e é aplicada pelo navegador: as miniaturas e os
+    # players de `video_facade` (YouTube, Google Drive, Vimeo) e os ícones da
+    # introdução (Wikimedia) precisam estar liberados aqui
     csp = """
     default-src 'self';
     script-src 'self' 'unsafe-inline' 'unsafe-eval' https://cdn.jsdelivr.net;
     style-src 'self' 'unsafe-inline' https://fonts.googleapis.com;
-    img-src 'self' data: https://*.google.com https://*.googleusercontent.com;
+    img-src 'self' data: https://*.google.com https://*.googleusercontent.com https://i.ytimg.com
+            https://i.vimeocdn.com https://upload.wikimedia.org;
     font-src 'self' https://fonts.gstatic.com;
-    frame-src 'self' https://drive.google.com https://www.youtube.com https://www.youtube-nocookie.com;
+    frame-src 'self' https://drive.google.com https://www.youtube.com https://www.youtube-nocookie.com
+              https://player.vimeo.com;
     connect-src 'self' https://*.google.com https://*.googleapis.com;
     media-src 'self' https://*.google.com;
     """
@@ -26,14 +34,13 @@ def set_security_headers():
         initial_sidebar_state="expanded"
     )
     
-    # Adiciona meta tags de segurança no cabeçalho HTML
-    csp_content = csp.replace('\n', ' ').strip()
-    html_content = (
-        '<meta http-equiv="Content-Security-Policy" content="' + csp_content + '">' +
-        '<meta http-equiv="X-Content-Type-Options" content="nosniff">' +
-        '<meta http-equiv="X-Frame-Options" content="SAMEORIGIN">' +
-        '<meta http-equiv="X-XSS-Protection" content="1; mode=block">' +
-        '<meta name="referrer" content="strict-origin-when-cross-origin">' +
-        '<meta name="viewport" content="width=device-width, initial-scale=1.0">'
-    )
-    st.markdown(html_content, unsafe_allow_html=True)
+    # Adiciona meta tags de segurança no cabeçalho HTML (uma vez por sessão)
+    csp_content = ' '.join(csp.split())
+    include_assets(meta=[
+        {'http-equiv': 'Content-Security-Policy', 'content': csp_content},
+        {'http-equiv': 'X-Content-Type-Options', 'content': 'nosniff'},
+        {'http-equiv': 'X-Frame-Options', 'content': 'SAMEORIGIN'},
+        {'http-equiv': 'X-XSS-Protection', 'content': '1; mode=block'},
+        {'name': 'referrer', 'content': 'strict-origin-when-cross-origin'},
+        {'name': 'viewport', 'content': 'width=device-width, initial-scale=1.0'},
+    ])
@@ -0,0 +1,265 @@
+"""
+Memória do `st.session_state` de cada sessão.
+
+Cada aba aberta guarda no próprio `st.session_state` cópias de planilhas
+(entradas `data_cache_*` do `DataCache`), o log do download da planilha
+(`debug_info`), o progresso e os vídeos e recursos já exibidos. Com centenas
+de abas, essa memória cresce sem aparecer em lugar nenhum.
+
+`collect_session()`, chamada no início das páginas (no máximo a cada
+`SESSION_GC_INTERVAL` segundos por sessão):
+
+- remove as entradas `data_cache_*` expiradas e, das válidas, mantém só as
+  `SESSION_DATA_CACHE_MAX` que expiram por último;
+- corta as listas conhecidas (`SESSION_KEY_CAPS`) aos itens mais recentes;
+- mede cada chave com `deep_sizeof` e publica o total da sessão num registro
+  do processo, exibido aos administradores por `show_session_memory_panel()`.
+"""
+import sys
+import threading
+import time
+import types
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, MutableMapping, Optional
+
+from .logging_utils import get_logger
+from .profiler import profiled, session_id
+from config import SESSION_DATA_CACHE_MAX, SESSION_DEBUG_INFO_MAX, SESSION_GC_INTERVAL
+
+logger = get_logger(__name__)
+
+# Prefixo das entradas do `DataCache` (ver `user_progress.DataCache.get_cache_key`)
+DATA_CACHE_PREFIX = 'data_cache_'
+
+# Listas do estado da sessão que guardam só os itens mais recentes
+SESSION_KEY_CAPS = {
+    'debug_info': SESSION_DEBUG_INFO_MAX,  # mensagens do download da planilha
+}
+
+# Horário da última limpeza da sessão (guardado no próprio estado)
+_GC_KEY = '_session_gc_at'
+
+# Sessões sem medição mais recente que isso saem do relatório
+REPORT_TTL = 3600
+
+_ATOMIC = (str, bytes, bytearray, int, float, complex, bool, type(None), datetime)
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+_report: Dict[str, Dict[str, Any]] = {}
+_report_lock = threading.Lock()
+
+
+def deep_sizeof(obj: Any) -> int:
+    """
+    Tamanho aproximado de um objeto e de tudo o que ele referencia, em bytes.
+
+    Cada objeto é contado uma vez (referências repetidas e ciclos não somam de
+    novo). DataFrames e Series do pandas usam `memory_usage(deep=True)`;
+    classes, módulos e funções contam só o próprio objeto.
+    """
+    pd = sys.modules.get('pandas')
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if pd is not None and isinstance(item, (pd.DataFrame, pd.Series)):
+            usage = item.memory_usage(deep=True)
+            total += int(usage.sum()) if isinstance(item, pd.DataFrame) else int(usage)
+            continue
+        total += sys.getsizeof(item, 0)
+        if isinstance(item, _ATOMIC) or isinstance(item, _OPAQUE):
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif hasattr(item, '__dict__'):
+            stack.append(vars(item))
+    return total
+
+
+def measure_session(state: MutableMapping) -> Dict[str, int]:
+    """Tamanho de cada chave do estado da sessão, da maior para a menor."""
+    sizes = {str(key): deep_sizeof(state[key]) for key in list(state.keys())}
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+
+def purge_expired(state: MutableMapping, now: Optional[datetime] = None) -> int:
+    """
+    Remove as entradas `data_cache_*` expiradas.
+
+    Returns:
+        Quantidade de entradas removidas.
+    """
+    now = now or datetime.now()
+    expired = [
+        key for key in list(state.keys())
+        if str(key).startswith(DATA_CACHE_PREFIX) and _expires_at(state[key]) <= now
+    ]
+    for key in expired:
+        del state[key]
+    return len(expired)
+
+
+def apply_caps(state: MutableMapping) -> int:
+    """
+    Aplica os limites das chaves conhecidas.
+
+    Returns:
+        Quantidade de itens e entradas removidos.
+    """
+    removed = 0
+    for key, cap in SESSION_KEY_CAPS.items():
+        value = state.get(key)
+        if isinstance(value, list) and len(value) > cap:
+            removed += len(value) - cap
+            # Corta no lugar: quem guardou a lista continua com a mesma referência
+            del value[:len(value) - cap]
+
+    caches = sorted(
+        (key for key in list(state.keys()) if str(key).startswith(DATA_CACHE_PREFIX)),
+        key=lambda key: _expires_at(state[key]),
+    )
+    for key in caches[:max(0, len(caches) - SESSION_DATA_CACHE_MAX)]:
+        del state[key]
+        removed += 1
+    return removed
+
+
+def _expires_at(entry: Any) -> datetime:
+    # Entradas em formato inesperado contam como expiradas
+    if isinstance(entry, dict) and isinstance(entry.get('expires_at'), datetime):
+        return entry['expires_at']
+    return datetime.min
+
+
+@profiled('session.gc')
+def _collect(state: MutableMapping, session_id: Optional[str]) -> Dict[str, int]:
+    removed = purge_expired(state) + apply_caps(state)
+    sizes = measure_session(state)
+    if removed:
+        logger.debug("estado da sessão limpo", extra={'session': session_id, 'removed': removed})
+    if session_id is not None:
+        _record(session_id, state.get('username') or '-', sizes)
+    return sizes
+
+
+def collect_session(force: bool = False, state: Optional[MutableMapping] = None) -> Optional[Dict[str, int]]:
+    """
+    Limpa e mede o estado da sessão atual, no máximo a cada `SESSION_GC_INTERVAL` segundos.
+
+    Args:
+        force: Ignora o intervalo
+        state: Estado a limpar (padrão: `st.session_state`)
+
+    Returns:
+        Tamanho de cada chave, ou None se a limpeza não rodou agora.
+    """
+    if state is None:
+        import streamlit as st
+
+        state = st.session_state
+    now = time.time()
+    if not force and now - state.get(_GC_KEY, 0) < SESSION_GC_INTERVAL:
+        return None
+    state[_GC_KEY] = now
+    return _collect(state, session_id())
+
+
+def _record(session_id: str, username: str, sizes: Dict[str, int]) -> None:
+    now = time.time()
+    with _report_lock:
+        _report[session_id] = {
+            'session': session_id,
+            'username': username,
+            'bytes': sum(sizes.values()),
+            'keys': len(sizes),
+            'largest': list(sizes.items())[:3],
+            'updated': now,
+        }
+        for sid in [sid for sid, entry in _report.items() if now - entry['updated'] > REPORT_TTL]:
+            del _report[sid]
+
+
+def session_memory_report(limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Sessões que mais consomem memória, pela última medição de cada uma.
+
+    Sessões já encerradas no servidor saem do relatório.
+    """
+    try:
+        from streamlit import runtime
+
+        active = runtime.get_instance().is_active_session if runtime.exists() else None
+    except Exception:
+        active = None
+    with _report_lock:
+        if active is not None:
+            for sid in [sid for sid in _report if not active(sid)]:
+                del _report[sid]
+        entries = sorted(_report.values(), key=lambda entry: entry['bytes'], reverse=True)
+    return [dict(entry) for entry in entries[:limit]]
+
+
+def reset_session_memory_report() -> None:
+    """Descarta as medições das sessões."""
+    with _report_lock:
+        _report.clear()
+
+
+def _format_bytes(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 ** 2:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / 1024 ** 2:.1f} MB"
+
+
+def show_session_memory_panel(container=None):
+    """
+    Exibe as sessões que mais consomem memória e as chaves da sessão atual (para administradores).
+
+    Args:
+        container: Onde exibir (padrão: barra lateral)
+    """
+    import streamlit as st
+
+    container = container or st.sidebar
+    with container.expander("🧠 Memória das Sessões"):
+        if st.button("Limpar e medir agora", key="session_memory_collect"):
+            collect_session(force=True)
+
+        report = session_memory_report()
+        if report:
+            now = time.time()
+            st.dataframe(
+                [
+                    {
+                        "Sessão": entry['session'][:8],
+                        "Usuário": entry['username'],
+                        "Memória": _format_bytes(entry['bytes']),
+                        "Maiores chaves": ", ".join(f"{key} ({_format_bytes(size)})"
+                                                    for key, size in entry['largest']),
+                        "Medida há": f"{now - entry['updated']:.0f} s",
+                    }
+                    for entry in report
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+        else:
+            st.caption("Nenhuma sessão medida ainda.")
+
+        st.markdown("**Esta sessão**")
+        st.dataframe(
+            [{"Chave": key, "Memória": _format_bytes(size)}
+             for key, size in measure_session(st.session_state).items()],
+            hide_index=True,
+            use_container_width=True,
+        )
@@ -106,6 +106,1462 @@ class TestPerformanceImprovements(unittest.TestCase):
         self.assertEqual(get_cache_size(), 0)
 
 
+class TestTieredCache(unittest.TestCase):
+    """Testa a camada de cache em memória na frente do cache em disco."""
+    
+    def setUp(self):
+        clear_cache()
+    
+    def test_memory_hit_skips_disk(self):
+        """Uma chave quente deve ser servida da memória sem acessar o disco."""
+        from utils.cache_engine import CacheEngine
+        
+        calls = []
+        
+        @memoize_with_ttl(ttl_seconds=60)
+        def double(x):
+            calls.append(x)
+            return x * 2
+        
+        self.assertEqual(double(3), 6)
+        with patch.object(CacheEngine, '_read') as mock_load:
+            self.assertEqual(double(3), 6)
+            mock_load.assert_not_called()
+        self.assertEqual(calls, [3])
+    
+    def test_promotion_from_disk(self):
+        """Entradas descartadas da memória continuam disponíveis no disco."""
+        from utils.cache_engine import get_engine
+        
+        calls = []
+        
+        @memoize_with_ttl(ttl_seconds=60)
+        def square(x):
+            calls.append(x)
+            return x * x
+        
+        square(4)
+        get_engine().memory.clear()
+        self.assertEqual(square(4), 16)
+        self.assertEqual(calls, [4])
+        self.assertEqual(len(get_engine().memory), 1)
+    
+    def test_memory_size_from_payload(self):
+        """Gravar e promover do disco usam o tamanho do arquivo, sem serializar o valor de novo."""
+        import tempfile
+        from utils import cache_engine
+        
+        engine = cache_engine.CacheEngine(tempfile.mkdtemp(), purge_interval=0)
+        self.addCleanup(engine.index.close)
+        with patch.object(cache_engine, '_estimate_size') as estimate:
+            engine.set('teste', 'chave', list(range(1000)), 60)
+            stored = engine.memory.size
+            engine.memory.clear()
+            self.assertEqual(engine.get('teste', 'chave', 60), (True, list(range(1000))))
+            estimate.assert_not_called()
+        self.assertEqual(engine.memory.size, stored)
+        self.assertEqual(stored, engine.index.total_size())
+    
+    def test_lru_eviction_by_bytes(self):
+        """O LRU deve respeitar o limite em bytes, descartando as entradas mais antigas."""
+        from utils.cache_engine import MemoryCache
+        
+        cache = MemoryCache(max_bytes=100)
+        expires_at = time.time() + 60
+        cache.set('a', 'A', expires_at, size=40)
+        cache.set('b', 'B', expires_at, size=40)
+        cache.get('a')  # 'a' passa a ser a mais recente
+        cache.set('c', 'C', expires_at, size=40)
+        
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(cache.size, 80)
+        
+        # Entradas maiores que o limite não são armazenadas
+        self.assertFalse(cache.set('d', 'D', expires_at, size=200))
+        self.assertNotIn('d', cache)
+    
+    def test_memory_entry_expires(self):
+        """O TTL da camada em memória deve ser o mesmo do disco."""
+        from utils.cache_engine import MemoryCache
+        
+        cache = MemoryCache(max_bytes=100)
+        cache.set('a', 'A', time.time() - 1, size=1)
+        found, _ = cache.get('a')
+        self.assertFalse(found)
+        self.assertEqual(cache.size, 0)
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Testa a proteção contra recálculos simultâneos da mesma chave."""
+    
+    def setUp(self):
+        clear_cache()
+    
+    def test_one_computation_for_parallel_callers(self):
+        """50 chamadas simultâneas devem executar a função uma única vez."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        
+        calls = []
+        barrier = threading.Barrier(50)
+        
+        @memoize_with_ttl(ttl_seconds=60)
+        def slow_catalog(name):
+            calls.append(name)
+            time.sleep(0.2)
+            return {'name': name}
+        
+        def call():
+            barrier.wait()
+            return slow_catalog('vocabulario')
+        
+        with ThreadPoolExecutor(max_workers=50) as pool:
+            results = list(pool.map(lambda _: call(), range(50)))
+        
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r == {'name': 'vocabulario'} for r in results))
+    
+    def test_errors_are_shared_with_waiters(self):
+        """Se o cálculo falhar, quem estava esperando recebe o mesmo erro."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        
+        calls = []
+        barrier = threading.Barrier(5)
+        
+        @memoize_with_ttl(ttl_seconds=60)
+        def broken():
+            calls.append(1)
+            time.sleep(0.1)
+            raise ValueError("planilha indisponível")
+        
+        def call():
+            barrier.wait()
+            try:
+                broken()
+            except ValueError:
+                return True
+            return False
+        
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(pool.map(lambda _: call(), range(5)))
+        
+        self.assertTrue(all(results))
+        self.assertEqual(len(calls), 1)
+    
+    def test_early_refresh(self):
+        """Com beta alto, uma entrada válida é renovada antes de expirar."""
+        calls = []
+        
+        @memoize_with_ttl(ttl_seconds=60, early_refresh_beta=1e9)
+        def value():
+            calls.append(1)
+            time.sleep(0.01)
+            return len(calls)
+        
+        self.assertEqual(value(), 1)
+        self.assertEqual(value(), 2)
+
+
+class TestCacheKeys(unittest.TestCase):
+    """Testa as chaves de cache baseadas no conteúdo dos argumentos."""
+    
+    def test_dataframes_with_same_preview_do_not_collide(self):
+        """DataFrames que diferem fora da prévia de str() geram chaves diferentes."""
+        import pandas as pd
+        from utils.cache_keys import generate_cache_key
+        
+        a = pd.DataFrame({'aula': [f"Aula {i}" for i in range(1000)]})
+        b = a.copy()
+        b.loc[500, 'aula'] = 'Outra aula'
+        
+        self.assertEqual(str(a), str(b))
+        self.assertNotEqual(generate_cache_key((a,), {}), generate_cache_key((b,), {}))
+        self.assertEqual(generate_cache_key((a,), {}), generate_cache_key((a.copy(),), {}))
+    
+    def test_types_do_not_collide(self):
+        """1, 1.0, '1' e True devem gerar chaves diferentes."""
+        from utils.cache_keys import generate_cache_key
+        
+        keys = {generate_cache_key((value,), {}) for value in (1, 1.0, '1', True)}
+        self.assertEqual(len(keys), 4)
+    
+    def test_functions_do_not_collide(self):
+        """Funções com o mesmo nome e corpos ou variáveis capturadas diferentes geram chaves diferentes."""
+        from utils.cache_keys import fingerprint
+        
+        def adder(n):
+            return lambda x: x + n
+        
+        self.assertNotEqual(fingerprint(lambda x: x + 1), fingerprint(lambda x: x * 2))
+        self.assertNotEqual(fingerprint(adder(1)), fingerprint(adder(2)))
+        self.assertEqual(fingerprint(adder(1)), fingerprint(adder(1)))
+    
+    def test_self_reference(self):
+        """Objetos e listas que se referenciam geram uma chave estável, sem recursão infinita."""
+        from utils.cache_keys import fingerprint
+        
+        class Node:
+            pass
+        
+        a, b = Node(), Node()
+        a.s, b.s = a, b
+        self.assertEqual(fingerprint(a), fingerprint(b))
+        
+        items = [1]
+        items.append(items)
+        self.assertNotEqual(fingerprint(items), fingerprint([1, [1]]))
+    
+    def test_numpy_arrays(self):
+        """Arrays são comparados pelo conteúdo, tipo e formato."""
+        import numpy as np
+        from utils.cache_keys import fingerprint
+        
+        a = np.arange(12)
+        self.assertEqual(fingerprint(a), fingerprint(np.arange(12)))
+        self.assertNotEqual(fingerprint(a), fingerprint(a.reshape(3, 4)))
+        self.assertNotEqual(fingerprint(a), fingerprint(a.astype('int32')))
+    
+    def test_registered_fingerprint_and_protocol(self):
+        """Tipos podem definir a própria impressão digital."""
+        from utils.cache_keys import fingerprint, register_fingerprint, unregister_fingerprint
+        
+        class Catalog:
+            def __init__(self, version, rows):
+                self.version = version
+                self.rows = rows
+        
+        class Snapshot:
+            def __init__(self, version):
+                self.version = version
+                self.loaded_at = time.time()
+            
+            def __cache_fingerprint__(self):
+                return self.version
+        
+        register_fingerprint(Catalog, lambda catalog: catalog.version)
+        try:
+            self.assertEqual(fingerprint(Catalog('v1', [1])), fingerprint(Catalog('v1', [2])))
+            self.assertNotEqual(fingerprint(Catalog('v1', [1])), fingerprint(Catalog('v2', [1])))
+        finally:
+            unregister_fingerprint(Catalog)
+        self.assertNotEqual(fingerprint(Catalog('v1', [1])), fingerprint(Catalog('v1', [2])))
+        
+        first = Snapshot('v1')
+        time.sleep(0.001)
+        self.assertEqual(fingerprint(first), fingerprint(Snapshot('v1')))
+
+
+class TestCacheCodecs(unittest.TestCase):
+    """Testa a escolha e o cabeçalho dos formatos de serialização do cache."""
+    
+    def test_codec_recorded_in_header(self):
+        """O codec usado fica registrado no cabeçalho e a leitura o respeita."""
+        import pandas as pd
+        from utils.cache_codecs import available_codecs, decode_entry, encode_entry, read_codec_name
+        
+        df = pd.DataFrame({'aula': ['Aula 1', 'Aula 2'], 'ordem': [1, 2]})
+        entry = encode_entry(df)
+        if 'feather' in available_codecs():
+            self.assertEqual(read_codec_name(entry), 'feather')
+        pd.testing.assert_frame_equal(decode_entry(entry), df)
+        
+        small = {'vocabulario': {'vocab_1': True}}
+        entry = encode_entry(small)
+        self.assertEqual(read_codec_name(entry), 'pickle')
+        self.assertEqual(decode_entry(entry), small)
+    
+    def test_fallback_for_unsupported_frames(self):
+        """DataFrames que o Arrow não aceita (tipos mistos) caem para o pickle."""
+        import pandas as pd
+        from utils.cache_codecs import decode_entry, encode_entry, read_codec_name
+        
+        df = pd.DataFrame({'ordem': [1, 'dois']})
+        entry = encode_entry(df)
+        self.assertEqual(read_codec_name(entry), 'pickle')
+        pd.testing.assert_frame_equal(decode_entry(entry), df)
+    
+    def test_legacy_entries_are_readable(self):
+        """Entradas gravadas sem cabeçalho (pickle com gzip do pandas) continuam legíveis."""
+        import gzip
+        import pickle
+        import pandas as pd
+        from utils.cache_codecs import decode_entry
+        
+        df = pd.DataFrame({'aula': ['Aula 1']})
+        legacy = gzip.compress(pickle.dumps(df))
+        pd.testing.assert_frame_equal(decode_entry(legacy), df)
+        self.assertEqual(decode_entry(pickle.dumps([1, 2])), [1, 2])
+
+
+class TestDiskCacheIndex(unittest.TestCase):
+    """Testa o índice persistente e o limite de tamanho do cache em disco."""
+    
+    def setUp(self):
+        import tempfile
+        from utils.cache_engine import DiskCacheIndex
+        
+        self.tmpdir = tempfile.mkdtemp()
+        self.index = DiskCacheIndex(os.path.join(self.tmpdir, 'index.sqlite3'), max_bytes=100)
+    
+    def tearDown(self):
+        import shutil
+        
+        self.index.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+    
+    def _write(self, key, size, expires_at=None):
+        path = os.path.join(self.tmpdir, f"{key}.pkl")
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        self.index.record(key, path, size, expires_at or time.time() + 60)
+        return path
+    
+    def test_lru_eviction_over_budget(self):
+        """Ao passar do limite, a entrada acessada há mais tempo é removida."""
+        path_a = self._write('a', 40)
+        path_b = self._write('b', 40)
+        self.index.touch('a')
+        path_c = self._write('c', 40)
+        
+        self.assertTrue(os.path.exists(path_a))
+        self.assertFalse(os.path.exists(path_b))
+        self.assertTrue(os.path.exists(path_c))
+        self.assertEqual(self.index.total_size(), 80)
+    
+    def test_purge_expired(self):
+        """Entradas expiradas são removidas do índice e do disco."""
+        expired = self._write('old', 10, expires_at=time.time() - 1)
+        fresh = self._write('new', 10)
+        
+        self.assertEqual(self.index.purge_expired(), 1)
+        self.assertFalse(os.path.exists(expired))
+        self.assertTrue(os.path.exists(fresh))
+        self.assertEqual(self.index.total_size(), 10)
+    
+    def test_index_is_persistent(self):
+        """O tamanho total sobrevive ao fechamento do índice."""
+        self._write('a', 30)
+        self._write('a', 20)  # Regravar a mesma chave substitui o tamanho
+        self.index.close()
+        self.assertEqual(self.index.total_size(), 20)
+
+
+class TestCacheEngine(unittest.TestCase):
+    """Testa o motor de cache único usado pelos dois módulos de cache."""
+    
+    def setUp(self):
+        import tempfile
+        from utils.cache_engine import CacheEngine
+        
+        self.tmpdir = tempfile.mkdtemp()
+        self.engine = CacheEngine(self.tmpdir, max_disk_bytes=10 * 1024 * 1024,
+                                  max_memory_bytes=1024 * 1024, purge_interval=0)
+    
+    def tearDown(self):
+        import shutil
+        
+        self.engine.index.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+    
+    def test_clear_namespace(self):
+        """Limpar um namespace não afeta os demais."""
+        self.engine.set('catalogo', 'a', [1, 2], ttl_seconds=60)
+        self.engine.set('licoes', 'b', [3, 4], ttl_seconds=60)
+        
+        self.engine.clear('catalogo')
+        
+        self.assertFalse(self.engine.get('catalogo', 'a', 60)[0])
+        self.assertEqual(self.engine.get('licoes', 'b', 60), (True, [3, 4]))
+        self.assertEqual(list(self.engine.stats()['namespaces']), ['licoes'])
+    
+    def test_cache_if(self):
+        """Resultados recusados por `cache_if` não são guardados."""
+        import pandas as pd
+        
+        calls = []
+        
+        @self.engine.memoize('dataframe', ttl_seconds=60, cache_if=lambda df: not df.empty)
+        def load(rows):
+            calls.append(rows)
+            return pd.DataFrame({'aula': range(rows)})
+        
+        load(0)
+        load(0)
+        load(2)
+        load(2)
+        self.assertEqual(calls, [0, 0, 2])
+    
+    def test_both_modules_share_the_budget(self):
+        """Os decoradores de cache_utils e performance_utils usam o mesmo motor."""
+        import pandas as pd
+        from utils import cache_utils
+        from utils.cache_engine import get_engine
+        
+        @cache_utils.cached_dataframe(ttl=60)
+        def legacy():
+            return pd.DataFrame({'aula': [1, 2, 3]})
+        
+        @cached_dataframe
+        def current():
+            return pd.DataFrame({'aula': [4, 5, 6]})
+        
+        clear_cache()
+        legacy()
+        current()
+        self.assertEqual(get_engine().stats()['namespaces']['dataframe']['entries'], 2)
+        self.assertGreater(get_cache_size(), 0)
+
+
+class TestCacheInvalidation(unittest.TestCase):
+    """Testa a invalidação por etiqueta e pela mudança do catálogo."""
+    
+    def setUp(self):
+        clear_cache()
+    
+    def test_invalidate_tags(self):
+        """Só as entradas com a etiqueta são removidas, da memória e do disco."""
+        from utils import invalidate_tags
+        from utils.cache_engine import get_engine
+        
+        calls = []
+        
+        @memoize_with_ttl(ttl_seconds=60, tags=lambda module: [f"module:{module}"])
+        def lessons(module):
+            calls.append(module)
+            return [module]
+        
+        lessons('gramática')
+        lessons('vocabulário')
+        self.assertEqual(invalidate_tags('module:gramática'), 1)
+        
+        get_engine().memory.clear()
+        lessons('gramática')
+        lessons('vocabulário')
+        self.assertEqual(calls, ['gramática', 'vocabulário', 'gramática'])
+    
+    def test_catalog_change_invalidates_only_changed_module(self):
+        """Uma nova versão da planilha invalida apenas os módulos alterados."""
+        import pandas as pd
+        from utils import catalog
+        from utils.cache_engine import get_engine
+        
+        source = 'https://docs.google.com/spreadsheets/d/teste/edit'
+        sheet = pd.DataFrame({
+            'Módulo': ['Gramática', 'Vocabulário'],
+            'Título da Aula': ['Artigos', 'Cores'],
+        })
+        catalog.load_catalog(source, loader=lambda _: sheet)
+        
+        engine = get_engine()
+        for module in ('Gramática', 'Vocabulário'):
+            version = catalog.get_catalog_version(source, module)
+            engine.set('lessons', module, [module], 60,
+                       tags=catalog.catalog_tags(source, module, version))
+        
+        changed_sheet = sheet.copy()
+        changed_sheet.loc[0, 'Título da Aula'] = 'Artigos definidos'
+        self.assertEqual(catalog.refresh_catalog(source, loader=lambda _: changed_sheet), ['gramática'])
+        self.assertFalse(engine.get('lessons', 'Gramática', 60)[0])
+        self.assertTrue(engine.get('lessons', 'Vocabulário', 60)[0])
+
+
+class TestSharedCache(unittest.TestCase):
+    """Testa o cache compartilhado entre processos (CACHE_SHARED)."""
+    
+    def setUp(self):
+        import tempfile
+        
+        self.tmpdir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+    
+    def _engine(self):
+        from utils.cache_engine import CacheEngine
+        
+        return CacheEngine(self.tmpdir, purge_interval=0, shared=True)
+    
+    def test_memory_copies_follow_other_writers(self):
+        """A cópia em memória de um processo é descartada quando outro regrava ou remove a entrada."""
+        writer, reader = self._engine(), self._engine()
+        
+        writer.set('catalog', 'planilha', 'v1', 60)
+        self.assertEqual(reader.get('catalog', 'planilha', 60), (True, 'v1'))
+        
+        time.sleep(0.01)
+        writer.set('catalog', 'planilha', 'v2', 60)
+        self.assertEqual(reader.get('catalog', 'planilha', 60), (True, 'v2'))
+        
+        writer.delete('catalog', 'planilha')
+        self.assertFalse(reader.get('catalog', 'planilha', 60)[0])
+    
+    @unittest.skipUnless(hasattr(os, 'fork'), "requer fork")
+    def test_one_computation_across_processes(self):
+        """Vários processos pedindo a mesma chave calculam o valor uma única vez."""
+        import multiprocessing
+        
+        counter = os.path.join(self.tmpdir, 'calls.txt')
+        
+        def worker():
+            def compute():
+                with open(counter, 'a') as f:
+                    f.write('x')
+                time.sleep(0.3)
+                return 'catálogo'
+            
+            engine = self._engine()
+            value = engine.get_or_compute('catalog', 'planilha', compute, ttl_seconds=60)
+            os._exit(0 if value == 'catálogo' else 1)
+        
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=worker) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(10)
+            self.assertEqual(process.exitcode, 0)
+        
+        with open(counter) as f:
+            self.assertEqual(f.read(), 'x')
+
+
+class TestWarmStart(unittest.TestCase):
+    """Testa o instantâneo do catálogo e o aquecimento dos caches."""
+    
+    SOURCE = 'https://docs.google.com/spreadsheets/d/aquecimento/edit'
+    
+    def setUp(self):
+        import pandas as pd
+        from utils import catalog
+        
+        clear_cache()
+        # Cada teste começa sem o intervalo entre downloads de um teste anterior
+        catalog._revalidated_at.clear()
+        self.sheet = pd.DataFrame({
+            'Módulo': ['Gramática', 'Gramática'],
+            'Título da Aula': ['Artigos', 'Plural'],
+            'Link do Vídeo': ['https://youtu.be/a', 'https://youtu.be/b'],
+            'Link do Documento': ['', ''],
+            'Duração': ['10:00', '12:00'],
+            'ordem': [1, 2],
+        })
+    
+    def test_snapshot_served_after_restart(self):
+        """Sem o catálogo no cache, o instantâneo é servido e a planilha é baixada em segundo plano."""
+        import threading
+        import pandas as pd
+        from utils import catalog
+        from utils.cache_engine import get_engine
+        
+        catalog.load_catalog(self.SOURCE, loader=lambda _: self.sheet)
+        
+        # Simula o reinício: o catálogo some do cache, o instantâneo continua no disco
+        get_engine().delete(catalog.CATALOG_NAMESPACE, catalog.fingerprint(self.SOURCE))
+        downloaded = threading.Event()
+        
+        def slow_loader(_):
+            downloaded.set()
+            return self.sheet
+        
+        df = catalog.load_catalog(self.SOURCE, loader=slow_loader)
+        pd.testing.assert_frame_equal(df, self.sheet)
+        self.assertTrue(downloaded.wait(5))
+    
+    def test_snapshot_kept_in_memory_with_backoff(self):
+        """Com a rede fora do ar, o instantâneo é lido uma vez e o download só é tentado de novo após o intervalo."""
+        from utils import catalog
+        
+        source = 'https://docs.google.com/spreadsheets/d/sem-rede/edit'
+        catalog.save_snapshot(source, self.sheet)
+        attempts = []
+        
+        def offline(_):
+            attempts.append(1)
+            raise ConnectionError("sem rede")
+        
+        def wait_downloads():
+            while catalog._revalidating:
+                time.sleep(0.01)
+        
+        with patch.object(catalog, 'load_snapshot', wraps=catalog.load_snapshot) as load:
+            for _ in range(5):
+                self.assertEqual(len(catalog.load_catalog(source, loader=offline)), 2)
+                wait_downloads()
+            self.assertEqual(load.call_count, 1)
+            
+            # Depois do intervalo (e da expiração na memória), uma nova tentativa
+            catalog._revalidated_at[source] -= catalog.REVALIDATE_BACKOFF
+            catalog.get_engine().memory.clear()
+            catalog.load_catalog(source, loader=offline)
+            wait_downloads()
+        
+        self.assertEqual(load.call_count, 2)
+        self.assertEqual(len(attempts), 2)
+    
+    def test_run_warmup_builds_lessons(self):
+        """O aquecimento carrega o catálogo e monta as lições de cada módulo."""
+        from utils import catalog, warmup
+        
+        prepared = []
+        catalog.save_snapshot(self.SOURCE, self.sheet)
+        with patch.object(catalog, '_default_loader', return_value=self.sheet), \
+                patch.object(warmup, '_tasks', [('html', lambda source, modules: prepared.extend(modules))]):
+            status = warmup.run_warmup([self.SOURCE])
+        
+        self.assertEqual(status['errors'], {})
+        self.assertIn('lessons:Gramática', status['timings'])
+        self.assertEqual(prepared, ['Gramática'])
+
+
+class TestFragments(unittest.TestCase):
+    """Testa os fragmentos de HTML das lições."""
+    
+    LESSON = {'id': 'gramatica_1', 'title': 'Artigos <definidos>', 'duration': '10:00',
+              'level': 'Iniciante', 'doc_url': 'https://drive.google.com/file/d/abc/view',
+              'catalog_version': 'v1'}
+    
+    def setUp(self):
+        from utils import fragments
+        
+        clear_cache()
+        fragments._render_memo.cache_clear()
+    
+    def test_fragment_cached_per_state(self):
+        """O mesmo estado reutiliza o HTML já renderizado; a conclusão e o tema mudam o fragmento."""
+        from utils import fragments
+        
+        with patch.object(fragments, 'render', wraps=fragments.render) as render:
+            first = fragments.lesson_fragment('lesson_header', self.LESSON, theme='default')
+            again = fragments.lesson_fragment('lesson_header', self.LESSON, theme='default')
+            self.assertEqual(render.call_count, 1)
+        self.assertEqual(first, again)
+        self.assertIn('Artigos &lt;definidos&gt;', first)
+        
+        completed = fragments.lesson_fragment('lesson_header', self.LESSON, True, theme='default')
+        self.assertIn('lesson-card completed', completed)
+        contrast = fragments.lesson_fragment('lesson_header', self.LESSON, theme='high-contrast')
+        self.assertIn('data-theme="high-contrast"', contrast)
+    
+    def test_changed_lesson_renders_again(self):
+        """Uma lição alterada na planilha gera outro fragmento, sem invalidação."""
+        from utils import fragments
+        from utils.cache_engine import get_engine
+        
+        fragments.lesson_fragment('material_actions', self.LESSON, theme='default')
+        changed = dict(self.LESSON, doc_url='https://drive.google.com/file/d/xyz/view')
+        with patch.object(fragments, 'render', wraps=fragments.render) as render:
+            html = fragments.lesson_fragment('material_actions', changed, theme='default')
+            self.assertEqual(render.call_count, 1)
+        self.assertIn('https://drive.google.com/uc?export=download&amp;id=xyz', html)
+        self.assertNotIn('fragments', get_engine().index.namespace_stats())
+
+
+class TestAssets(unittest.TestCase):
+    """Testa a entrega dos arquivos CSS e JavaScript."""
+    
+    def setUp(self):
+        import tempfile
+        
+        self.static_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        
+        shutil.rmtree(self.static_dir, ignore_errors=True)
+    
+    def test_minify_css(self):
+        """Comentários e espaços são removidos sem alterar os seletores."""
+        from utils.assets import minify_css
+        
+        css = "/* título */\n.card :hover ,\n.a > b {\n    color : red;\n    margin: 0 1rem;\n}\n"
+        self.assertEqual(minify_css(css), ".card :hover,.a>b{color :red;margin:0 1rem}")
+    
+    def test_bundle_named_by_content(self):
+        """O nome do arquivo muda com o conteúdo e a versão antiga é removida."""
+        from utils import assets
+        
+        first = assets.build_bundle('modules', self.static_dir)
+        self.assertEqual(assets.build_bundle('modules', self.static_dir)['file'], first['file'])
+        self.assertRegex(first['file'], r'^modules\.[0-9a-f]{8}\.css$')
+        
+        with patch.object(assets, 'minify_css', return_value='.x{color:red}'):
+            second = assets.build_bundle('modules', self.static_dir)
+        self.assertNotEqual(second['file'], first['file'])
+        self.assertEqual(os.listdir(self.static_dir), [second['file']])
+    
+    def test_included_once_per_session(self):
+        """O script de carga é enviado só na primeira vez em cada sessão."""
+        from utils import assets
+        
+        session = {}
+        with patch.object(assets.st, 'session_state', session), \
+                patch.object(assets, 'STATIC_DIR', self.static_dir), \
+                patch.object(assets, '_built', {}), \
+                patch.object(assets, 'static_serving_enabled', return_value=True), \
+                patch.object(assets, '_run_script') as html:
+            self.assertTrue(assets.include_assets('modules', 'script'))
+            self.assertFalse(assets.include_assets('modules'))
+            self.assertFalse(assets.include_assets('script', 'modules'))
+        
+        self.assertEqual(html.call_count, 1)
+        loader = html.call_args[0][0]
+        self.assertIn('/app/static/modules.', loader)
+        self.assertIn('/app/static/script.', loader)
+        self.assertNotIn('@media', loader)
+    
+    def test_login_styles_removed_after_login(self):
+        """Depois de entrar, as páginas protegidas retiram os estilos do login do <head>."""
+        from streamlit.testing.v1 import AppTest
+        
+        def page():
+            from auth import auth_required
+            
+            auth_required()
+        
+        at = AppTest.from_function(page)
+        at.session_state['_assets_loaded'] = {'login', 'modules'}
+        at.session_state['authenticated'] = True
+        at.run()
+        self.assertEqual(at.session_state['_assets_loaded'], {'modules'})
+    
+    def test_login_redirects_to_calling_page(self):
+        """Sem login, o redirecionamento aponta para a página que chamou `auth_required`."""
+        import auth
+        
+        with patch.object(auth.st, 'session_state', {}), patch.object(auth, 'login') as login:
+            self.assertFalse(auth.auth_required())
+        login.assert_called_once_with(redirect_to='test_improvements.py')
+
+
+class TestLessonPagination(unittest.TestCase):
+    """Testa a busca e a paginação das lições dos módulos."""
+    
+    LESSONS = [{'id': f"gram_{i}", 'title': f"Aula {i}" + (" - Artigos" if i % 50 == 0 else "")}
+               for i in range(250)]
+    
+    def test_helpers(self):
+        """Busca pelo título, contagem de páginas e próxima lição pendente."""
+        from utils.module_utils import filter_lessons, next_incomplete, page_count
+        
+        self.assertEqual([l['id'] for l in filter_lessons(self.LESSONS, ' artigos ')],
+                         ['gram_0', 'gram_50', 'gram_100', 'gram_150', 'gram_200'])
+        self.assertEqual(len(filter_lessons(self.LESSONS, '')), 250)
+        self.assertEqual((page_count(0, 10), page_count(250, 10), page_count(251, 10)), (1, 25, 26))
+        self.assertEqual(next_incomplete(self.LESSONS, {f"gram_{i}" for i in range(37)}), 37)
+        self.assertIsNone(next_incomplete(self.LESSONS[:2], {'gram_0', 'gram_1'}))
+    
+    def test_only_current_page_rendered(self):
+        """Cada rerun renderiza no máximo uma página, e o atalho leva à próxima pendente."""
+        from streamlit.testing.v1 import AppTest
+        
+        def page():
+            import streamlit as st
+            from utils.module_utils import paginate_lessons
+            
+            lessons = [{'id': f"gram_{i}", 'title': f"Aula {i}"} for i in range(250)]
+            visible, focus = paginate_lessons(lessons, 'gramatica', {f"gram_{i}" for i in range(37)},
+                                              page_size=10)
+            for lesson in visible:
+                st.markdown(f"{lesson['title']}{' *' if lesson['id'] == focus else ''}")
+        
+        at = AppTest.from_function(page, default_timeout=30)
+        at.run()
+        self.assertEqual([m.value for m in at.markdown], [f"Aula {i}" for i in range(10)])
+        
+        at.button(key='gramatica_next').click().run()
+        self.assertEqual(at.number_input(key='gramatica_page').value, 4)
+        self.assertIn('Aula 37 *', [m.value for m in at.markdown])
+        self.assertEqual(len(at.markdown), 10)
+        
+        at.text_input(key='gramatica_search').input('Aula 24').run()
+        self.assertEqual([m.value for m in at.markdown],
+                         ['Aula 24'] + [f"Aula {i}" for i in range(240, 249)])
+    
+    def test_completion_updates_bar_in_same_run(self):
+        """O clique salva o progresso antes do rerun, e a barra já mostra a lição concluída."""
+        import tempfile
+        from streamlit.testing.v1 import AppTest
+        from utils import progress_utils
+        
+        def page():
+            import streamlit as st
+            from utils.module_utils import completion_button, display_lesson_list
+            
+            def card(lesson, module_id, is_completed, focused):
+                st.markdown(f"{lesson['title']}: {is_completed}")
+                completion_button(module_id, lesson['id'], is_completed)
+            
+            lessons = [{'id': f"gram_{i}", 'title': f"Aula {i}"} for i in range(4)]
+            display_lesson_list(lessons, 'gramatica', card)
+        
+        progress_file = os.path.join(tempfile.mkdtemp(), 'progress.json')
+        with patch.object(progress_utils, 'get_progress_file_path', return_value=progress_file):
+            at = AppTest.from_function(page, default_timeout=30)
+            at.run()
+            at.button(key='complete_gram_1').click().run()
+            
+            html = ''.join(m.value for m in at.markdown)
+            self.assertIn('1 de 4 lições concluídas', html)
+            self.assertIn('Aula 1: True', html)
+            self.assertTrue(progress_utils.is_lesson_completed('gramatica', 'gram_1'))
+
+
+class TestVideoFacade(unittest.TestCase):
+    """Testa a fachada dos vídeos (miniatura até o clique em "Assistir")."""
+    
+    def test_video_source(self):
+        """Provedor, player e miniatura são extraídos das URLs suportadas."""
+        from utils.video_facade import _parse
+        
+        youtube = _parse("https://youtu.be/dQw4w9WgXcQ?t=10")
+        self.assertEqual(youtube['id'], 'dQw4w9WgXcQ')
+        self.assertEqual(youtube['thumbnail_url'], 'https://i.ytimg.com/vi/dQw4w9WgXcQ/hqdefault.jpg')
+        self.assertIn('youtube-nocookie.com/embed/dQw4w9WgXcQ', youtube['embed_url'])
+        
+        drive = _parse("https://drive.google.com/file/d/ABC123XYZ/view?usp=sharing")
+        self.assertEqual(drive['provider'], 'drive')
+        self.assertEqual(drive['embed_url'], 'https://drive.google.com/file/d/ABC123XYZ/preview')
+        self.assertIn('thumbnail?id=ABC123XYZ', drive['thumbnail_url'])
+        
+        self.assertIsNone(_parse("https://example.com/video.mp4"))
+    
+    def test_player_only_after_click(self):
+        """Antes do clique só a miniatura é enviada; depois, o player com autoplay."""
+        from streamlit.testing.v1 import AppTest
+        
+        def page():
+            from utils.video_facade import video_facade
+            
+            video_facade("https://drive.google.com/file/d/ABC123XYZ/view", key='aula_1')
+        
+        # Sem o servidor de arquivos estáticos a miniatura remota é usada (e não é baixada)
+        with patch('utils.thumbnails.static_serving_enabled', return_value=False):
+            at = AppTest.from_function(page, default_timeout=30)
+            at.run()
+            html = ''.join(m.value for m in at.markdown)
+            self.assertIn('drive.google.com/thumbnail?id=ABC123XYZ', html)
+            self.assertNotIn('<iframe', html)
+            
+            at.button(key='play_aula_1').click().run()
+        html = ''.join(m.value for m in at.markdown)
+        self.assertIn('<iframe src="https://drive.google.com/file/d/ABC123XYZ/preview?autoplay=1"', html)
+        self.assertEqual(len(at.button), 0)
+
+
+class TestThumbnails(unittest.TestCase):
+    """Testa o cache local das miniaturas (servidor de imagens local, sem internet)."""
+    
+    def setUp(self):
+        import io
+        import tempfile
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from PIL import Image
+        
+        buffer = io.BytesIO()
+        Image.new('RGB', (1280, 720), (67, 97, 238)).save(buffer, 'PNG')
+        image = buffer.getvalue()
+        self.requests = []
+        requests_log = self.requests
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                requests_log.append(self.path)
+                status = 200 if self.path.startswith('/img') else 404
+                self.send_response(status)
+                self.send_header('Content-Type', 'image/png')
+                self.end_headers()
+                if status == 200:
+                    self.wfile.write(image)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        self.tmp = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        import shutil
+        
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+    
+    def _store(self, max_bytes=10 * 1024 * 1024):
+        from utils.thumbnails import ThumbnailStore
+        
+        store = ThumbnailStore(os.path.join(self.tmp, 'static'), os.path.join(self.tmp, 'index', 'index.sqlite'),
+                               max_bytes=max_bytes)
+        self.addCleanup(store.index.close)
+        return store
+    
+    def test_fetch_once_and_resize(self):
+        """A imagem é baixada uma vez e gravada em WebP e JPEG em cada largura."""
+        from PIL import Image
+        
+        store = self._store()
+        url = f"{self.base}/img/a.png"
+        self.assertIsNone(store.lookup(url))
+        files = store.fetch(url)
+        self.assertEqual(sorted(files), ['320.jpg', '320.webp', '640.jpg', '640.webp'])
+        with Image.open(os.path.join(store.static_dir, files['320.webp'])) as image:
+            self.assertEqual((image.format, image.size), ('WEBP', (320, 180)))
+        
+        self.assertEqual(store.fetch(url), files)
+        self.assertEqual(store.lookup(url), files)
+        self.assertEqual(self.requests, ['/img/a.png'])
+        
+        self.assertIsNone(store.fetch(f"{self.base}/missing.png"))
+        self.assertIsNone(store.prefetch(f"{self.base}/missing.png"))
+    
+    def test_size_budget_evicts_least_recently_used(self):
+        """Acima do limite, as variantes da miniatura usada há mais tempo saem do disco."""
+        store = self._store()
+        store.fetch(f"{self.base}/img/a.png")
+        store.index.max_bytes = store.index.total_size() + 1
+        store.fetch(f"{self.base}/img/b.png")
+        
+        self.assertIsNotNone(store.lookup(f"{self.base}/img/b.png"))
+        self.assertIsNone(store.lookup(f"{self.base}/img/a.png"))
+        self.assertLessEqual(store.index.total_size(), store.index.max_bytes)
+    
+    def test_srcsets_after_prefetch(self):
+        """Sem a miniatura no disco a página usa a remota; depois do download, a local."""
+        from utils import thumbnails
+        
+        store = self._store()
+        url = f"{self.base}/img/c.png"
+        with patch.object(thumbnails, 'get_store', return_value=store), \
+                patch.object(thumbnails, 'static_serving_enabled', return_value=True), \
+                patch.object(thumbnails, 'static_url', side_effect=lambda path: f"/app/static/{path}"):
+            self.assertIsNone(thumbnails.thumbnail_srcsets(url))
+            store.prefetch(url).result(timeout=10)
+            srcsets = thumbnails.thumbnail_srcsets(url)
+        
+        digest = store.digest(url)
+        self.assertEqual(srcsets['webp'], f"/app/static/thumbs/{digest}-320.webp 320w, "
+                                          f"/app/static/thumbs/{digest}-640.webp 640w")
+        self.assertEqual(srcsets['src'], f"/app/static/thumbs/{digest}-640.jpg")
+    
+    def test_index_ignores_foreign_files(self):
+        """Arquivos de cache que já estavam no diretório do índice não entram no limite das miniaturas."""
+        os.makedirs(os.path.join(self.tmp, 'index', 'thumbnails'))
+        with open(os.path.join(self.tmp, 'index', 'thumbnails', 'video_source_x.bin'), 'wb') as f:
+            f.write(b'0' * 100)
+        store = self._store()
+        files = store.fetch(f"{self.base}/img/d.png")
+        
+        sizes = sum(os.path.getsize(os.path.join(store.static_dir, name)) for name in files.values())
+        self.assertEqual(store.index.namespace_stats(), {'thumbnails': {'entries': 4, 'bytes': sizes}})
+
+
+class TestLazyImages(unittest.TestCase):
+    """Testa as variantes locais e o carregamento preguiçoso das imagens."""
+    
+    def setUp(self):
+        import tempfile
+        
+        self.tmp = tempfile.mkdtemp()
+        self.image_path = os.path.join(self.tmp, 'mapa.png')
+        self._save_image((0, 85, 164, 255), mtime=1000)
+    
+    def tearDown(self):
+        import shutil
+        
+        shutil.rmtree(self.tmp, ignore_errors=True)
+    
+    def _save_image(self, color, mtime):
+        from PIL import Image
+        
+        Image.new('RGBA', (1000, 500), color).save(self.image_path)
+        os.utime(self.image_path, (mtime, mtime))
+    
+    def test_variants_by_width_and_content(self):
+        """As larguras não passam da original e um novo conteúdo substitui as variantes antigas."""
+        from utils.images import image_variants
+        
+        out = os.path.join(self.tmp, 'img')
+        variants = image_variants(self.image_path, out, widths=(480, 960, 1440))
+        self.assertEqual(variants['widths'], '480,960,1000')
+        self.assertEqual(variants['fallback'], 'png')
+        self.assertRegex(variants['480.webp'], r'^mapa\.[0-9a-f]{8}-480\.webp$')
+        self.assertEqual(len(os.listdir(out)), 6)
+        self.assertIs(image_variants(self.image_path, out, widths=(480, 960, 1440)), variants)
+        
+        self._save_image((239, 65, 53, 255), mtime=2000)
+        updated = image_variants(self.image_path, out, widths=(480, 960, 1440))
+        self.assertNotEqual(updated['480.webp'], variants['480.webp'])
+        self.assertEqual(sorted(os.listdir(out)), sorted(v for k, v in updated.items() if '.' in k))
+    
+    def test_lazy_image_markup(self):
+        """Imagens locais usam srcset do servidor estático e as remotas, data-src; sem st.image."""
+        from streamlit.testing.v1 import AppTest
+        
+        def page(image_path):
+            from utils.lazy_loading import lazy_image
+            
+            lazy_image(image_path, caption='Mapa da França', use_column_width=True)
+            lazy_image('https://example.com/paris.jpg', width=300)
+        
+        with patch('utils.lazy_loading.static_serving_enabled', return_value=True), \
+                patch('utils.images.IMAGES_DIR', os.path.join(self.tmp, 'img')):
+            at = AppTest.from_function(page, args=(self.image_path,), default_timeout=30)
+            at.run()
+        
+        html = ''.join(m.value for m in at.markdown)
+        self.assertIn('<source type="image/webp" data-srcset="/app/static/img/mapa.', html)
+        self.assertIn('-1000.png 1000w"', html)
+        self.assertIn('<figcaption>Mapa da França</figcaption>', html)
+        self.assertIn('data-src="https://example.com/paris.jpg"', html)
+        self.assertIn('sizes', html)
+        self.assertEqual(len(at.get('imgs')), 0)
+        self.assertEqual(html.count('IntersectionObserver'), 0)
+
+
+class TestModulePage(unittest.TestCase):
+    """Testa o modelo de exibição compartilhado pelas páginas dos módulos."""
+    
+    def setUp(self):
+        clear_cache()
+    
+    def _sheet(self, titles):
+        import pandas as pd
+        
+        return pd.DataFrame({
+            'Módulo': ['Pronúncia'] * len(titles) + ['Gramática'],
+            'ordem': [float(i) for i in range(1, len(titles) + 1)] + [1.0],
+            'Título da Aula': titles + ['Artigos'],
+            'Duração': ['10:00'] * (len(titles) + 1),
+            'Link do Vídeo': ['https://youtu.be/dQw4w9WgXcQ', 'https://example.com/aula.mp4'][:len(titles)]
+                             + ['https://drive.google.com/file/d/vid1/view'],
+            'Link do Documento': ['https://drive.google.com/file/d/doc1/view', ''][:len(titles)] + [''],
+        })
+    
+    def test_lesson_view(self):
+        """Identificadores do progresso salvo, links prontos e vídeos sem player como link."""
+        from utils import catalog, module_page
+        
+        source = 'https://docs.google.com/spreadsheets/d/teste-modulos/edit'
+        catalog.load_catalog(source, loader=lambda _: self._sheet(['Vogais', 'Nasais']))
+        
+        view = module_page.get_module_view('pronúncia', source)
+        self.assertEqual(view['module_id'], 'pronuncia')
+        first, second = view['lessons']
+        self.assertEqual((first['id'], second['id']), ('pron_1', 'pron_2'))
+        self.assertEqual(first['download_url'], 'https://drive.google.com/uc?export=download&id=doc1')
+        self.assertEqual(first['video_url'], 'https://youtu.be/dQw4w9WgXcQ')
+        self.assertEqual((second['video_url'], second['video_link']), ('', 'https://example.com/aula.mp4'))
+        self.assertEqual(second['download_url'], '')
+        
+        self.assertEqual(module_page.module_config('Fonética')['module_id'], 'fonética')
+    
+    def test_view_built_once_per_catalog_version(self):
+        """O modelo só é refeito quando a versão do módulo muda na planilha."""
+        from utils import catalog, module_page
+        
+        source = 'https://docs.google.com/spreadsheets/d/teste-versoes/edit'
+        catalog.load_catalog(source, loader=lambda _: self._sheet(['Vogais']))
+        
+        with patch.object(module_page, 'build_lesson_view', wraps=module_page.build_lesson_view) as build:
+            module_page.get_module_view('Pronúncia', source)
+            module_page.get_module_view('Pronúncia', source)
+            module_page.get_module_view('Gramática', source)
+            self.assertEqual(build.call_count, 2)
+            
+            catalog.refresh_catalog(source, loader=lambda _: self._sheet(['Vogais', 'Nasais']))
+            view = module_page.get_module_view('Pronúncia', source)
+            module_page.get_module_view('Gramática', source)
+        
+        self.assertEqual(len(view['lessons']), 2)
+        self.assertEqual(build.call_count, 4)
+
+    def test_load_course_data(self):
+        """A planilha local vira módulo -> lições ordenadas, sem as linhas sem vídeo."""
+        import tempfile
+        from utils.module_utils import load_course_data
+
+        sheet = self._sheet(['Vogais', 'Nasais'])
+        sheet.loc[0, 'ordem'] = 3.0
+        sheet['link extra youtube'] = ['https://youtu.be/abc123', '', '']
+        sheet.loc[len(sheet)] = ['Gramática', 2.0, 'Sem vídeo', '05:00', None, '', '']
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'curso.xlsx')
+            sheet.to_excel(path, index=False)
+            modules = load_course_data(path)
+
+        self.assertEqual(sorted(modules), ['Gramática', 'Pronúncia'])
+        self.assertEqual([l['title'] for l in modules['Pronúncia']], ['Nasais', 'Vogais'])
+        self.assertEqual(modules['Pronúncia'][1]['youtube_id'], 'abc123')
+        self.assertEqual(len(modules['Gramática']), 1)
+
+
+class TestLazyImports(unittest.TestCase):
+    """Testa o carregamento adiado dos módulos pesados."""
+
+    def _run(self, code):
+        import subprocess
+
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        env = dict(os.environ, CACHE_WARMUP='false')
+        result = subprocess.run([sys.executable, '-c', f"import sys; sys.path.insert(0, {root!r})\n{code}"],
+                                capture_output=True, text=True, cwd=root, env=env)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout.split()
+
+    def test_app_imports_skip_heavy_modules(self):
+        """Importar as dependências do app não carrega pandas, requests, gspread nem Pillow."""
+        sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+        try:
+            import bench_import
+        finally:
+            sys.path.pop(0)
+
+        _, heavy, _ = bench_import.measure()
+        self.assertEqual(heavy, [])
+
+    def test_package_attributes_loaded_on_demand(self):
+        """`import utils` não importa os submódulos; o primeiro acesso importa só o necessário."""
+        loaded = self._run(
+            "import utils\n"
+            "print('utils.video_utils' in sys.modules)\n"
+            "fingerprint = utils.fingerprint\n"
+            "print('utils.cache_keys' in sys.modules, 'utils.video_utils' in sys.modules)\n"
+            "print('fingerprint' in dir(utils), 'fingerprint' in vars(utils))\n"
+        )
+        self.assertEqual(loaded, ['False', 'True', 'False', 'True', 'True'])
+
+        import utils
+        with self.assertRaises(AttributeError):
+            utils.nao_existe
+
+
+class TestStructuredLogging(unittest.TestCase):
+    """Testa os logs estruturados com fila, nível e amostragem."""
+
+    def setUp(self):
+        import tempfile
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmp.name, 'app.log')
+
+    def tearDown(self):
+        from utils import logging_utils
+
+        logging_utils.setup_logging()
+        self.tmp.cleanup()
+
+    def _events(self):
+        import json
+        from utils import logging_utils
+
+        # Esvazia a fila antes de ler o arquivo
+        logging_utils.shutdown_logging()
+        with open(self.log_file, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_json_events_with_fields_and_level(self):
+        """Campos extras no JSON e mensagens abaixo do nível descartadas."""
+        import io
+        from utils import logging_utils
+
+        stream = io.StringIO()
+        logging_utils.setup_logging('INFO', self.log_file, sample_rate=1, stream=stream)
+        logger = logging_utils.get_logger('teste')
+        logger.debug("não deve aparecer")
+        logger.info("catálogo carregado", extra={'rows': 120})
+
+        events = self._events()
+        self.assertEqual([e['msg'] for e in events], ['catálogo carregado'])
+        self.assertEqual((events[0]['level'], events[0]['logger'], events[0]['rows']),
+                         ('INFO', 'curso.teste', 120))
+        self.assertIn('catálogo carregado rows=120', stream.getvalue())
+
+    def test_exception_in_exc_field(self):
+        """O traceback de `logger.exception` vai para o campo `exc`, e não para a mensagem."""
+        import io
+        from utils import logging_utils
+
+        stream = io.StringIO()
+        logging_utils.setup_logging('INFO', self.log_file, sample_rate=1, stream=stream)
+        try:
+            raise ValueError("planilha inválida")
+        except ValueError:
+            logging_utils.get_logger('teste').exception("erro ao carregar", extra={'rows': 3})
+
+        event, = self._events()
+        self.assertEqual((event['msg'], event['rows']), ("erro ao carregar", 3))
+        self.assertIn('Traceback', event['exc'])
+        self.assertIn('ValueError: planilha inválida', event['exc'])
+        self.assertIn('ValueError: planilha inválida', stream.getvalue())
+
+    def test_debug_sampling(self):
+        """Só uma fração dos eventos DEBUG repetidos é gravada; a primeira ocorrência sempre."""
+        import io
+        from utils import logging_utils
+
+        logging_utils.setup_logging('DEBUG', self.log_file, sample_rate=0.25, stream=io.StringIO())
+        logger = logging_utils.get_logger('teste')
+        # Mantidas: a 1ª, a 5ª e a 9ª
+        for i in range(9):
+            logger.debug("linha lida", extra={'row': i})
+        logger.debug("outra mensagem")
+        logger.warning("aviso")
+
+        messages = [e['msg'] for e in self._events()]
+        self.assertEqual(messages.count("linha lida"), 3)
+        self.assertEqual(messages[-2:], ["outra mensagem", "aviso"])
+
+    def test_full_queue_drops_records(self):
+        """Com a fila cheia, o registro é descartado em vez de bloquear a página."""
+        import logging
+        import queue
+        from utils import logging_utils
+
+        handler = logging_utils._NonBlockingQueueHandler(queue.Queue(1))
+        record = logging.LogRecord('curso.teste', logging.INFO, __file__, 0, "evento", None, None)
+        handler.handle(record)
+        handler.handle(record)
+        self.assertEqual((handler.queue.qsize(), handler.dropped), (1, 1))
+
+
+class TestCacheMetrics(unittest.TestCase):
+    """Testa as métricas de acertos, falhas e latência dos caches."""
+    
+    def setUp(self):
+        from utils.cache_metrics import CacheMetrics
+        
+        self.metrics = CacheMetrics()
+    
+    def test_counters_and_histogram(self):
+        """Acertos, falhas e percentis são calculados a partir dos eventos."""
+        for _ in range(9):
+            self.metrics.record_hit('catalog', 0.0002)  # 0,2 ms
+        self.metrics.record_hit('catalog', 0.2)  # 200 ms
+        self.metrics.record_miss('catalog')
+        self.metrics.record_eviction('catalog', 2, 100)
+        self.metrics.register_gauge('catalog', 'bytes', lambda: 42)
+        
+        data = self.metrics.snapshot()['catalog']
+        self.assertEqual((data['hits'], data['misses'], data['evictions']), (10, 1, 2))
+        self.assertAlmostEqual(data['hit_ratio'], 10 / 11)
+        self.assertEqual(data['hit_latency']['p50_ms'], 0.5)
+        self.assertEqual(data['hit_latency']['p95_ms'], 500)
+        self.assertEqual(data['bytes'], 42)
+        
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot()['catalog']['hits'], 0)
+    
+    def test_engine_records_tiers(self):
+        """O motor de cache registra acertos por namespace e por camada."""
+        import tempfile
+        import shutil
+        from utils.cache_engine import CacheEngine
+        from utils.cache_metrics import metrics
+        
+        tmpdir = tempfile.mkdtemp()
+        engine = CacheEngine(tmpdir, purge_interval=0)
+        try:
+            metrics.reset()
+            engine.get_or_compute('metrics_test', 'k', lambda: 'valor', ttl_seconds=60)
+            engine.get_or_compute('metrics_test', 'k', lambda: 'valor', ttl_seconds=60)
+            engine.memory.clear()
+            engine.get_or_compute('metrics_test', 'k', lambda: 'valor', ttl_seconds=60)
+            
+            snapshot = metrics.snapshot()
+            self.assertEqual(snapshot['metrics_test']['hits'], 2)
+            self.assertEqual(snapshot['metrics_test']['misses'], 1)
+            self.assertEqual(snapshot['metrics_test']['load_latency']['count'], 1)
+            self.assertEqual(snapshot['memory']['hits'], 1)
+            self.assertEqual(snapshot['disk']['hits'], 1)
+        finally:
+            engine.index.close()
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+class TestProfiler(unittest.TestCase):
+    """Testa o perfil das fases das páginas."""
+
+    def setUp(self):
+        from utils.profiler import Profiler
+
+        self.profiler = Profiler(max_spans=3)
+
+    def test_percentiles_per_phase(self):
+        """p50/p95/p99 de cada fase a partir das durações registradas."""
+        for _ in range(98):
+            self.profiler.record('auth', 0, 0.002)  # 2 ms
+        self.profiler.record('auth', 0, 0.1)
+        self.profiler.record('auth', 0, 0.5)
+
+        data = self.profiler.snapshot()['auth']
+        self.assertEqual(data['count'], 100)
+        # Limite superior da faixa de ~25% que contém o percentil
+        self.assertTrue(2 <= data['p50_ms'] <= 2.5)
+        self.assertTrue(2 <= data['p95_ms'] <= 2.5)
+        self.assertTrue(100 <= data['p99_ms'] <= 125)
+        self.assertEqual(data['max_ms'], 500)
+
+    def test_nested_spans_and_chrome_trace(self):
+        """Fases aninhadas ficam dentro da fase mãe no trace; só as recentes são guardadas."""
+        with self.profiler.span('page', module='Gramática'):
+            with self.profiler.span('page.view'):
+                time.sleep(0.001)
+
+        spans = self.profiler.recent_spans()
+        self.assertEqual([(s['name'], s['depth']) for s in spans], [('page.view', 1), ('page', 0)])
+
+        events = self.profiler.chrome_trace()['traceEvents']
+        inner, outer = events
+        self.assertEqual((outer['ph'], outer['args']), ('X', {'module': 'Gramática'}))
+        self.assertGreaterEqual(inner['ts'], outer['ts'])
+        self.assertLessEqual(inner['ts'] + inner['dur'], outer['ts'] + outer['dur'])
+
+        for _ in range(3):
+            self.profiler.record('progress.load', 0, 0.001)
+        self.assertEqual(len(self.profiler.recent_spans()), 3)
+        self.assertEqual(self.profiler.snapshot()['page']['count'], 1)
+
+    def test_decorator_and_disabled(self):
+        """O decorador mede cada chamada; com o perfil desligado nada é registrado."""
+        import json
+        from utils import profiler as profiler_module
+
+        with patch.object(profiler_module, 'profiler', self.profiler):
+            @profiler_module.profiled('progress.save')
+            def save(value):
+                return value * 2
+
+            self.assertEqual(save(21), 42)
+            self.profiler.enabled = False
+            save(1)
+
+        exported = json.loads(self.profiler.export_json())
+        self.assertEqual(exported['phases']['progress.save']['count'], 1)
+        self.assertEqual([s['name'] for s in exported['spans']], ['progress.save'])
+
+
+class TestSessionMemory(unittest.TestCase):
+    """Testa a contabilidade e a limpeza do estado das sessões."""
+
+    def setUp(self):
+        from utils.session_memory import reset_session_memory_report
+
+        reset_session_memory_report()
+
+    def test_deep_sizeof(self):
+        """Conteúdo aninhado é somado; objetos repetidos e ciclos contam uma vez."""
+        import sys
+        import pandas as pd
+        from utils.session_memory import deep_sizeof
+
+        payload = 'x' * 10000
+        self.assertGreater(deep_sizeof({'a': [payload]}), 10000)
+        self.assertLess(deep_sizeof([payload, payload]) - deep_sizeof([payload]), 100)
+
+        cycle = []
+        cycle.append(cycle)
+        self.assertEqual(deep_sizeof(cycle), sys.getsizeof(cycle))
+
+        df = pd.DataFrame({'titulo': ['Aula'] * 100})
+        self.assertEqual(deep_sizeof(df), int(df.memory_usage(deep=True).sum()))
+
+    def test_collect_purges_and_caps(self):
+        """Entradas expiradas saem, as cópias e o log ficam limitados e a sessão entra no relatório."""
+        from datetime import datetime, timedelta
+        from utils import session_memory
+
+        now = datetime.now()
+        state = {
+            'username': 'aluno1',
+            'data_cache_velha': {'data': 'x' * 1000, 'expires_at': now - timedelta(seconds=1)},
+            'debug_info': [f"mensagem {i}" for i in range(10)],
+        }
+        for i in range(4):
+            state[f"data_cache_{i}"] = {'data': 'y' * 1000, 'expires_at': now + timedelta(minutes=i + 1)}
+
+        with patch.object(session_memory, 'SESSION_KEY_CAPS', {'debug_info': 3}), \
+                patch.object(session_memory, 'SESSION_DATA_CACHE_MAX', 2), \
+                patch.object(session_memory, 'session_id', return_value='sessao-1'):
+            sizes = session_memory.collect_session(state=state)
+            # Dentro do intervalo a limpeza não roda de novo
+            self.assertIsNone(session_memory.collect_session(state=state))
+
+        self.assertEqual(sorted(k for k in state if k.startswith('data_cache_')), ['data_cache_2', 'data_cache_3'])
+        self.assertEqual(state['debug_info'], ['mensagem 7', 'mensagem 8', 'mensagem 9'])
+        self.assertIn('data_cache_3', sizes)
+
+        report = session_memory.session_memory_report()
+        self.assertEqual([(r['session'], r['username']) for r in report], [('sessao-1', 'aluno1')])
+        self.assertEqual(report[0]['bytes'], sum(sizes.values()))
+
+
+class TestUserStore(unittest.TestCase):
+    """Testa o diretório de usuários e a verificação das senhas."""
+
+    def setUp(self):
+        import hashlib
+        import tempfile
+        from utils.user_store import UserStore
+
+        self.tmpdir = tempfile.mkdtemp()
+        seed = {'aluno1': {'password': hashlib.sha256(b'123456').hexdigest(), 'role': 'aluno'}}
+        self.store = UserStore(os.path.join(self.tmpdir, 'users.sqlite3'), seed=seed)
+
+    def tearDown(self):
+        import shutil
+
+        self.store.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_verify_and_upgrade_legacy_hash(self):
+        """Contas antigas entram com a senha de sempre e passam a ter hash scrypt com sal."""
+        from utils.user_store import hash_password, verify_credentials, verify_password
+
+        self.assertIsNone(verify_credentials('aluno1', 'errada', self.store))
+        self.assertIsNone(verify_credentials('ninguem', '123456', self.store))
+        self.assertEqual(verify_credentials('aluno1', '123456', self.store), {'username': 'aluno1', 'role': 'aluno'})
+
+        stored = self.store.get('aluno1')['password_hash']
+        self.assertTrue(stored.startswith('scrypt$'))
+        self.assertEqual(verify_credentials(' aluno1 ', '123456', self.store)['username'], 'aluno1')
+        self.assertEqual(self.store.get('aluno1')['password_hash'], stored)
+
+        # Mesmo com a mesma senha, cada hash tem o seu sal
+        self.assertNotEqual(hash_password('123456'), hash_password('123456'))
+        self.assertTrue(verify_password('123456', hash_password('123456')))
+        self.assertFalse(verify_password('123456', 'formato$desconhecido'))
+
+    def test_import_roster(self):
+        """A turma entra numa transação; usuários existentes só mudam com `overwrite`."""
+        from utils.user_store import read_roster, verify_credentials
+
+        path = os.path.join(self.tmpdir, 'turma.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("Usuário;Senha;Papel\n"
+                    "maria;abc;\n"
+                    "joao;def;admin\n"
+                    "aluno1;nova;\n"
+                    ";sem-usuario;\n"
+                    "pedro;ghi;professor\n")
+
+        result = self.store.import_users(read_roster(path), workers=2)
+        self.assertEqual((result['created'], result['updated'], result['skipped']), (2, 0, 1))
+        self.assertEqual(len(result['errors']), 2)
+        self.assertEqual(self.store.list_users(role='admin'), [{'username': 'joao', 'role': 'admin'}])
+        self.assertEqual(self.store.count(), 3)
+
+        result = self.store.import_users([{'username': 'aluno1', 'password': 'nova'}], overwrite=True, workers=1)
+        self.assertEqual(result['updated'], 1)
+        self.assertIsNotNone(verify_credentials('aluno1', 'nova', self.store))
+
+
 class TestAccessibility(unittest.TestCase):
     """Testa as melhorias de acessibilidade."""
     
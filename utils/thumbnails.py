@@ -0,0 +1,187 @@
+"""
+Cache local das miniaturas dos vídeos.
+
+Cada miniatura remota (YouTube, Google Drive) é baixada uma única vez,
+redimensionada para as larguras de `THUMBNAIL_WIDTHS` e gravada em WebP e
+JPEG em `static/thumbs/`, com o hash da URL de origem no nome
+(`<hash>-<largura>.<formato>`). Os arquivos são servidos pelo Streamlit em
+`/app/static/thumbs/` e o navegador escolhe a variante pelo `srcset`.
+
+O espaço ocupado é limitado por `THUMBNAIL_CACHE_SIZE`: um índice SQLite (o
+mesmo do cache em disco) registra o último acesso de cada variante e remove as
+menos usadas quando o limite é ultrapassado. O índice fica em
+`THUMBNAIL_INDEX_DIR`, fora do `CACHE_DIR`: o motor de cache não o apaga ao
+limpar e o índice só registra as variantes que esta camada gravou.
+
+O download nunca bloqueia a renderização: enquanto a miniatura não está no
+disco, a página usa a URL remota e `prefetch` a baixa em segundo plano.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Sequence
+
+from .assets import STATIC_DIR, static_serving_enabled, static_url
+from .cache_engine import DiskCacheIndex
+from .images import write_variants
+from .logging_utils import get_logger
+from config import THUMBNAIL_CACHE_SIZE, THUMBNAIL_INDEX_DIR
+
+logger = get_logger(__name__)
+
+THUMBNAIL_WIDTHS = (320, 640)
+THUMBNAIL_FORMATS = {'webp': 'WEBP', 'jpg': 'JPEG'}
+THUMBNAIL_QUALITY = 80
+
+# Depois de uma falha, a mesma URL só é tentada de novo após este intervalo
+RETRY_AFTER = 300
+FETCH_TIMEOUT = 10
+# O último acesso no índice é atualizado no máximo uma vez por este intervalo
+TOUCH_INTERVAL = 60
+
+_NAMESPACE = 'thumbnails'
+
+
+class ThumbnailStore:
+    """
+    Variantes locais das miniaturas, com limite de tamanho (LRU).
+
+    Args:
+        static_dir: Diretório servido pelo Streamlit onde ficam as variantes
+        index_path: Arquivo SQLite do índice (fora de `static_dir`, que é público)
+        max_bytes: Tamanho máximo ocupado pelas variantes
+        widths: Larguras geradas (imagens menores não são ampliadas)
+    """
+
+    def __init__(self, static_dir: str, index_path: str, max_bytes: int = THUMBNAIL_CACHE_SIZE,
+                 widths: Sequence[int] = THUMBNAIL_WIDTHS):
+        self.static_dir = static_dir
+        self.widths = tuple(widths)
+        self.index = DiskCacheIndex(index_path, max_bytes, adopt_orphans=False)
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='thumbnails')
+        self._pending: Dict[str, Future] = {}
+        self._failures: Dict[str, float] = {}
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(source_url: str) -> str:
+        return hashlib.sha256(source_url.encode('utf-8')).hexdigest()[:16]
+
+    def _filenames(self, digest: str) -> Dict[str, str]:
+        return {f"{width}.{ext}": f"{digest}-{width}.{ext}"
+                for width in self.widths for ext in THUMBNAIL_FORMATS}
+
+    def lookup(self, source_url: str) -> Optional[Dict[str, str]]:
+        """
+        Variantes já gravadas de uma miniatura, sem acessar a rede.
+
+        Returns:
+            Dicionário "<largura>.<formato>" -> nome do arquivo, ou None se
+            alguma variante não estiver no disco.
+        """
+        filenames = self._filenames(self.digest(source_url))
+        if not all(os.path.exists(os.path.join(self.static_dir, name)) for name in filenames.values()):
+            return None
+        now = time.time()
+        if now - self._touched.get(source_url, 0) > TOUCH_INTERVAL:
+            self._touched[source_url] = now
+            for name in filenames.values():
+                self.index.touch(f"{_NAMESPACE}/{name}")
+        return filenames
+
+    def fetch(self, source_url: str) -> Optional[Dict[str, str]]:
+        """
+        Baixa a imagem, grava as variantes e retorna os nomes dos arquivos.
+
+        Returns:
+            Os mesmos dados de `lookup`, ou None se o download ou a conversão falhar.
+        """
+        cached = self.lookup(source_url)
+        if cached is not None:
+            return cached
+        import requests
+        from PIL import Image
+
+        try:
+            response = requests.get(source_url, timeout=FETCH_TIMEOUT)
+            response.raise_for_status()
+            image = Image.open(io.BytesIO(response.content)).convert('RGB')
+        except Exception as e:
+            logger.warning("erro ao baixar a miniatura", extra={'url': source_url, 'error': str(e)})
+            with self._lock:
+                self._failures[source_url] = time.time()
+            return None
+
+        written = write_variants(image, self.static_dir, self.digest(source_url), self.widths,
+                                 THUMBNAIL_FORMATS, THUMBNAIL_QUALITY)
+        for name, size in written.values():
+            # Sem expiração: as variantes só saem do disco pelo limite de tamanho
+            self.index.record(f"{_NAMESPACE}/{name}", os.path.join(self.static_dir, name), size,
+                              float('inf'), namespace=_NAMESPACE)
+        return {variant: name for variant, (name, _) in written.items()}
+
+    def prefetch(self, source_url: str) -> Optional[Future]:
+        """
+        Agenda o download em segundo plano (uma vez por URL; falhas recentes
+        não são repetidas antes de `RETRY_AFTER` segundos).
+        """
+        with self._lock:
+            if source_url in self._pending:
+                return self._pending[source_url]
+            if time.time() - self._failures.get(source_url, 0) < RETRY_AFTER:
+                return None
+            future = self._executor.submit(self.fetch, source_url)
+            self._pending[source_url] = future
+        future.add_done_callback(lambda _: self._forget(source_url))
+        return future
+
+    def _forget(self, source_url: str) -> None:
+        with self._lock:
+            self._pending.pop(source_url, None)
+
+
+_store: Optional[ThumbnailStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> ThumbnailStore:
+    """Cache de miniaturas do processo (criado no primeiro uso)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ThumbnailStore(os.path.join(STATIC_DIR, 'thumbs'),
+                                        os.path.join(THUMBNAIL_INDEX_DIR, 'index.sqlite'))
+    return _store
+
+
+def thumbnail_srcsets(source_url: str) -> Optional[Dict[str, str]]:
+    """
+    `srcset` local de uma miniatura em cada formato.
+
+    Se as variantes ainda não estão no disco (ou o servidor de arquivos
+    estáticos está desligado), agenda o download e retorna None para que a
+    página use a URL remota desta vez.
+
+    Returns:
+        Dicionário formato -> srcset (por exemplo, {"webp": "... 320w, ... 640w"}),
+        mais "src" com a maior variante JPEG.
+    """
+    if not source_url or not static_serving_enabled():
+        return None
+    store = get_store()
+    filenames = store.lookup(source_url)
+    if filenames is None:
+        store.prefetch(source_url)
+        return None
+    srcsets = {
+        ext: ', '.join(f"{static_url('thumbs/' + filenames[f'{width}.{ext}'])} {width}w"
+                       for width in store.widths)
+        for ext in THUMBNAIL_FORMATS
+    }
+    srcsets['src'] = static_url('thumbs/' + filenames[f"{store.widths[-1]}.jpg"])
+    return srcsets
@@ -2,10 +2,14 @@
 Módulo para gerenciar o cache de dados e o progresso do usuário.
 """
 import streamlit as st
-import pandas as pd
+import sys
 from datetime import datetime, timedelta
 import json
 import hashlib
+import time
+
+from .cache_metrics import metrics
+from .session_memory import apply_caps
 
 # Tempo de expiração do cache em segundos (1 hora)
 CACHE_EXPIRATION = 3600
@@ -21,11 +25,17 @@ class DataCache:
     @staticmethod
     def get_cached_data(url: str):
         """Obtém dados do cache se ainda estiverem válidos"""
+        start = time.perf_counter()
         cache_key = DataCache.get_cache_key(url)
         if cache_key in st.session_state:
             cache_data = st.session_state[cache_key]
             if datetime.now() < cache_data['expires_at']:
+                metrics.record_hit('session', time.perf_counter() - start)
                 return cache_data['data']
+            # Entrada expirada: libera a memória da sessão
+            del st.session_state[cache_key]
+            metrics.record_eviction('session')
+        metrics.record_miss('session')
         return None
     
     @staticmethod
@@ -36,6 +46,11 @@ class DataCache:
             'data': data,
             'expires_at': datetime.now() + timedelta(seconds=CACHE_EXPIRATION)
         }
+        pd = sys.modules.get('pandas')
+        size = int(data.memory_usage(deep=True).sum()) if pd is not None and isinstance(data, pd.DataFrame) else 0
+        metrics.record_store('session', size)
+        # Cada sessão guarda no máximo SESSION_DATA_CACHE_MAX cópias
+        apply_caps(st.session_state)
 
 class UserProgress:
     """Classe para gerenciar o progresso do usuário"""
@@ -150,7 +165,8 @@ def load_cached_data(url: str, load_function):
         return cached_data
     
     # Se não estiver em cache ou expirado, carrega os dados
-    data = load_function()
+    with metrics.time_load('session'):
+        data = load_function()
     
     # Armazena no cache
     if data is not None:
@@ -0,0 +1,405 @@
+"""
+Diretório de usuários do curso, num banco SQLite indexado pelo nome de usuário.
+
+As senhas são guardadas com hash lento e sal próprio: `scrypt` (ou
+PBKDF2-SHA256 quando o OpenSSL não oferece scrypt), no formato
+`scrypt$<n>$<r>$<p>$<sal>$<hash>` ou `pbkdf2_sha256$<iterações>$<sal>$<hash>`
+(sal e hash em base64). Os hashes SHA-256 sem sal das contas antigas
+(`auth.USERS`) continuam aceitos e são trocados pelo formato atual no primeiro
+login bem-sucedido.
+
+Cada verificação custa dezenas de milissegundos de CPU, de propósito. Ela roda
+num pool de `AUTH_WORKERS` threads (scrypt e PBKDF2 liberam o GIL): uma rajada
+de logins ocupa no máximo esses núcleos, e as execuções de script das outras
+sessões continuam.
+
+Importação de turmas (CSV com as colunas `usuario`, `senha` e, opcionalmente,
+`papel`; separador `,` ou `;`):
+
+    python -m utils.user_store importar turma.csv
+    python -m utils.user_store importar turma.csv --papel aluno --substituir
+"""
+import argparse
+import base64
+import csv
+import functools
+import hashlib
+import hmac
+import os
+import re
+import secrets
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .logging_utils import get_logger
+from .profiler import profiled
+from config import AUTH_WORKERS, USER_DB
+
+logger = get_logger(__name__)
+
+# Custo do scrypt: ~16 MB de memória e algumas dezenas de ms por verificação
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = 600000
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+DEFAULT_ROLE = 'aluno'
+ROLES = ('aluno', 'admin')
+
+# Nomes aceitos para as colunas do CSV de importação
+_COLUMNS = {
+    'username': ('usuario', 'usuário', 'username', 'user'),
+    'password': ('senha', 'password'),
+    'role': ('papel', 'role'),
+}
+_LEGACY_SHA256 = re.compile(r'[0-9a-f]{64}')
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode('ascii')
+
+
+def _scrypt_available() -> bool:
+    return hasattr(hashlib, 'scrypt')
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash com sal novo no formato atual (scrypt, ou PBKDF2-SHA256 sem scrypt).
+
+    Args:
+        password: Senha em texto puro
+    """
+    salt = secrets.token_bytes(SALT_BYTES)
+    if _scrypt_available():
+        digest = hashlib.scrypt(password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=HASH_BYTES)
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, PBKDF2_ITERATIONS, HASH_BYTES)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64(salt)}${_b64(digest)}"
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """
+    Confere a senha com o hash guardado (tempo constante na comparação).
+
+    Args:
+        password: Senha digitada
+        stored: Hash guardado (formato atual ou SHA-256 antigo)
+    """
+    try:
+        if _LEGACY_SHA256.fullmatch(stored):
+            return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+        scheme, *params = stored.split('$')
+        if scheme == 'scrypt':
+            n, r, p, salt, digest = params
+            expected = base64.b64decode(digest)
+            computed = hashlib.scrypt(password.encode(), salt=base64.b64decode(salt), n=int(n), r=int(r), p=int(p),
+                                      dklen=len(expected))
+        elif scheme == 'pbkdf2_sha256':
+            iterations, salt, digest = params
+            expected = base64.b64decode(digest)
+            computed = hashlib.pbkdf2_hmac('sha256', password.encode(), base64.b64decode(salt), int(iterations),
+                                           len(expected))
+        else:
+            return False
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(computed, expected)
+
+
+def needs_rehash(stored: str) -> bool:
+    """Se o hash guardado não está no formato e nos parâmetros atuais."""
+    if _scrypt_available():
+        return not stored.startswith(f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$")
+    return not stored.startswith(f"pbkdf2_sha256${PBKDF2_ITERATIONS}$")
+
+
+@functools.lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    # Usuários inexistentes também pagam uma verificação (o tempo não revela quem existe)
+    return hash_password(secrets.token_hex(16))
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_auth_executor() -> ThreadPoolExecutor:
+    """Pool de threads das verificações de senha (criado no primeiro login)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max(1, AUTH_WORKERS), thread_name_prefix='auth')
+    return _executor
+
+
+class UserStore:
+    """
+    Usuários num banco SQLite (chave primária `username`: uma busca pelo índice por login).
+
+    Args:
+        db_path: Caminho do banco (criado no primeiro uso)
+        seed: Contas gravadas quando o banco está vazio ({usuário: {'password': hash, 'role': papel}})
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS users (
+        username TEXT PRIMARY KEY,
+        password_hash TEXT NOT NULL,
+        role TEXT NOT NULL DEFAULT 'aluno',
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS users_role ON users (role);
+    """
+
+    def __init__(self, db_path: str = USER_DB, seed: Optional[Mapping[str, Mapping[str, str]]] = None):
+        self.db_path = str(db_path)
+        self.seed = seed
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self._SCHEMA)
+            if self.seed and conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None:
+                now = time.time()
+                conn.executemany(
+                    "INSERT OR IGNORE INTO users VALUES (?, ?, ?, ?, ?)",
+                    [(name, user['password'], user.get('role', DEFAULT_ROLE), now, now)
+                     for name, user in self.seed.items()],
+                )
+            self._conn = conn
+        return self._conn
+
+    def get(self, username: str) -> Optional[Dict[str, str]]:
+        """Usuário com o hash da senha e o papel, ou None."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT username, password_hash, role FROM users WHERE username = ?", (username,)).fetchone()
+        if row is None:
+            return None
+        return {'username': row[0], 'password_hash': row[1], 'role': row[2]}
+
+    def count(self, role: Optional[str] = None) -> int:
+        with self._lock:
+            if role is None:
+                return self._connection().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+            return self._connection().execute("SELECT COUNT(*) FROM users WHERE role = ?", (role,)).fetchone()[0]
+
+    def list_users(self, role: Optional[str] = None, limit: int = -1) -> List[Dict[str, str]]:
+        """Usuários (nome e papel) em ordem alfabética, sem os hashes."""
+        with self._lock:
+            if role is None:
+                rows = self._connection().execute(
+                    "SELECT username, role FROM users ORDER BY username LIMIT ?", (limit,)).fetchall()
+            else:
+                rows = self._connection().execute(
+                    "SELECT username, role FROM users WHERE role = ? ORDER BY username LIMIT ?",
+                    (role, limit)).fetchall()
+        return [{'username': name, 'role': user_role} for name, user_role in rows]
+
+    def set_password_hash(self, username: str, password_hash: str) -> None:
+        with self._lock:
+            self._connection().execute(
+                "UPDATE users SET password_hash = ?, updated_at = ? WHERE username = ?",
+                (password_hash, time.time(), username))
+
+    def add_user(self, username: str, password: str, role: str = DEFAULT_ROLE) -> None:
+        """Cria ou substitui um usuário (o hash é calculado aqui, na thread atual)."""
+        self.import_users([{'username': username, 'password': password, 'role': role}], overwrite=True, workers=1)
+
+    def delete(self, username: str) -> bool:
+        with self._lock:
+            return self._connection().execute("DELETE FROM users WHERE username = ?", (username,)).rowcount > 0
+
+    def import_users(self, rows: Iterable[Mapping[str, str]], default_role: str = DEFAULT_ROLE,
+                     overwrite: bool = False, workers: Optional[int] = None) -> Dict[str, object]:
+        """
+        Grava vários usuários numa transação, com os hashes calculados em paralelo.
+
+        Args:
+            rows: Dicionários com `username`, `password` e, opcionalmente, `role`
+            default_role: Papel das linhas sem papel
+            overwrite: Se True, troca a senha e o papel dos usuários existentes
+            workers: Threads para os hashes (padrão: número de CPUs)
+
+        Returns:
+            Contagens `created`, `updated` e `skipped` e a lista `errors` ("linha N: motivo").
+        """
+        accounts: Dict[str, Tuple[str, str]] = {}
+        errors = []
+        for line, row in enumerate(rows, start=1):
+            username = (row.get('username') or '').strip()
+            password = row.get('password') or ''
+            role = (row.get('role') or '').strip().lower() or default_role
+            if not username or not password:
+                errors.append(f"linha {line}: usuário ou senha em branco")
+            elif role not in ROLES:
+                errors.append(f"linha {line}: papel desconhecido '{role}'")
+            else:
+                # Repetido no arquivo: vale a última linha
+                accounts[username] = (password, role)
+
+        names = list(accounts)
+        with self._lock:
+            existing = set()
+            for start in range(0, len(names), 500):
+                chunk = names[start:start + 500]
+                existing.update(name for (name,) in self._connection().execute(
+                    f"SELECT username FROM users WHERE username IN ({','.join('?' * len(chunk))})", chunk))
+        pending = [name for name in names if overwrite or name not in existing]
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            hashes = list(pool.map(hash_password, (accounts[name][0] for name in pending)))
+
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT INTO users VALUES (?, ?, ?, ?, ?) ON CONFLICT (username) DO UPDATE SET "
+                    "password_hash = excluded.password_hash, role = excluded.role, updated_at = excluded.updated_at",
+                    [(name, password_hash, accounts[name][1], now, now) for name, password_hash in zip(pending, hashes)],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        updated = sum(1 for name in pending if name in existing)
+        result = {
+            'created': len(pending) - updated,
+            'updated': updated,
+            'skipped': len(names) - len(pending),
+            'errors': errors,
+        }
+        logger.info("usuários importados", extra={'users_created': result['created'], 'users_updated': updated,
+                                                  'users_skipped': result['skipped'], 'errors': len(errors)})
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_store: Optional[UserStore] = None
+_store_lock = threading.Lock()
+
+
+def get_user_store(seed: Optional[Mapping[str, Mapping[str, str]]] = None) -> UserStore:
+    """
+    Diretório de usuários do processo (em `config.USER_DB`).
+
+    Args:
+        seed: Contas iniciais, gravadas se o banco estiver vazio
+    """
+    global _default_store
+    if _default_store is None:
+        with _store_lock:
+            if _default_store is None:
+                _default_store = UserStore(USER_DB, seed=seed)
+    return _default_store
+
+
+def _check(password: str, stored: str) -> Tuple[bool, Optional[str]]:
+    # Roda no pool: verifica e, se for o caso, já calcula o hash no formato atual
+    ok = verify_password(password, stored)
+    return ok, hash_password(password) if ok and needs_rehash(stored) else None
+
+
+@profiled('auth.verify')
+def verify_credentials(username: str, password: str, store: Optional[UserStore] = None) -> Optional[Dict[str, str]]:
+    """
+    Confere usuário e senha no pool de verificação (a thread do script só espera).
+
+    Args:
+        username: Nome de usuário
+        password: Senha digitada
+        store: Diretório de usuários (padrão: `get_user_store()`)
+
+    Returns:
+        {'username', 'role'} se as credenciais conferem, senão None.
+    """
+    username = (username or '').strip()
+    if not username or not password:
+        return None
+    store = store or get_user_store()
+    user = store.get(username)
+    stored = user['password_hash'] if user is not None else _dummy_hash()
+    ok, new_hash = get_auth_executor().submit(_check, password, stored).result()
+    if user is None or not ok:
+        return None
+    if new_hash is not None:
+        store.set_password_hash(username, new_hash)
+    return {'username': user['username'], 'role': user['role']}
+
+
+def read_roster(path: str) -> List[Dict[str, str]]:
+    """
+    Lê um CSV de turma (colunas `usuario`, `senha` e `papel`, ou os nomes em inglês).
+
+    Returns:
+        Linhas com as chaves `username`, `password` e `role`.
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;')
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.DictReader(f, dialect=dialect)
+        fields = {(name or '').strip().lower(): name for name in reader.fieldnames or []}
+        mapping = {key: next((fields[alias] for alias in aliases if alias in fields), None)
+                   for key, aliases in _COLUMNS.items()}
+        if mapping['username'] is None or mapping['password'] is None:
+            raise ValueError(f"O arquivo precisa das colunas 'usuario' e 'senha' (encontradas: {reader.fieldnames})")
+        return [{key: (row.get(column) or '') if column else '' for key, column in mapping.items()}
+                for row in reader]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Diretório de usuários do curso")
+    commands = parser.add_subparsers(dest='command', required=True)
+    importing = commands.add_parser('importar', help="Importa uma turma de um arquivo CSV")
+    importing.add_argument('arquivo', help="CSV com as colunas usuario, senha e (opcional) papel")
+    importing.add_argument('--papel', default=DEFAULT_ROLE, choices=ROLES, help="Papel das linhas sem papel")
+    importing.add_argument('--substituir', action='store_true',
+                           help="Troca a senha e o papel dos usuários que já existem")
+    args = parser.parse_args(argv)
+
+    try:
+        rows = read_roster(args.arquivo)
+    except (OSError, ValueError) as e:
+        print(f"Erro ao ler {args.arquivo}: {e}", file=sys.stderr)
+        return 1
+    # As contas iniciais de `auth.USERS` entram antes, se o banco ainda estiver vazio
+    from auth import USERS
+
+    store = UserStore(USER_DB, seed=USERS)
+    start = time.perf_counter()
+    result = store.import_users(rows, default_role=args.papel, overwrite=args.substituir)
+    store.close()
+    print(f"{result['created']} criados, {result['updated']} atualizados, {result['skipped']} já existentes "
+          f"em {time.perf_counter() - start:.1f} s ({USER_DB})")
+    for error in result['errors']:
+        print(f"  {error}", file=sys.stderr)
+    return 1 if result['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
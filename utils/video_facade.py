@@ -0,0 +1,187 @@
+"""
+Fachada leve para os vídeos das aulas (Google Drive, YouTube e Vimeo).
+
+Cada player incorporado (por exemplo, o `preview` do Google Drive) baixa
+megabytes de JavaScript assim que o iframe é criado, mesmo que o aluno nunca
+assista ao vídeo. A fachada mostra apenas a miniatura com um botão de play; o
+iframe do player só é criado depois do clique, e então já inicia o vídeo.
+
+As miniaturas são servidas de `static/thumbs/` em WebP e JPEG, em várias
+larguras (ver `utils.thumbnails`); enquanto não foram baixadas, a fachada usa a
+miniatura remota do provedor. A identificação do vídeo e da miniatura de cada
+URL é memoizada no processo (`lru_cache`).
+"""
+import html
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import streamlit as st
+
+from .assets import include_assets
+from .cache_keys import fingerprint
+from .thumbnails import thumbnail_srcsets
+from .warmup import register_warmup_task
+
+# URLs de vídeo identificadas guardadas por processo
+VIDEO_SOURCE_CACHE_ENTRIES = 4096
+
+_SESSION_KEY = '_videos_opened'
+
+_YOUTUBE_ID = re.compile(
+    r'(?:youtube(?:-nocookie)?\.com/(?:watch\?(?:.*&)?v=|embed/|shorts/|v/)|youtu\.be/)([\w-]{11})'
+)
+_DRIVE_ID = re.compile(r'drive\.google\.com/(?:file/d/|open\?(?:.*&)?id=|uc\?(?:.*&)?id=)([\w-]+)')
+_VIMEO_ID = re.compile(r'vimeo\.com/(?:video/)?(\d+)')
+
+# Largura da miniatura na página (colunas das lições no desktop, tela cheia no celular)
+_SIZES = "(max-width: 768px) 100vw, 640px"
+
+_ALLOW = "accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture"
+
+
+def _parse(url: str) -> Optional[Dict[str, str]]:
+    match = _YOUTUBE_ID.search(url)
+    if match:
+        video_id = match.group(1)
+        return {
+            'provider': 'youtube',
+            'id': video_id,
+            'embed_url': f"https://www.youtube-nocookie.com/embed/{video_id}?rel=0&modestbranding=1",
+            'thumbnail_url': f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+        }
+    match = _DRIVE_ID.search(url)
+    if match:
+        file_id = match.group(1)
+        return {
+            'provider': 'drive',
+            'id': file_id,
+            'embed_url': f"https://drive.google.com/file/d/{file_id}/preview",
+            'thumbnail_url': f"https://drive.google.com/thumbnail?id={file_id}&sz=w640",
+        }
+    match = _VIMEO_ID.search(url)
+    if match:
+        video_id = match.group(1)
+        return {
+            'provider': 'vimeo',
+            'id': video_id,
+            'embed_url': f"https://player.vimeo.com/video/{video_id}?title=0&byline=0&portrait=0",
+            'thumbnail_url': '',
+        }
+    return None
+
+
+@lru_cache(maxsize=VIDEO_SOURCE_CACHE_ENTRIES)
+def video_source(url: str) -> Optional[Dict[str, str]]:
+    """
+    Identifica o provedor, o player e a miniatura de uma URL de vídeo.
+
+    Returns:
+        Dicionário com `provider`, `id`, `embed_url` e `thumbnail_url` (vazia
+        quando o provedor não tem miniatura pública), ou None se a URL não for
+        de um provedor suportado. O dicionário é compartilhado entre as
+        chamadas e não deve ser alterado.
+    """
+    return _parse(str(url or '').strip())
+
+
+def player_html(url: str, autoplay: bool = False) -> Optional[str]:
+    """HTML do iframe do player (16:9), ou None se a URL não for suportada."""
+    source = video_source(url)
+    if source is None:
+        return None
+    embed_url = source['embed_url']
+    if autoplay:
+        embed_url += ('&' if '?' in embed_url else '?') + 'autoplay=1'
+    return f"""
+<div class="video-container">
+    <iframe src="{html.escape(embed_url)}" allow="{_ALLOW}" allowfullscreen
+            referrerpolicy="strict-origin-when-cross-origin" oncontextmenu="return false;"></iframe>
+</div>
+"""
+
+
+def poster_html(thumbnail_url: str, alt: str) -> str:
+    """
+    `<picture>` da miniatura: variantes locais (WebP e JPEG) quando já estão no
+    disco, senão a imagem remota (e o download é agendado).
+    """
+    if not thumbnail_url:
+        return ''
+    srcsets = thumbnail_srcsets(thumbnail_url)
+    if srcsets is None:
+        return f'<img src="{html.escape(thumbnail_url)}" alt="{alt}" loading="lazy" decoding="async">'
+    return (f'<picture><source type="image/webp" srcset="{srcsets["webp"]}" sizes="{_SIZES}">'
+            f'<img src="{srcsets["src"]}" srcset="{srcsets["jpg"]}" sizes="{_SIZES}" alt="{alt}" '
+            'loading="lazy" decoding="async"></picture>')
+
+
+def facade_html(url: str, title: str = '') -> Optional[str]:
+    """HTML da fachada: miniatura (carregada sob demanda) com o ícone de play."""
+    source = video_source(url)
+    if source is None:
+        return None
+    label = html.escape(title or 'Vídeo da aula')
+    poster = poster_html(source['thumbnail_url'], label)
+    return f"""
+<div class="video-facade video-facade-{source['provider']}" role="img" aria-label="{label}">
+    {poster}
+    <span class="video-facade-play" aria-hidden="true"></span>
+</div>
+"""
+
+
+def _open(key: str) -> None:
+    st.session_state.setdefault(_SESSION_KEY, set()).add(key)
+
+
+def is_video_open(key: str) -> bool:
+    """Se o player do vídeo já foi aberto nesta sessão."""
+    return key in st.session_state.get(_SESSION_KEY, set())
+
+
+def video_facade(url: str, key: Optional[str] = None, title: str = '',
+                 button_label: str = "▶️ Assistir") -> bool:
+    """
+    Exibe a fachada do vídeo; o player só é criado depois do clique em "Assistir".
+
+    Dentro de um fragmento (ver `module_utils.display_lesson_list`), o clique
+    executa de novo apenas o fragmento.
+
+    Args:
+        url: URL do vídeo (Google Drive, YouTube ou Vimeo)
+        key: Identificador do vídeo na página (padrão: derivado da URL)
+        title: Título usado como texto alternativo da miniatura
+        button_label: Texto do botão que abre o player
+
+    Returns:
+        False se a URL não for de um provedor suportado (nada é exibido).
+    """
+    source = video_source(url)
+    if source is None:
+        return False
+    key = key or fingerprint(url)[:16]
+    include_assets('video')
+
+    if is_video_open(key):
+        st.markdown(player_html(url, autoplay=True), unsafe_allow_html=True)
+    else:
+        st.markdown(facade_html(url, title), unsafe_allow_html=True)
+        st.button(button_label, key=f"play_{key}", on_click=_open, args=(key,))
+    return True
+
+
+def _warmup(source: str, modules: List[str]) -> None:
+    """Baixa as miniaturas dos vídeos de todos os módulos no aquecimento do servidor."""
+    from .module_utils import get_module_lessons
+    from .thumbnails import get_store
+
+    store = get_store()
+    for module in modules:
+        for lesson in (get_module_lessons(source, module) or {}).get('lessons', []):
+            video = video_source(str(lesson.get('video_url', '')))
+            if video and video['thumbnail_url']:
+                store.fetch(video['thumbnail_url'])
+
+
+register_warmup_task('thumbnails', _warmup)
@@ -2,7 +2,10 @@ import streamlit as st
 from typing import Optional, Dict, Any, Tuple, Union
 import re
 import base64
+import html
 from .lazy_loading import LazyLoader
+from .thumbnails import thumbnail_srcsets
+from .video_facade import poster_html, video_source
 
 def get_video_embed_url(video_url: str) -> Optional[str]:
     """
@@ -118,35 +121,32 @@ def display_video(
     
     # Exibe o vídeo usando o carregamento preguiçoso se solicitado
     if lazy and 'youtube.com' not in embed_url and 'youtu.be' not in embed_url:
-        LazyLoader.lazy_video(embed_url, width=width, autoplay=autoplay, controls=controls)
+        LazyLoader.lazy_video(video_url)
     else:
         st.components.v1.html(video_html, height=height if height > 0 else 450)
 
 def get_video_thumbnail(video_url: str) -> Optional[str]:
     """
-    Obtém a URL da miniatura de um vídeo do YouTube.
+    Obtém a URL da miniatura de um vídeo do YouTube ou do Google Drive.
+    
+    Quando a miniatura já está no cache local (`static/thumbs/`), retorna a
+    variante JPEG servida pelo Streamlit; senão, a URL remota (e agenda o download).
     
     Args:
-        video_url: URL do vídeo do YouTube
+        video_url: URL do vídeo
         
     Returns:
-        URL da miniatura ou None se não for um vídeo do YouTube
+        URL da miniatura ou None se o provedor não tiver miniatura
     """
     if not video_url:
         return None
-        
-    video_id = None
     
-    if 'youtube.com' in video_url or 'youtu.be' in video_url:
-        if 'youtube.com/watch' in video_url:
-            video_id = video_url.split('v=')[1].split('&')[0]
-        elif 'youtu.be/' in video_url:
-            video_id = video_url.split('youtu.be/')[1].split('?')[0]
-    
-    if video_id:
-        return f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
+    source = video_source(video_url)
+    if not source or not source['thumbnail_url']:
+        return None
     
-    return None
+    srcsets = thumbnail_srcsets(source['thumbnail_url'])
+    return srcsets['src'] if srcsets else source['thumbnail_url']
 
 def create_video_card(
     video_url: str,
@@ -179,9 +179,12 @@ def create_video_card(
         
         with col1 if width > 0 else st:
             if show_thumbnail:
-                thumbnail_url = get_video_thumbnail(video_url)
-                if thumbnail_url:
-                    st.image(thumbnail_url, use_column_width=True)
+                source = video_source(video_url)
+                if source and source['thumbnail_url']:
+                    # <picture> com as variantes locais: o navegador busca a
+                    # imagem direto do servidor de arquivos estáticos
+                    st.markdown(poster_html(source['thumbnail_url'], html.escape(title or 'Vídeo')),
+                                unsafe_allow_html=True)
         
         with col2 if width > 0 else st:
             if show_title and title:
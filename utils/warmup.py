@@ -0,0 +1,101 @@
+"""
+Aquecimento dos caches ao iniciar o servidor.
+
+Na primeira execução de um processo, uma thread em segundo plano carrega o
+catálogo (do instantâneo em disco, se houver, revalidando em seguida), monta as
+lições de todos os módulos e executa as tarefas registradas por outros módulos
+(por exemplo, a montagem das páginas dos módulos). Assim os primeiros
+usuários após um deploy não pagam pelos caches frios.
+
+Desativado com `CACHE_WARMUP=false`.
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .catalog import MODULE_COLUMN, load_catalog
+from config import CACHE_WARMUP, SPREADSHEET_URL
+
+# Tarefas extras: recebem a planilha e a lista de módulos
+_tasks: List[Tuple[str, Callable[[str, List[str]], None]]] = []
+
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+_status: Dict = {'state': 'not_started', 'timings': {}, 'errors': {}}
+
+
+def register_warmup_task(name: str, func: Callable[[str, List[str]], None]) -> None:
+    """
+    Registra uma tarefa executada no aquecimento, depois do catálogo e das lições.
+
+    Args:
+        name: Nome da tarefa (usado em `warmup_status`)
+        func: Função que recebe a URL da planilha e os nomes dos módulos
+    """
+    _tasks.append((name, func))
+
+
+def _timed(name: str, func: Callable, *args) -> None:
+    start = time.perf_counter()
+    try:
+        func(*args)
+    except Exception as e:
+        _status['errors'][name] = str(e)
+    finally:
+        _status['timings'][name] = time.perf_counter() - start
+
+
+def run_warmup(sources: Sequence[str] = (SPREADSHEET_URL,)) -> Dict:
+    """
+    Executa o aquecimento na thread atual.
+
+    Returns:
+        Situação do aquecimento (ver `warmup_status`).
+    """
+    from .module_utils import get_module_lessons
+
+    _status['state'] = 'running'
+    for source in sources:
+        modules: List[str] = []
+
+        def catalog():
+            df = load_catalog(source)
+            if df is not None and MODULE_COLUMN in df.columns:
+                names = df[MODULE_COLUMN].dropna().astype(str).str.strip()
+                modules.extend(sorted(set(names) - {''}))
+
+        _timed(f"catalog:{source}", catalog)
+        for module in modules:
+            _timed(f"lessons:{module}", get_module_lessons, source, module)
+        for name, func in _tasks:
+            _timed(name, func, source, modules)
+    _status['state'] = 'done'
+    return warmup_status()
+
+
+def start_warmup(sources: Sequence[str] = (SPREADSHEET_URL,)) -> Optional[threading.Thread]:
+    """
+    Inicia o aquecimento em segundo plano (uma vez por processo).
+
+    Returns:
+        A thread do aquecimento, ou None se ele já foi iniciado ou está desativado.
+    """
+    global _thread
+    if not CACHE_WARMUP or _thread is not None:
+        return None
+    with _lock:
+        if _thread is not None:
+            return None
+        _thread = threading.Thread(target=run_warmup, args=(tuple(sources),),
+                                   name="cache-warmup", daemon=True)
+        _thread.start()
+        return _thread
+
+
+def warmup_status() -> Dict:
+    """Situação do aquecimento: estado, tempo de cada etapa (s) e erros."""
+    return {
+        'state': _status['state'],
+        'timings': dict(_status['timings']),
+        'errors': dict(_status['errors']),
+    }